@@ -50,6 +50,11 @@ def unregister():
 # Import modules
 #################################################
 
+# Standalone entry points, not registered with the add-on: the headless bridge
+# (imported by its operator), the worker process (launched by blendix_connection)
+# and the echo stub.
+EXCLUDED_MODULES = {"blendix_headless", "blendix_worker", "blendix_echo_stub"}
+
 
 def get_all_submodules(directory):
     return list(iter_submodules(directory, __package__))
@@ -57,6 +62,8 @@ def get_all_submodules(directory):
 
 def iter_submodules(path, package_name):
     for name in sorted(iter_submodule_names(path)):
+        if name in EXCLUDED_MODULES:
+            continue
         yield importlib.import_module("." + name, package_name)
 
 
@@ -0,0 +1,731 @@
+import ast
+import functools
+import math
+import bpy
+import numpy as np
+from mathutils import Matrix
+from bpy.app.handlers import persistent
+from .blendix_encoder import FrameEncoder
+
+
+# Number of channels each property type consumes in a frame. Channel blocks
+# are laid out back to back in collection order.
+CHANNEL_WIDTHS = {
+    "location": 3,
+    "rotation_euler": 3,
+    "scale": 3,
+    "rotation_quaternion": 4,
+    "rotation_axis_angle": 4,
+    "matrix_world": 12,
+}
+
+DEG_TO_RAD = math.pi / 180.0
+
+
+def binding_width(item):
+    if item.target_type == 'PATH':
+        return item.path_channels
+    if item.target_type == 'ATTRIBUTE':
+        return item.array_length
+    return CHANNEL_WIDTHS.get(item.property_name, 3)
+
+
+def channel_offsets(collection, width=binding_width):
+    offsets = []
+    base_index = 0
+    for item in collection:
+        offsets.append(base_index)
+        base_index += width(item)
+    return offsets
+
+
+def receive_filter_spec(scene):
+    # Per-channel filter settings for blendix_filters, expanded from the receive bindings.
+    spec = {"kind": [], "cutoff": [], "beta": [], "derivative_cutoff": [], "window": [], "rate": []}
+    for item in scene.custom_object_collection:
+        width = binding_width(item)
+        spec["kind"] += [item.filter_type] * width
+        spec["cutoff"] += [item.filter_cutoff] * width
+        spec["beta"] += [item.filter_beta] * width
+        spec["derivative_cutoff"] += [item.filter_derivative_cutoff] * width
+        spec["window"] += [item.filter_window] * width
+        spec["rate"] += [item.filter_rate] * width
+    return spec
+
+
+# Object transforms
+
+def merge_axes(current, selected_axes, numerical_data, base_index, factor=1.0):
+    # Build the full 3-vector once so the property is written with a single assignment.
+    values = numerical_data[base_index:base_index + 3]
+    if selected_axes == "XYZ":
+        return [value * factor for value in values] if factor != 1.0 else values
+    merged = list(current)
+    for axis_index, axis in enumerate("XYZ"):
+        if axis in selected_axes:
+            merged[axis_index] = values[axis_index] * factor
+    return merged
+
+
+def update_location(obj, selected_axes, numerical_data, base_index):
+    obj.location = merge_axes(obj.location, selected_axes, numerical_data, base_index)
+
+
+def update_rotation(obj, selected_axes, numerical_data, base_index):
+    obj.rotation_euler = merge_axes(obj.rotation_euler, selected_axes, numerical_data, base_index, DEG_TO_RAD)
+
+
+def update_scale(obj, selected_axes, numerical_data, base_index):
+    obj.scale = merge_axes(obj.scale, selected_axes, numerical_data, base_index)
+
+
+def update_quaternion(obj, selected_axes, numerical_data, base_index):
+    obj.rotation_quaternion = numerical_data[base_index:base_index + 4]
+
+
+def update_axis_angle(obj, selected_axes, numerical_data, base_index):
+    angle, x, y, z = numerical_data[base_index:base_index + 4]
+    obj.rotation_axis_angle = (angle * DEG_TO_RAD, x, y, z)
+
+
+def update_matrix(obj, selected_axes, numerical_data, base_index):
+    values = numerical_data[base_index:base_index + 12]
+    obj.matrix_world = Matrix((values[0:4], values[4:8], values[8:12], (0.0, 0.0, 0.0, 1.0)))
+
+
+RECEIVE_UPDATERS = {
+    "location": update_location,
+    "rotation_euler": update_rotation,
+    "scale": update_scale,
+    "rotation_quaternion": update_quaternion,
+    "rotation_axis_angle": update_axis_angle,
+    "matrix_world": update_matrix,
+}
+
+ROTATION_MODES = {
+    "rotation_quaternion": 'QUATERNION',
+    "rotation_axis_angle": 'AXIS_ANGLE',
+}
+
+
+# Pose bones are written per armature and property with one foreach_get/foreach_set
+# pair over the whole pose, followed by a single depsgraph tag.
+POSE_PROPERTY_SIZES = {
+    "location": 3,
+    "rotation_euler": 3,
+    "scale": 3,
+    "rotation_quaternion": 4,
+    "rotation_axis_angle": 4,
+}
+
+
+# Mesh / point cloud attributes: a contiguous block of the frame is written with one
+# foreach_set per tick. Attributes are looked up by name every tick because their
+# storage can be reallocated when other attributes change.
+ATTRIBUTE_COMPONENTS = {
+    'FLOAT': ("value", 1),
+    'FLOAT2': ("vector", 2),
+    'FLOAT_VECTOR': ("vector", 3),
+    'FLOAT_COLOR': ("color", 4),
+}
+
+
+def compile_attribute_target(obj, item, base_index):
+    if obj.type not in {'MESH', 'POINTCLOUD'}:
+        raise TypeError(f"'{obj.name}' is not a mesh or point cloud")
+    geometry = obj.data
+    name = item.attribute_name.strip() or "blendix"
+    attribute = geometry.attributes.get(name)
+    if attribute is None:
+        attribute = geometry.attributes.new(name, 'FLOAT', 'POINT')
+    if attribute.data_type not in ATTRIBUTE_COMPONENTS:
+        raise TypeError(f"attribute '{name}' has unsupported type {attribute.data_type}")
+
+    component, size = ATTRIBUTE_COMPONENTS[attribute.data_type]
+    buffer = np.empty(len(attribute.data) * size, dtype=np.float32)
+    attribute.data.foreach_get(component, buffer)
+    count = min(item.array_length, len(buffer))
+    return geometry, name, component, size, buffer, base_index, count
+
+
+# Data paths
+
+def split_data_path(data_path):
+    # 'data.energy' -> ('data', 'energy', False), 'modifiers["Bend"]["x"]' -> ('modifiers["Bend"]', 'x', True)
+    if data_path.endswith(']'):
+        start = data_path.rfind('[')
+        return data_path[:start], ast.literal_eval(data_path[start + 1:-1]), True
+    owner_path, _, name = data_path.rpartition('.')
+    return owner_path, name, False
+
+
+def make_converter(gain, offset, low, high, value_type):
+    # Returns None for NaN and infinite values (a filter warming up, a bad field):
+    # the property then keeps its value for that frame.
+    isfinite = math.isfinite
+    if value_type is bool:
+        def convert(value):
+            value = value * gain + offset
+            return min(max(value, low), high) >= 0.5 if isfinite(value) else None
+        return convert
+    if value_type is int:
+        def convert(value):
+            value = value * gain + offset
+            return int(round(min(max(value, low), high))) if isfinite(value) else None
+        return convert
+    if low == -math.inf and high == math.inf:
+        if gain == 1.0 and offset == 0.0:
+            return lambda value: float(value) if isfinite(value) else None
+        return lambda value: value * gain + offset if isfinite(value) else None
+
+    def convert(value):
+        value = value * gain + offset
+        return min(max(value, low), high) if isfinite(value) else None
+    return convert
+
+
+# RNA property types a channel can drive, and the value types they take.
+NUMERIC_TYPES = {'BOOLEAN': bool, 'INT': int, 'FLOAT': float}
+IDPROPERTY_TYPECODES = {'b': bool, 'i': int, 'f': float, 'd': float}
+
+
+def idproperty_type(value, name):
+    if isinstance(value, (bool, int, float)):
+        return type(value), 0
+    value_type = IDPROPERTY_TYPECODES.get(getattr(value, "typecode", None))
+    if value_type is None:
+        raise TypeError(f"custom property '{name}' is not a number or number array")
+    return value_type, len(value)
+
+
+def resolve_path_property(obj, data_path):
+    # Resolves a binding's data path to the struct owning the property and checks
+    # it holds numbers. Returns (owner, name, is_item, value_type, length, index,
+    # is_readonly, fcurve_path): is_item for custom properties, length 0 for single
+    # values, index when the path names one element of an array ("location[1]").
+    data_path = data_path.strip()
+    owner_path, name, is_item = split_data_path(data_path)
+    index = None
+    fcurve_path = data_path
+    if is_item and isinstance(name, int):
+        index = name
+        fcurve_path = owner_path
+        owner_path, name, is_item = split_data_path(owner_path)
+    owner = obj.path_resolve(owner_path) if owner_path else obj
+
+    if is_item:
+        value_type, length = idproperty_type(owner[name], name)
+        is_readonly = False
+    else:
+        rna = owner.bl_rna.properties.get(name) if hasattr(owner, "bl_rna") else None
+        if rna is None:
+            raise AttributeError(f"'{owner_path or obj.name}' has no property '{name}'")
+        value_type = NUMERIC_TYPES.get(rna.type)
+        if value_type is None:
+            raise TypeError(f"'{name}' is a {rna.type.lower()} property, not a number")
+        if rna.array_dimensions[1]:
+            raise TypeError(f"'{name}' is multi-dimensional, bind a single row instead")
+        length = rna.array_length
+        is_readonly = rna.is_readonly
+
+    if index is not None and not 0 <= index < length:
+        raise IndexError(f"'{name}' has no element {index}")
+    return owner, name, is_item, value_type, length, index, is_readonly, fcurve_path
+
+
+def compile_path_target(obj, item, base_index):
+    # Resolve and check the property once; the returned applier only does the final write.
+    owner, name, is_item, value_type, length, index, is_readonly, _ = resolve_path_property(obj, item.data_path)
+    if is_readonly:
+        raise TypeError(f"'{name}' is read-only")
+
+    if item.use_clamp:
+        low, high = item.clamp_min, item.clamp_max
+    else:
+        low, high = -math.inf, math.inf
+    convert = make_converter(item.gain, item.offset, low, high, value_type)
+    # Custom property writes are not tagged for the depsgraph automatically.
+    tag_id = owner.id_data if is_item else None
+
+    if length:
+        current = owner[name] if is_item else getattr(owner, name)
+        if index is not None:
+            def apply_element(numerical_data):
+                value = convert(numerical_data[base_index])
+                if value is not None:
+                    current[index] = value
+            return apply_element, tag_id
+
+        start = item.array_index
+        if start >= length:
+            raise IndexError(f"array index {start} is past the {length} elements of '{name}'")
+        stop = min(start + item.path_channels, length)
+
+        def apply_array(numerical_data):
+            values = [convert(value) for value in numerical_data[base_index:base_index + stop - start]]
+            if None not in values:
+                current[start:stop] = values
+                return
+            for offset, value in enumerate(values, start):
+                if value is not None:
+                    current[offset] = value
+        return apply_array, tag_id
+
+    if is_item:
+        def apply_item(numerical_data):
+            value = convert(numerical_data[base_index])
+            if value is not None:
+                owner[name] = value
+        return apply_item, tag_id
+
+    def apply_attribute(numerical_data):
+        value = convert(numerical_data[base_index])
+        if value is not None:
+            setattr(owner, name, value)
+    return apply_attribute, None
+
+
+class ReceiveBindings:
+    """Receive bindings resolved to cached object, bone and property handles."""
+
+    def __init__(self, scene):
+        self.scene_pointer = scene.as_pointer()
+        self.appliers = []
+        self.pose_batches = []
+        self.attribute_targets = []
+        self.tag_ids = set()
+        self.errors = {}
+
+        pose_targets = {}
+        collection = scene.custom_object_collection
+        for index, (item, base_index) in enumerate(zip(collection, channel_offsets(collection))):
+            obj = item.sel_object
+            if obj is None:
+                continue
+            required = base_index + binding_width(item)
+
+            if item.target_type == 'BONE':
+                self.add_pose_target(pose_targets, obj, item, base_index)
+            elif item.target_type == 'ATTRIBUTE':
+                try:
+                    self.attribute_targets.append(compile_attribute_target(obj, item, base_index))
+                except (TypeError, RuntimeError) as error:
+                    self.errors[index] = str(error)
+            elif item.target_type == 'PATH':
+                try:
+                    applier, tag_id = compile_path_target(obj, item, base_index)
+                except (ValueError, SyntaxError, AttributeError, KeyError, IndexError, TypeError) as error:
+                    self.errors[index] = str(error)
+                    continue
+                self.appliers.append((required, applier, index))
+                if tag_id is not None:
+                    # Custom property writes are not tagged for the depsgraph automatically.
+                    self.tag_ids.add(tag_id)
+            else:
+                property_name = item.property_name
+                rotation_mode = ROTATION_MODES.get(property_name)
+                if rotation_mode is not None and obj.rotation_mode != rotation_mode:
+                    obj.rotation_mode = rotation_mode
+                updater = functools.partial(RECEIVE_UPDATERS[property_name], obj, item.selected_axes,
+                                            base_index=base_index)
+                self.appliers.append((required, updater, index))
+
+        for (armature, property_name), (destination, source, factors) in pose_targets.items():
+            bone_count = len(armature.pose.bones)
+            self.pose_batches.append((
+                armature,
+                property_name,
+                np.array(destination, dtype=np.intp),
+                np.array(source, dtype=np.intp),
+                np.array(factors, dtype=np.float32),
+                np.empty(bone_count * POSE_PROPERTY_SIZES[property_name], dtype=np.float32),
+            ))
+
+    def add_pose_target(self, pose_targets, armature, item, base_index):
+        property_name = item.property_name
+        if armature.type != 'ARMATURE' or property_name not in POSE_PROPERTY_SIZES:
+            return
+        bones = armature.pose.bones
+        bone_index = bones.find(item.bone_name)
+        if bone_index < 0:
+            return
+
+        rotation_mode = ROTATION_MODES.get(property_name)
+        if rotation_mode is not None and bones[bone_index].rotation_mode != rotation_mode:
+            bones[bone_index].rotation_mode = rotation_mode
+
+        size = POSE_PROPERTY_SIZES[property_name]
+        if size == 3:
+            components = [k for k, axis in enumerate("XYZ") if axis in item.selected_axes]
+        else:
+            components = range(size)
+
+        destination, source, factors = pose_targets.setdefault((armature, property_name), ([], [], []))
+        for k in components:
+            destination.append(bone_index * size + k)
+            source.append(base_index + k)
+            converts_degrees = property_name == "rotation_euler" or (property_name == "rotation_axis_angle" and k == 0)
+            factors.append(DEG_TO_RAD if converts_degrees else 1.0)
+
+    def apply(self, numerical_data):
+        if self.apply_batched(numerical_data):
+            tag_view3d_redraw()
+        self.apply_properties(numerical_data)
+
+    def apply_batched(self, numerical_data):
+        # Attribute and pose writes go through foreach_set, which sends no notifiers:
+        # they are cheap at any rate and the caller decides when to redraw.
+        if not (self.attribute_targets or self.pose_batches):
+            return False
+        data_length = len(numerical_data)
+        frame = np.asarray(numerical_data, dtype=np.float32)
+        attributes_written = self.apply_attributes(frame, data_length)
+        poses_written = self.apply_pose_batches(frame, data_length)
+        return attributes_written or poses_written
+
+    def apply_properties(self, numerical_data):
+        # Plain RNA writes; each one makes Blender redraw the editors showing it.
+        data_length = len(numerical_data)
+        failed = False
+        for required, applier, index in self.appliers:
+            if required <= data_length:
+                try:
+                    applier(numerical_data)
+                except (TypeError, AttributeError, KeyError, IndexError) as error:
+                    # The target no longer resolves (e.g. it became library data): shown
+                    # on the binding and skipped from now on, the timer keeps running.
+                    self.errors[index] = str(error)
+                    failed = True
+                except ValueError:
+                    # A value the property refuses: only this frame is skipped.
+                    pass
+        if failed:
+            self.appliers = [entry for entry in self.appliers if entry[2] not in self.errors]
+
+        for id_data in self.tag_ids:
+            id_data.update_tag()
+
+    def apply_attributes(self, frame, data_length):
+        written = False
+        for geometry, name, component, size, buffer, base_index, count in self.attribute_targets:
+            attribute = geometry.attributes.get(name)
+            if attribute is None or len(attribute.data) * size != len(buffer):
+                # Geometry was edited since compiling, recompile on the next tick.
+                invalidate_bindings()
+                continue
+            available = min(count, data_length - base_index)
+            if available <= 0:
+                continue
+            buffer[:available] = frame[base_index:base_index + available]
+            attribute.data.foreach_set(component, buffer)
+            geometry.update_tag()
+            written = True
+        return written
+
+    def apply_pose_batches(self, frame, data_length):
+        tagged = set()
+        for armature, property_name, destination, source, factors, buffer in self.pose_batches:
+            if source[-1] >= data_length:
+                in_range = source < data_length
+                destination, source, factors = destination[in_range], source[in_range], factors[in_range]
+            bones = armature.pose.bones
+            bones.foreach_get(property_name, buffer)
+            buffer[destination] = frame[source] * factors
+            bones.foreach_set(property_name, buffer)
+            tagged.add(armature)
+        for armature in tagged:
+            armature.update_tag(refresh={'DATA'})
+        return bool(tagged)
+
+
+def tag_view3d_redraw():
+    # foreach_set does not send notifiers, so ask the 3D views to redraw explicitly.
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+# Send bindings: every source is read into one flat array per tick before encoding.
+
+RAD_TO_DEG = 180.0 / math.pi
+
+
+def send_binding_width(item):
+    if item.source_type == 'PATH':
+        return item.path_channels
+    return CHANNEL_WIDTHS.get(item.property_name, 3)
+
+
+def selected_components(property_name, selected_axes):
+    # Unselected axes are never read and stay 0 in the outgoing frame.
+    if CHANNEL_WIDTHS[property_name] == 3:
+        return tuple(k for k, axis in enumerate("XYZ") if axis in selected_axes)
+    return tuple(range(CHANNEL_WIDTHS[property_name]))
+
+
+def component_factors(property_name, components):
+    if property_name == "rotation_euler":
+        return tuple(RAD_TO_DEG for _ in components)
+    if property_name == "rotation_axis_angle":
+        return tuple(RAD_TO_DEG if k == 0 else 1.0 for k in components)
+    return tuple(1.0 for _ in components)
+
+
+def local_values(obj, property_name):
+    if property_name == "location":
+        return obj.location
+    if property_name == "rotation_euler":
+        return obj.rotation_euler
+    if property_name == "scale":
+        return obj.scale
+    if property_name == "matrix_world":
+        return matrix_values(obj.matrix_world)
+    # decompose() gives the rotation regardless of the object's rotation mode.
+    return rotation_values(obj.matrix_basis.decompose()[1], property_name)
+
+
+def rotation_values(quaternion, property_name):
+    if property_name == "rotation_quaternion":
+        return quaternion
+    if property_name == "rotation_axis_angle":
+        axis, angle = quaternion.to_axis_angle()
+        return (angle, axis.x, axis.y, axis.z)
+    return quaternion.to_euler()
+
+
+def matrix_values(matrix):
+    return [value for row in matrix[:3] for value in row]
+
+
+def decomposed_values(matrix, decomposed, property_name):
+    if property_name == "matrix_world":
+        return matrix_values(matrix)
+    location, rotation, scale = decomposed
+    if property_name == "location":
+        return location
+    if property_name == "scale":
+        return scale
+    return rotation_values(rotation, property_name)
+
+
+def compile_path_source(obj, item):
+    # Returns (reader, F-curve data path, array index per channel).
+    owner, name, is_item, _, length, index, _, fcurve_path = resolve_path_property(obj, item.data_path)
+    if length:
+        current = owner[name] if is_item else getattr(owner, name)
+        if index is not None:
+            return (lambda: (current[index],)), fcurve_path, range(index, index + 1)
+        start = item.array_index
+        if start >= length:
+            raise IndexError(f"array index {start} is past the {length} elements of '{name}'")
+        stop = min(start + item.path_channels, length)
+        return (lambda: current[start:stop]), fcurve_path, range(start, stop)
+    if is_item:
+        return (lambda: (owner[name],)), fcurve_path, range(1)
+    return (lambda: (getattr(owner, name),)), fcurve_path, range(1)
+
+
+class SendBindings:
+    """Send bindings compiled into readers that fill one flat value array per tick."""
+
+    def __init__(self, scene):
+        self.scene_pointer = scene.as_pointer()
+        self.local_readers = []
+        self.world_readers = []
+        self.path_readers = []
+        self.bone_batches = []
+        self.errors = {}
+        self.watched_pointers = set()
+        self.fcurve_channels = []
+        # (first channel, width, rate, priority) per binding for the multi-rate scheduler.
+        self.schedule_layout = []
+
+        bone_targets = {}
+        precisions = []
+        fixed_scales = []
+        fixed_types = []
+        collection = scene.send_object_collection
+        base_index = 0
+        for index, item in enumerate(collection):
+            width = send_binding_width(item)
+            obj = item.sel_object
+            if obj is not None:
+                self.add_source(index, item, obj, base_index, bone_targets)
+            is_sent = obj is not None and index not in self.errors
+            self.schedule_layout.append((base_index, width if is_sent else 0, item.send_rate, item.send_priority))
+            base_index += width
+
+            is_fixed = item.value_format == 'FIXED'
+            precisions += [item.precision] * width
+            fixed_scales += [item.fixed_scale if is_fixed else 0.0] * width
+            fixed_types += [item.fixed_type] * width
+
+        self.values = np.zeros(base_index, dtype=np.float64)
+        self.encoder = FrameEncoder(precisions, fixed_scales, fixed_types)
+        for armature, targets in bone_targets.items():
+            buffer = np.empty(len(armature.pose.bones) * 16, dtype=np.float32)
+            self.bone_batches.append((armature, targets, buffer))
+        self.schedule_layout = tuple(self.schedule_layout)
+
+    def add_source(self, index, item, obj, base_index, bone_targets):
+        # Changes to the object or its data (light energy, shape keys...) trigger change-driven sends.
+        self.watched_pointers.add(obj.as_pointer())
+        if obj.data is not None:
+            self.watched_pointers.add(obj.data.as_pointer())
+
+        source_type = item.source_type
+        if source_type == 'PATH':
+            try:
+                reader, fcurve_path, array_indices = compile_path_source(obj, item)
+            except (ValueError, SyntaxError, AttributeError, KeyError, IndexError, TypeError) as error:
+                self.errors[index] = str(error)
+                return
+            self.path_readers.append((reader, base_index))
+            for channel, array_index in enumerate(array_indices):
+                self.fcurve_channels.append((obj, fcurve_path, array_index, base_index + channel, 1.0))
+            return
+
+        property_name = item.property_name
+        components = selected_components(property_name, item.selected_axes)
+        factors = component_factors(property_name, components)
+        target = (property_name, components, factors, base_index)
+
+        if source_type == 'BONE':
+            bone_index = obj.pose.bones.find(item.bone_name) if obj.type == 'ARMATURE' else -1
+            if bone_index < 0:
+                self.errors[index] = f"bone '{item.bone_name}' not found"
+                return
+            bone_targets.setdefault(obj, []).append((bone_index,) + target)
+        elif source_type == 'WORLD':
+            self.world_readers.append((obj,) + target)
+        else:
+            self.local_readers.append((obj,) + target)
+            if property_name in {"location", "rotation_euler", "scale"}:
+                for k, factor in zip(components, factors):
+                    self.fcurve_channels.append((obj, property_name, k, base_index + k, factor))
+
+    def gather(self, depsgraph):
+        values = self.values
+
+        for obj, property_name, components, factors, base_index in self.local_readers:
+            source = local_values(obj, property_name)
+            for k, factor in zip(components, factors):
+                values[base_index + k] = source[k] * factor
+
+        # World-space and pose data come from the evaluated depsgraph, so constraints,
+        # parenting and drivers are included. Each object is decomposed once per tick.
+        decomposed_cache = {}
+        for obj, property_name, components, factors, base_index in self.world_readers:
+            cached = decomposed_cache.get(obj)
+            if cached is None:
+                matrix = obj.evaluated_get(depsgraph).matrix_world.copy()
+                cached = decomposed_cache[obj] = (matrix, matrix.decompose())
+            source = decomposed_values(cached[0], cached[1], property_name)
+            for k, factor in zip(components, factors):
+                values[base_index + k] = source[k] * factor
+
+        # One foreach_get of the armature-space matrices per armature.
+        for armature, targets, buffer in self.bone_batches:
+            armature.evaluated_get(depsgraph).pose.bones.foreach_get("matrix", buffer)
+            matrices = buffer.reshape(-1, 4, 4).transpose(0, 2, 1)
+            for bone_index, property_name, components, factors, base_index in targets:
+                matrix = Matrix(matrices[bone_index].tolist())
+                source = decomposed_values(matrix, matrix.decompose(), property_name)
+                for k, factor in zip(components, factors):
+                    values[base_index + k] = source[k] * factor
+
+        for reader, base_index in self.path_readers:
+            source = reader()
+            values[base_index:base_index + len(source)] = source
+
+        return values
+
+    def sample_animation(self, frames, current_values):
+        # One row per sub-frame time. Channels driven directly by an F-curve of the
+        # object's action are evaluated at each time, all others hold their current value.
+        block = np.repeat(current_values[np.newaxis, :], len(frames), axis=0)
+        for id_data, data_path, array_index, channel, factor in self.fcurve_channels:
+            animation_data = id_data.animation_data
+            if animation_data is None or animation_data.action is None:
+                continue
+            fcurve = animation_data.action.fcurves.find(data_path, index=array_index)
+            if fcurve is None:
+                continue
+            block[:, channel] = [fcurve.evaluate(frame) * factor for frame in frames]
+        return block
+
+    def is_affected_by(self, depsgraph):
+        watched = self.watched_pointers
+        for update in depsgraph.updates:
+            if update.id.original.as_pointer() in watched:
+                return True
+        return False
+
+
+# Cache
+
+_receive_bindings = None
+_send_bindings = None
+
+
+def get_receive_bindings(scene):
+    global _receive_bindings
+    if _receive_bindings is None or _receive_bindings.scene_pointer != scene.as_pointer():
+        _receive_bindings = ReceiveBindings(scene)
+        if scene.data_processing_received_debug_mode:
+            print(f"Data Processing Received:--> Bindings compiled: {len(_receive_bindings.appliers)} direct, "
+                  f"{len(_receive_bindings.pose_batches)} pose batches, {len(_receive_bindings.errors)} errors")
+    return _receive_bindings
+
+
+def get_send_bindings(scene):
+    global _send_bindings
+    if _send_bindings is None or _send_bindings.scene_pointer != scene.as_pointer():
+        _send_bindings = SendBindings(scene)
+        if scene.data_processing_send_debug_mode:
+            print(f"Data Processing Debugging:--> Send bindings compiled: {len(_send_bindings.values)} channels, "
+                  f"{len(_send_bindings.errors)} errors")
+    return _send_bindings
+
+
+def send_binding_error(index):
+    if _send_bindings is None:
+        return None
+    return _send_bindings.errors.get(index)
+
+
+def receive_binding_error(index):
+    # Safe to call from draw code: never compiles (compiling may write rotation modes).
+    if _receive_bindings is None:
+        return None
+    return _receive_bindings.errors.get(index)
+
+
+def invalidate_bindings(self=None, context=None):
+    # Used as the update callback of every binding property.
+    global _receive_bindings, _send_bindings
+    _receive_bindings = None
+    _send_bindings = None
+
+
+@persistent
+def on_file_or_undo_change(*args):
+    # Undo and file loads reallocate ID data, cached handles must be resolved again.
+    invalidate_bindings()
+
+
+INVALIDATING_HANDLERS = (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post)
+
+
+def register():
+    for handlers in INVALIDATING_HANDLERS:
+        if on_file_or_undo_change not in handlers:
+            handlers.append(on_file_or_undo_change)
+
+
+def unregister():
+    for handlers in INVALIDATING_HANDLERS:
+        if on_file_or_undo_change in handlers:
+            handlers.remove(on_file_or_undo_change)
+    invalidate_bindings()
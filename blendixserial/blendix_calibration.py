@@ -0,0 +1,176 @@
+import numpy as np
+
+# Per-channel calibration of raw device values (e.g. ADC counts) to scene units.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# Run by the reader on every decoded frame, before the filters:
+#     value = raw * gain + offset        (invert flips the sign of both)
+#     dead zone around 0                 (values inside become 0, the rest shifts
+#                                         towards 0 so the mapping stays continuous)
+#     optional curve                     piecewise linear "in:out, in:out, ..." points,
+#                                        resampled to a fixed lookup table
+#     optional clamp
+# All steps are array operations over the whole frame.
+#
+# The Calibrator also tracks the raw minimum and maximum of every channel while
+# a capture is running, for the capture calibration operator.
+
+CURVE_SAMPLES = 64
+
+
+def parse_curve(text):
+    # "0:0, 0.5:0.2, 1:1" -> sorted x and y arrays; raises ValueError when malformed.
+    points = []
+    for pair in text.split(','):
+        if pair.strip():
+            x, _, y = pair.partition(':')
+            points.append((float(x), float(y)))
+    if len(points) < 2:
+        raise ValueError("a curve needs at least two in:out points")
+    points.sort()
+    x, y = np.array(points, dtype=np.float64).T
+    if x[-1] <= x[0]:
+        raise ValueError("curve inputs must span a range")
+    return x, y
+
+
+def calibration_spec(channels):
+    # Per-channel lists from any sequence of items with the calibration fields
+    # (the scene's calibration table), JSON-able for the worker process.
+    spec = {"gain": [], "offset": [], "dead_zone": [], "clamp_min": [], "clamp_max": [], "curve": []}
+    for channel in channels:
+        sign = -1.0 if channel.invert else 1.0
+        spec["gain"].append(channel.gain * sign)
+        spec["offset"].append(channel.offset * sign)
+        spec["dead_zone"].append(channel.dead_zone)
+        spec["clamp_min"].append(channel.clamp_min if channel.use_clamp else -np.inf)
+        spec["clamp_max"].append(channel.clamp_max if channel.use_clamp else np.inf)
+        spec["curve"].append(channel.curve.strip() if channel.use_curve else "")
+    return spec
+
+
+class CalibrationTable:
+
+    def __init__(self, spec):
+        self.gain = np.asarray(spec["gain"], dtype=np.float64)
+        self.offset = np.asarray(spec["offset"], dtype=np.float64)
+        self.dead_zone = np.asarray(spec["dead_zone"], dtype=np.float64)
+        self.clamp_min = np.asarray(spec["clamp_min"], dtype=np.float64)
+        self.clamp_max = np.asarray(spec["clamp_max"], dtype=np.float64)
+        self.size = len(self.gain)
+        self.use_dead_zone = bool(np.any(self.dead_zone > 0))
+        self.use_clamp = bool(np.any(np.isfinite(self.clamp_min)) or np.any(np.isfinite(self.clamp_max)))
+
+        # Curves are resampled to CURVE_SAMPLES points between their first and last input.
+        curve_index, starts, steps, tables = [], [], [], []
+        self.errors = {}
+        for index, text in enumerate(spec["curve"]):
+            if not text:
+                continue
+            try:
+                x, y = parse_curve(text)
+            except ValueError as error:
+                self.errors[index] = str(error)
+                continue
+            samples = np.linspace(x[0], x[-1], CURVE_SAMPLES)
+            curve_index.append(index)
+            starts.append(x[0])
+            steps.append((x[-1] - x[0]) / (CURVE_SAMPLES - 1))
+            tables.append(np.interp(samples, x, y))
+        self.curve_index = np.array(curve_index, dtype=np.int64)
+        self.curve_start = np.array(starts, dtype=np.float64)
+        self.curve_step = np.array(steps, dtype=np.float64)
+        self.curve_table = np.array(tables, dtype=np.float64).reshape(len(curve_index), CURVE_SAMPLES)
+        self.curve_rows = np.arange(len(curve_index))
+
+    def apply(self, values):
+        # Returns a new float64 array; channels past the table pass through unchanged.
+        output = np.array(values, dtype=np.float64)
+        count = min(len(output), self.size)
+        if count == 0:
+            return output
+        head = output[:count]
+
+        head *= self.gain[:count]
+        head += self.offset[:count]
+
+        if self.use_dead_zone:
+            magnitude = np.abs(head) - self.dead_zone[:count]
+            head[:] = np.where(magnitude > 0.0, np.copysign(magnitude, head), 0.0)
+
+        if len(self.curve_index):
+            present = self.curve_index < count
+            index = self.curve_index[present]
+            rows = self.curve_rows[present]
+            position = np.clip((head[index] - self.curve_start[present]) / self.curve_step[present], 0.0, CURVE_SAMPLES - 1)
+            lower = np.minimum(position.astype(np.int64), CURVE_SAMPLES - 2)
+            fraction = position - lower
+            table = self.curve_table
+            head[index] = table[rows, lower] * (1.0 - fraction) + table[rows, lower + 1] * fraction
+
+        if self.use_clamp:
+            np.clip(head, self.clamp_min[:count], self.clamp_max[:count], out=head)
+        return output
+
+
+class CalibrationCapture:
+    # Raw minimum and maximum per channel. Only the reader updates a capture;
+    # starting a new one swaps in a fresh object, so the reader never sees one
+    # being reset halfway through track().
+
+    def __init__(self):
+        self.minimum = None
+        self.maximum = None
+        self.count = 0
+
+    def track(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        minimum, maximum = self.minimum, self.maximum
+        if minimum is None or len(minimum) != len(values):
+            # maximum first: a reader that sees the new minimum also sees it.
+            self.maximum = values.copy()
+            self.minimum = values.copy()
+        else:
+            np.minimum(minimum, values, out=minimum)
+            np.maximum(maximum, values, out=maximum)
+        self.count += 1
+
+    def result(self):
+        # (minimum, maximum, frame count) copies, (None, None, 0) before the first frame.
+        minimum, maximum, count = self.minimum, self.maximum, self.count
+        if minimum is None or len(minimum) != len(maximum):
+            return None, None, 0
+        return minimum.copy(), maximum.copy(), count
+
+
+class Calibrator:
+
+    def __init__(self):
+        self.spec = None
+        self.table = None
+        self.capturing = False
+        # The running or last capture.
+        self.capture = CalibrationCapture()
+
+    def configure(self, spec):
+        if spec == self.spec:
+            return
+        self.spec = spec
+        self.table = CalibrationTable(spec) if spec and spec["gain"] else None
+
+    def start_capture(self):
+        self.capture = CalibrationCapture()
+        self.capturing = True
+
+    def stop_capture(self):
+        self.capturing = False
+        return self.capture.result()[:2]
+
+    def apply(self, values):
+        if self.capturing:
+            self.capture.track(values)
+        if self.table is None:
+            return values
+        return self.table.apply(values)
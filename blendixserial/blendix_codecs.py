@@ -0,0 +1,350 @@
+import abc
+import json
+import time
+import zlib
+import numpy as np
+from .blendix_framing import LinkStats, BinaryFrameSplitter, decode_binary_values, wrap_binary_frame
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Wire codecs: how received frames are decoded and sent frames encoded.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# The connection's Codec setting (frame_format) names one registered codec. A
+# codec rides on one of three framings:
+#     'LINES'   newline-terminated text. The optional sequence number and CRC of
+#               blendix_framing and the "!" control lines (acks, probe echoes) apply.
+#     'BINARY'  blendix_framing binary frames; decode() gets FRAME_DATA payloads.
+#     'STREAM'  the codec splits the byte stream itself: derive from StreamCodec
+#               and implement splitter(). There are no control messages, so no
+#               flow control credits or probe echoes.
+#
+# Built-in codecs:
+#     CSV        "1.00,2.00,3.00;text"      the text part is optional
+#     CSV_FIXED  "1.00,2.00,3.00"           values only, no ';' parsing or suffix
+#     JSON       "[1.0, 2.0, 3.0]" or {"values": [...], "text": "..."}
+#     BINARY     float32 values, see blendix_framing
+#     MSGPACK    the JSON messages as MessagePack, when the msgpack module is installed
+# Partial frames (multi-rate sending) are "@0=1.00,2.00|12=0.50;" for CSV,
+# the same without the ';' for CSV_FIXED, {"0":[1.00,2.00],"12":[0.50]} for
+# JSON, and are described in blendix_framing for BINARY.
+#
+# Another add-on can register its own codec; one instance is shared, so decode()
+# and encode() must not keep state between frames:
+#
+#     from blendixserial.blendix_codecs import Codec, register_codec, unregister_codec
+#
+#     class TabCodec(Codec):
+#         name = "TSV"
+#         label = "Tab Separated"
+#
+#         def decode(self, line):
+#             return np.array(line.split('\t'), dtype=np.float64), ""
+#
+#         def encode(self, encoder, values):
+#             return encoder.format_values(values).replace(", ", "\t")
+#
+#     register_codec(TabCodec)          # in its register()
+#     unregister_codec("TSV")           # in its unregister()
+#
+# (As an extension the package is bl_ext.<repository>.blendixserial.) Codecs from
+# other add-ons only run with Thread I/O, the worker process only has the
+# built-in ones.
+
+EMPTY = np.zeros(0)
+EMPTY.flags.writeable = False
+
+
+FRAMINGS = ('LINES', 'BINARY', 'STREAM')
+
+
+class Codec(abc.ABC):
+    name = ""
+    label = ""
+    description = ""
+    framing = 'LINES'
+    # Value stored in .blend files for the Codec setting, assigned on registration when None.
+    number = None
+
+    @abc.abstractmethod
+    def decode(self, frame):
+        """Return (float64 values, text) for one frame; raise ValueError when it is malformed."""
+
+    @abc.abstractmethod
+    def encode(self, encoder, values):
+        """Return one full frame for the values, using the compiled blendix_encoder.FrameEncoder."""
+
+    def encode_group(self, encoder, prepared, start, width):
+        return f"{start}=" + encoder.group_template(start, width).format(*prepared[start:start + width])
+
+    def encode_partial(self, encoder, pieces):
+        return "@" + "|".join(pieces) + ";"
+
+
+class StreamCodec(Codec):
+    framing = 'STREAM'
+
+    @abc.abstractmethod
+    def splitter(self, stats):
+        """Return an object whose feed(chunk) returns the complete frames, with reset()."""
+
+
+def decode_message(message):
+    # A list of values, or a {"values": [...], "text": "..."} object.
+    if isinstance(message, dict):
+        values = message.get("values", ())
+        text = message.get("text", "")
+    else:
+        values, text = message, ""
+    try:
+        values = np.array(values, dtype=np.float64)
+    except TypeError as error:
+        raise ValueError(f"not a list of numbers: {error}")
+    if values.ndim != 1:
+        raise ValueError("not a flat list of numbers")
+    return values, str(text)
+
+
+class CsvCodec(Codec):
+    name = "CSV"
+    label = "CSV Lines"
+    description = "Text lines: values separated by commas, optional ';text'"
+    number = 0
+
+    def decode(self, line):
+        numerical_part, _, text = line.partition(';')
+        numerical_part = numerical_part.strip()
+        values = np.array(numerical_part.split(','), dtype=np.float64) if numerical_part else EMPTY
+        return values, text.strip()
+
+    def encode(self, encoder, values):
+        return encoder.encode_csv(values)
+
+
+class FixedCsvCodec(CsvCodec):
+    name = "CSV_FIXED"
+    label = "CSV Values Only"
+    description = "Text lines with values separated by commas only, no ';text' part is parsed or sent"
+    number = 2
+
+    def decode(self, line):
+        # No partition or strip: NumPy's parser accepts the spaces around values.
+        return np.array(line.split(','), dtype=np.float64), ""
+
+    def encode(self, encoder, values):
+        return encoder.format_values(values)
+
+    def encode_partial(self, encoder, pieces):
+        # No ';' suffix, like the full frames.
+        return "@" + "|".join(pieces)
+
+
+class JsonCodec(Codec):
+    name = "JSON"
+    label = "JSON Lines"
+    description = "One JSON value per line: [1.0, 2.0] or {\"values\": [1.0, 2.0], \"text\": \"...\"}"
+    number = 3
+
+    def decode(self, line):
+        # json.JSONDecodeError is a ValueError.
+        return decode_message(json.loads(line))
+
+    def encode(self, encoder, values):
+        # The CSV field formats are valid JSON numbers.
+        return "[" + encoder.format_values(values) + "]"
+
+    def encode_group(self, encoder, prepared, start, width):
+        return f'"{start}":[' + encoder.group_template(start, width).format(*prepared[start:start + width]) + "]"
+
+    def encode_partial(self, encoder, pieces):
+        return "{" + ",".join(pieces) + "}"
+
+
+class BinaryCodec(Codec):
+    name = "BINARY"
+    label = "Binary"
+    description = "Sync word, type, sequence, count, float32 values and CRC-16"
+    framing = 'BINARY'
+    number = 1
+
+    def decode(self, payload):
+        # Zero-copy view over the payload.
+        return decode_binary_values(payload), ""
+
+    def encode(self, encoder, values):
+        return encoder.encode_binary(values)
+
+    def encode_group(self, encoder, prepared, start, width):
+        return encoder.binary_group(prepared, start, width)
+
+    def encode_partial(self, encoder, pieces):
+        return encoder.binary_partial(pieces)
+
+
+class MessagePackSplitter:
+
+    def __init__(self, stats, max_buffer_size=1 << 20):
+        self.stats = stats
+        self.max_buffer_size = max_buffer_size
+        self.reset()
+
+    def reset(self):
+        self.unpacker = msgpack.Unpacker(raw=False, max_buffer_size=self.max_buffer_size)
+
+    def feed(self, chunk):
+        frames = []
+        try:
+            self.unpacker.feed(chunk)
+            frames.extend(self.unpacker)
+        except (ValueError, msgpack.exceptions.UnpackException):
+            # Out of step with the device: drop what is buffered and resync on the next message.
+            self.stats.frames_corrupt += 1
+            self.reset()
+        return frames
+
+
+class MessagePackCodec(StreamCodec):
+    name = "MSGPACK"
+    label = "MessagePack"
+    description = "MessagePack stream of [values] arrays or {\"values\": [...], \"text\": \"...\"} maps"
+    number = 4
+
+    def decode(self, message):
+        return decode_message(message)
+
+    def encode(self, encoder, values):
+        return msgpack.packb(encoder.prepare(values))
+
+    def encode_group(self, encoder, prepared, start, width):
+        return msgpack.packb(start) + msgpack.packb(prepared[start:start + width])
+
+    def encode_partial(self, encoder, pieces):
+        # A map from first channel to values; every group piece is a packed key and value.
+        return msgpack.Packer().pack_map_header(len(pieces)) + b''.join(pieces)
+
+    def splitter(self, stats):
+        return MessagePackSplitter(stats)
+
+
+# Registry
+
+_codecs = {}
+
+
+def register_codec(codec_class):
+    """Make a Codec subclass selectable as a connection's codec. Re-registering a name replaces it.
+
+    An incomplete codec raises TypeError here rather than on the first frame.
+    """
+    if not (isinstance(codec_class, type) and issubclass(codec_class, Codec)):
+        raise TypeError(f"{codec_class!r} is not a Codec subclass")
+    if not codec_class.name:
+        raise ValueError("a codec needs a name")
+    if codec_class.framing not in FRAMINGS:
+        raise ValueError(f"codec {codec_class.name}: framing must be one of {', '.join(FRAMINGS)}")
+    if (codec_class.framing == 'STREAM') != issubclass(codec_class, StreamCodec):
+        raise TypeError(f"codec {codec_class.name}: STREAM codecs, and only those, derive from StreamCodec")
+    # Instantiating fails for abstract methods left unimplemented.
+    codec = codec_class()
+    number = codec_class.number
+    if number is None:
+        number = zlib.crc32(codec_class.name.encode()) & 0x7FFFFFFF
+    for name, registered in _codecs.items():
+        if registered.number == number and name != codec_class.name:
+            raise ValueError(f"codec {codec_class.name} has the same number as {name}")
+    # Only a registered codec gets its derived number, a rejected class is left as it was.
+    codec_class.number = number
+    _codecs[codec_class.name] = codec
+    return codec_class
+
+
+def unregister_codec(name):
+    if name in BUILTIN_CODECS:
+        raise ValueError(f"{name} is a built-in codec")
+    _codecs.pop(name, None)
+
+
+def get_codec(name):
+    # Settings naming a codec that is gone (its add-on was disabled) fall back to CSV.
+    return _codecs.get(name) or _codecs["CSV"]
+
+
+def codecs():
+    return list(_codecs.values())
+
+
+BUILTIN_CODECS = ("CSV", "BINARY", "CSV_FIXED", "JSON", "MSGPACK")
+
+for codec_class in (CsvCodec, BinaryCodec, FixedCsvCodec, JsonCodec):
+    register_codec(codec_class)
+if msgpack is not None:
+    register_codec(MessagePackCodec)
+
+
+# Micro-benchmark
+
+def wire_frame(codec, encoder, values):
+    frame = codec.encode(encoder, values)
+    if codec.framing == 'BINARY':
+        return wrap_binary_frame(*frame)
+    if codec.framing == 'LINES':
+        return f"{frame}\n".encode()
+    return frame
+
+
+class LineSplitter:
+    # Lines as the readers split them, for the benchmark.
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.buffer = bytearray()
+
+    def reset(self):
+        self.buffer.clear()
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        *lines, rest = self.buffer.split(b'\n')
+        self.buffer = bytearray(rest)
+        return [line.decode(errors='replace').rstrip() for line in lines]
+
+
+def benchmark_codecs(channels=16, frames=20000, repeat=3, names=None):
+    """Decode cost per frame of every codec, splitting included: {name: (microseconds, wire bytes per frame)}.
+
+    The best of `repeat` runs is kept; the stream is fed in 4 KiB chunks like a busy port.
+    """
+    from .blendix_encoder import FrameEncoder
+
+    encoder = FrameEncoder([3] * channels, [0.0] * channels, ['INT16'] * channels)
+    rows = np.random.default_rng(0).uniform(-1000.0, 1000.0, (frames, channels))
+    results = {}
+    for codec in codecs():
+        if names and codec.name not in names:
+            continue
+        data = b"".join(wire_frame(codec, encoder, row) for row in rows)
+        chunks = [data[offset:offset + 4096] for offset in range(0, len(data), 4096)]
+        decode = codec.decode
+        binary = codec.framing == 'BINARY'
+
+        best = float("inf")
+        for _ in range(repeat):
+            stats = LinkStats()
+            if binary:
+                splitter = BinaryFrameSplitter(stats)
+            elif codec.framing == 'LINES':
+                splitter = LineSplitter(stats)
+            else:
+                splitter = codec.splitter(stats)
+            decoded = 0
+            start = time.perf_counter()
+            for chunk in chunks:
+                for frame in splitter.feed(chunk):
+                    decode(frame[2] if binary else frame)
+                    decoded += 1
+            best = min(best, (time.perf_counter() - start) / max(decoded, 1))
+        results[codec.name] = (best * 1e6, len(data) / frames)
+    return results
@@ -1,9 +1,31 @@
 import time
 import serial
-import serial.tools.list_ports
 import threading
-import queue
 import bpy
+from .blendix_send_queue import SendQueue, READ_POLL
+from .blendix_worker import WorkerProcess
+from .blendix_filters import build_filter_bank
+from .blendix_calibration import Calibrator
+from .blendix_pubsub import SampleHub
+from .blendix_latency import LatencyProbe
+from .blendix_ipc import LINK_STARTING, LINK_CONNECTED, LINK_RECONNECTING
+from .blendix_reader import FrameReader
+from .blendix_ports import list_ports, port_serial_number, resolve_port
+from .blendix_framing import (
+    LinkStats,
+    SEQUENCE_MODULO,
+    encode_ping,
+    wrap_csv_frame,
+    wrap_binary_frame,
+)
+
+# Scene debug flag and prefix for each kind of FrameReader debug message.
+READER_DEBUG = {
+    'raw': ('rawData_debug_mode', "Serial Thread Debug"),
+    'frame': ('serialThread_debug_mode', "Serial Thread Debug"),
+    'invalid': ('dataValidation_debug_mode', "Data Validation Debug"),
+    'thread': ('serialThread_debug_mode', "Serial Thread Debug"),
+}
 
 
 class SerialConnection:
@@ -12,13 +34,38 @@ class SerialConnection:
         self._serial_connection = None
         self._port_name = port_name
         self._baud_rate = baud_rate
+        self._read_timeout = 0.01
+        self._inter_byte_timeout = None
+        self._write_timeout = None
+        self._rx_buffer_size = 0
+        self._tx_buffer_size = 0
+        self._low_latency = False
+        self._serial_number = None
+
+    def set_link_profile(self, read_timeout=0.01, inter_byte_timeout=0.0, write_timeout=0.0,
+                         rx_buffer_size=0, tx_buffer_size=0, low_latency=False):
+        # A value of 0 for the inter-byte and write timeouts means "no timeout" (pyserial None).
+        self._read_timeout = read_timeout
+        self._inter_byte_timeout = inter_byte_timeout or None
+        self._write_timeout = write_timeout or None
+        self._rx_buffer_size = rx_buffer_size
+        self._tx_buffer_size = tx_buffer_size
+        self._low_latency = low_latency
 
     def connect_serial(self):
         try:
             if self._serial_connection is not None:
                 self._serial_connection.close()
 
-            self._serial_connection = serial.Serial(self._port_name, self._baud_rate)
+            self._serial_connection = serial.Serial(
+                self._port_name,
+                self._baud_rate,
+                timeout=self._read_timeout,
+                write_timeout=self._write_timeout,
+                inter_byte_timeout=self._inter_byte_timeout,
+            )
+            self.apply_port_tuning()
+            self._serial_number = port_serial_number(self._port_name) or self._serial_number
             if bpy.context.scene.serial_debug_mode:
                 print(f"Serial Connection Debug:--> Connected to {self._port_name} at {self._baud_rate} baud rate")
         except serial.SerialException as error:
@@ -45,9 +92,47 @@ class SerialConnection:
                     print(f"Serial Connection Debug:--> OSError while disconnecting: {os_error}")
 
 
-    @staticmethod
-    def list_ports():
-        return [port.device for port in serial.tools.list_ports.comports()]
+    def reconnect(self):
+        # Called from the serial thread after the port failed. Reopens the same device,
+        # following it by its USB serial number when it came back under another path.
+        if self._serial_connection is not None:
+            try:
+                self._serial_connection.close()
+            except (serial.SerialException, OSError):
+                pass
+            self._serial_connection = None
+
+        device = resolve_port(self._port_name, self._serial_number)
+        if device is None:
+            return False
+        if device != self._port_name and bpy.context.scene.serial_debug_mode:
+            print(f"Serial Connection Debug:--> Device {self._serial_number} moved from {self._port_name} to {device}")
+        self._port_name = device
+
+        self.connect_serial()
+        return self._serial_connection is not None
+
+    def apply_port_tuning(self):
+        # Buffer sizes are only honoured by the Windows backend, low-latency mode only on Linux.
+        connection = self._serial_connection
+        if (self._rx_buffer_size or self._tx_buffer_size) and hasattr(connection, "set_buffer_size"):
+            connection.set_buffer_size(
+                rx_size=self._rx_buffer_size or 4096,
+                tx_size=self._tx_buffer_size or None,
+            )
+            if bpy.context.scene.serial_debug_mode:
+                print(f"Serial Connection Debug:--> Buffer sizes set to RX {self._rx_buffer_size} / TX {self._tx_buffer_size}")
+
+        if self._low_latency and hasattr(connection, "set_low_latency_mode"):
+            try:
+                connection.set_low_latency_mode(True)
+                if bpy.context.scene.serial_debug_mode:
+                    print(f"Serial Connection Debug:--> Low latency mode enabled on {self._port_name}")
+            except (ValueError, OSError) as error:
+                if bpy.context.scene.serial_debug_mode:
+                    print(f"Serial Connection Debug:--> Low latency mode not supported on {self._port_name}: {error}")
+
+    list_ports = staticmethod(list_ports)
 
 
 
@@ -56,16 +141,41 @@ class SerialThread:
 
     def __init__(self, serial_connection):
         self.serial_connection = serial_connection
-        self.data_queue = queue.Queue()
+        self.hub = SampleHub()
+        # The scene updates in blendix_gdaoc are one more subscriber of the hub.
+        self._scene_subscription = self.hub.subscribe(name="scene")
         self.pause_movement = True
         self.running = False  
-        self.send_queue = queue.Queue() 
+        self.send_queue = SendQueue() 
         self.mode = None  
+        self.frame_format = 'CSV'
+        self.use_sequence = False
+        self.use_crc = False
+        self.link_stats = LinkStats()
+        self.reader = FrameReader(self.link_stats, self.publish, self.handle_ack, self.handle_echo, self.report_reader)
+        self._tx_sequence = 0
+        self.auto_reconnect = True
+        self.reconnect_delay_min = 0.02
+        self.reconnect_delay_max = 1.0
+        self.link_state = "Disconnected"
+        self.outages = 0
+        self.last_outage = 0.0
+        self._thread = None
+        self._lifecycle_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.io_mode = 'THREAD'
+        self.filter_spec = None
+        self.filter_bank = None
+        self.calibrator = Calibrator()
+        self.probe = LatencyProbe()
+        self._ping_requested = False
+        self.worker = WorkerProcess()
 
     def set_mode(self, mode):
         if mode in ["send", "receive", "both"]:
             if self.mode != mode:  
                 self.mode = mode
+                self.sync_worker()
                 if bpy.context.scene.debug_mode:
                     print(f"Serial Thread Debug:--> Mode set to: {self.mode}")
         else:
@@ -74,155 +184,317 @@ class SerialThread:
 
 
 
+    @property
+    def codec(self):
+        return self.reader.codec
+
+    def set_integrity(self, frame_format, use_sequence, use_crc):
+        # frame_format names the codec (see blendix_codecs).
+        self.reader.configure(frame_format, use_sequence, use_crc)
+        self.frame_format = frame_format
+        self.use_sequence = use_sequence
+        self.use_crc = use_crc
+        self.sync_worker()
+
+    def set_filters(self, spec):
+        # The reader only ever sees a complete bank: the reference is swapped in one step.
+        if spec == self.filter_spec:
+            return
+        self.filter_spec = spec
+        self.filter_bank = build_filter_bank(spec)
+        self.sync_worker()
+
+    def set_calibration(self, spec):
+        self.calibrator.configure(spec)
+        self.sync_worker()
+
+    def calibration_error(self, index):
+        table = self.calibrator.table
+        return table.errors.get(index) if table is not None else None
+
+    def start_calibration_capture(self):
+        self.calibrator.start_capture()
+        self.sync_worker()
+
+    def calibration_capture(self):
+        # (minimum, maximum, frame count) of the raw values seen by the reader since the capture started.
+        if self.io_mode == 'PROCESS':
+            if self.worker.samples is None:
+                return None, None, 0
+            return self.worker.samples.capture()
+        return self.calibrator.capture.result()
+
+    def finish_calibration_capture(self):
+        capture = self.calibration_capture()
+        self.calibrator.stop_capture()
+        self.sync_worker()
+        return capture
+
+    def condition_values(self, values):
+        # Raw decoded values -> calibrated -> filtered, in the reader.
+        values = self.calibrator.apply(values)
+        filter_bank = self.filter_bank
+        if filter_bank is None:
+            return values
+        return filter_bank.apply(values, time.perf_counter())
+
+    def publish(self, values, text):
+        self.hub.publish(self.condition_values(values), text)
+
+    def report_reader(self, kind, message):
+        flag, prefix = READER_DEBUG[kind]
+        if getattr(bpy.context.scene, flag):
+            print(f"{prefix}:--> {message}")
+
     def serial_thread(self):
-        self.running = True  
+        if self.filter_bank is not None:
+            self.filter_bank.reset()
+        self.reader.reset()
+        self.hub.clear()
+        self.link_stats.reset()
+        self._tx_sequence = 0
+        self.send_queue.clear()
+        self.send_queue.reset_stats()
+        self.outages = 0
+        self.last_outage = 0.0
+        self.probe.reset()
         while self.running:
             try:
                 current_mode = self.mode  
 
                 if self.serial_connection._serial_connection is not None and self.serial_connection._serial_connection.is_open:
-                    
-                    if current_mode in ['receive', 'both']:
-                        if self.serial_connection._serial_connection.in_waiting:
-                            data = self.serial_connection._serial_connection.readline().decode().rstrip()
-
-                            if bpy.context.scene.rawData_debug_mode:
-                                print(f"Serial Thread Debug:--> Initial data received: {data}")
-
-                            if not data:
-                                continue  
-
-                            if self.is_valid_data(data): 
-                                if bpy.context.scene.serialThread_debug_mode:
-                                    print(f"Serial Thread Debug:--> Valid data {data}")
-                                self.data_queue.put(self.parse_serial_data(data))
-                    
-                    if current_mode in ['send', 'both']:
-                        try:
-                            if not self.send_queue.empty():  
-                                data_to_send = self.send_queue.get_nowait()  
-                                if self.is_valid_send_data(data_to_send):  
-                                    self.send_serial_data(data_to_send)
-                            else:
-                                
-                                time.sleep(0.01)  
-
-                        except queue.Empty:
-                            pass  
+
+                    if self._ping_requested:
+                        self.write_ping()
+                    # Credit acks are read in every mode while flow control is on, echoes
+                    # while a probe is outstanding; in 'send' mode data frames are skipped.
+                    reading = (
+                        current_mode in ['receive', 'both']
+                        or self.send_queue.use_credits
+                        or self.probe.waiting()
+                    )
+                    sending = current_mode in ['send', 'both']
+                    if reading:
+                        # While sending, only what is already buffered: the loop waits on
+                        # the send queue instead, which wakes as soon as a message is queued.
+                        self.reader.read(self.serial_connection._serial_connection, current_mode != 'send',
+                                         block=not sending)
+
+                    if sending:
+                        data_to_send = self.send_queue.get(timeout=READ_POLL if reading else 0.01)
+                        while data_to_send is not None:
+                            self.send_serial_data(data_to_send)
+                            data_to_send = self.send_queue.get()
 
                 else:
                     break  
 
-            except serial.SerialException as error:
+            except (serial.SerialException, OSError) as error:
                 if bpy.context.scene.serialThread_debug_mode:
                     print(f"Serial Thread Debug:-->  Serial error: {error}")
-                break
-
-
-
-    def start_serial_thread(self):
-        thread = threading.Thread(target=self.serial_thread)
-        thread.daemon = True  
-        thread.start()
-
-    def stop_serial_thread(self):
-        self.running = False
-
-    def get_data_from_queue(self):
-        try:
-            return self.data_queue.get_nowait()
-        except queue.Empty:
-            return None
-        
+                if not (self.running and self.auto_reconnect and self.recover()):
+                    break
+
+        if self.running:
+            self.running = False
+            self.link_state = "Connection lost"
+
+    def recover(self):
+        # Reopen the port with exponential backoff until it is back or the thread is
+        # stopped. Mode, settings and the send queue are kept; stale messages expire
+        # through their deadline while the link is down.
+        lost_at = time.perf_counter()
+        delay = self.reconnect_delay_min
+        attempt = 0
+        self.outages += 1
+        while self.running:
+            attempt += 1
+            self.link_state = f"Reconnecting (attempt {attempt})"
+            if self.serial_connection.reconnect():
+                self.last_outage = time.perf_counter() - lost_at
+                self.reader.reset()
+                self.link_state = "Connected"
+                if bpy.context.scene.serialThread_debug_mode:
+                    print(f"Serial Thread Debug:--> Reconnected after {self.last_outage:.3f} s ({attempt} attempts)")
+                return True
+            self._stop_event.wait(delay)
+            delay = min(delay * 2, self.reconnect_delay_max)
+        return False
 
+    def reconnect_summary(self):
+        return f"Outages {self.outages} | Last {self.last_outage * 1000.0:.0f} ms"
 
-    def is_valid_data(self, serial_data):
-        if not serial_data:
-            if bpy.context.scene.dataValidation_debug_mode:
-                print("Data Validation Debug:--> Empty data string")
-            return False  
 
-        parts = serial_data.split(';')
-        if bpy.context.scene.dataValidation_debug_mode:
-            print(f"Data Validation Debug:--> Data split into parts: {parts}")  
 
-        if len(parts[0].strip()) > 0:
-            numerical_part = parts[0].strip()
-            if bpy.context.scene.dataValidation_debug_mode:
-                print(f"Data Validation Debug:--> Numerical part: {numerical_part}") 
-            
-            try:
-                numerical_values = list(map(float, numerical_part.split(',')))
-                if bpy.context.scene.dataValidation_debug_mode:
-                    print(f"Data Validation Debug:--> Valid Parsed numerical values: {numerical_values}")
-            except ValueError as e:
-                if bpy.context.scene.dataValidation_debug_mode:
-                    print(f"Data Validation Debug:--> Numerical data invalid - {numerical_part}, Error: {e}")
+    def start_serial_thread(self):
+        # Exactly one worker per connection: a second start while the worker is
+        # alive is ignored. Returns True when a new worker was started.
+        with self._lifecycle_lock:
+            if self._thread is not None and self._thread.is_alive():
                 return False
+            self.running = True
+            self._stop_event.clear()
+            self.link_state = "Connected"
+            self._thread = threading.Thread(target=self.serial_thread, name="blendix-serial")
+            self._thread.daemon = True  
+            self._thread.start()
+            return True
 
-        if len(parts) > 1:
-            text_part = parts[1].strip()
-            if bpy.context.scene.dataValidation_debug_mode:
-                print(f"Data Validation Debug:--> Text part: {text_part}")  
-            if text_part:
-                return True  
-        return True
-
-
-
-
-    def parse_serial_data(self, serial_data):
-        if not serial_data:
-            return [], ""
-
-        numerical_values = []
-        text_data = ""
-
-        if ';' in serial_data:
-            parts = serial_data.split(';', 1)
-            numerical_part = parts[0].strip()
-            
-            if numerical_part:
-                try:
-                    numerical_values = list(map(float, numerical_part.split(',')))  
-                except ValueError as e:
+    def stop_serial_thread(self, timeout=1.0):
+        with self._lifecycle_lock:
+            self.running = False
+            self._stop_event.set()
+            thread = self._thread
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout)
+                if thread.is_alive():
                     if bpy.context.scene.serialThread_debug_mode:
-                        print(f"Error parsing numerical data: {numerical_part}, Error: {e}")
-
-            if len(parts) > 1:
-                text_data = parts[1].strip()
-
-        elif serial_data.startswith(';'):
-            text_data = serial_data[1:].strip()  
+                        print("Serial Thread Debug:--> Worker did not stop within the timeout")
+                    return False
+            self._thread = None
+            self.worker.stop(timeout)
+            self.link_state = "Disconnected"
+            return True
 
-        return numerical_values, text_data
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_link_open(self):
+        if self.io_mode == 'PROCESS':
+            return self.worker.is_running()
+        connection = self.serial_connection._serial_connection
+        return connection is not None and connection.is_open
+
+    def pump_worker_samples(self):
+        # Process mode: forward the samples written to the shared ring since the
+        # last tick to the hub, so callback subscribers (the channel scope) see
+        # every frame. Called from the main thread; in-process the serial thread
+        # publishes itself.
+        if self.io_mode != 'PROCESS' or self.worker.samples is None:
+            return
+        for values, text in self.worker.samples.unread():
+            self.hub.publish(values, text)
+
+    def get_latest_data(self):
+        # Newest (values, text) sample since the last call, or None. The values
+        # are a read-only array shared with the other hub subscribers.
+        self.pump_worker_samples()
+        sample = self._scene_subscription.latest()
+        if sample is None:
+            return None
+        return sample.values, sample.text
+
+    # Out-of-process I/O (see blendix_worker)
+
+    def worker_settings(self):
+        connection = self.serial_connection
+        send_queue = self.send_queue
+        return {
+            "port": connection._port_name,
+            "baud_rate": connection._baud_rate,
+            "read_timeout": connection._read_timeout,
+            "inter_byte_timeout": connection._inter_byte_timeout,
+            "write_timeout": connection._write_timeout,
+            "low_latency": connection._low_latency,
+            "mode": self.mode,
+            "frame_format": self.frame_format,
+            "use_sequence": self.use_sequence,
+            "use_crc": self.use_crc,
+            "auto_reconnect": self.auto_reconnect,
+            "send_queue_size": send_queue.maxsize,
+            "send_deadline": send_queue.deadline,
+            "use_flow_control": send_queue.use_credits,
+            "initial_credits": send_queue.initial_credits,
+            "filters": self.filter_spec,
+            "calibration": self.calibrator.spec,
+            "capture": self.calibrator.capturing,
+        }
+
+    def start_worker_process(self, timeout=2.0):
+        # Returns True once the worker reports the port open.
+        with self._lifecycle_lock:
+            if self.worker.is_running():
+                return False
+            self.link_stats.reset()
+            self.send_queue.reset_stats()
+            self.hub.clear()
+            self.probe.reset()
+            self.outages = 0
+            self.last_outage = 0.0
+            self.worker.start(self.worker_settings())
+            self.running = True
+
+        samples = self.worker.samples
+        deadline = time.perf_counter() + timeout
+        while samples.link_state() == LINK_STARTING and self.worker.is_running() and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        if samples.link_state() == LINK_CONNECTED:
+            self.link_state = "Connected"
+            return True
+        self.stop_serial_thread()
+        return False
+
+    def sync_worker(self):
+        if self.io_mode == 'PROCESS':
+            self.worker.configure(self.worker_settings())
+
+    def refresh_worker_state(self):
+        # Called from the main thread: mirrors the worker's counters and link state.
+        samples = self.worker.samples
+        if self.io_mode != 'PROCESS' or samples is None:
+            return
+        counters = samples.counters()
+        for name in ("frames_ok", "frames_corrupt", "frames_lost", "frames_sent", "remote_lost"):
+            setattr(self.link_stats, name, counters[name])
+        for name in ("dropped_stale", "dropped_overflow", "replaced", "stalls", "credits"):
+            setattr(self.send_queue, name, counters[name])
+        self.outages = counters["outages"]
+        self.probe.sent = counters["probes_sent"]
+        self.probe.lost = counters["probes_lost"]
+        for sample in samples.probe_samples():
+            self.probe.add(sample)
+
+        state = samples.link_state()
+        if not self.worker.is_running():
+            self.link_state = "Connection lost"
+        elif state == LINK_RECONNECTING:
+            self.link_state = "Reconnecting"
+        elif state == LINK_CONNECTED:
+            self.link_state = "Connected"
+        
 
 
-    def is_valid_send_data(self, send_data):
-        if not send_data.endswith(';'):
-            return False  
-        
-        try:
-            numerical_data = send_data[:-1].split(',')
+    def handle_echo(self, probe_id, host_us, device_us=None):
+        sample = self.probe.echo(probe_id, host_us, device_us)
+        if sample is not None and bpy.context.scene.serialThread_debug_mode:
+            print(f"Serial Thread Debug:--> Echo {probe_id}: {sample[2] * 1000.0:.3f} ms")
 
-            for value in numerical_data:
-                if '.' in value:
-                    float_value = float(value)
-                    if len(value.split('.')[-1]) > 2:  
-                        return False
-                else:
-                    int(value)  
+    def request_ping(self):
+        # The ping is timestamped and written by the serial thread (or worker) itself,
+        # so the round trip does not include the send queue.
+        if self.io_mode == 'PROCESS':
+            self.worker.ping()
+        else:
+            self._ping_requested = True
 
-            return True
-        except (ValueError, IndexError):
-            return False
+    def write_ping(self):
+        self._ping_requested = False
+        self.serial_connection._serial_connection.write(encode_ping(*self.probe.ping(), self.codec.framing))
 
+    def handle_ack(self, credits, lost=None):
+        self.send_queue.grant(credits)
+        if lost is not None:
+            self.link_stats.remote_lost = lost
+        if bpy.context.scene.serialThread_debug_mode:
+            print(f"Serial Thread Debug:--> Ack: {credits} credits, device lost {lost}")
 
     def send_serial_data(self, send_data):
         try:
             if self.serial_connection._serial_connection is not None and self.serial_connection._serial_connection.is_open:
 
-                self.serial_connection._serial_connection.write(f"{send_data}\n".encode())
+                self.serial_connection._serial_connection.write(self.encode_send_frame(send_data))
+                self._tx_sequence = (self._tx_sequence + 1) % SEQUENCE_MODULO
+                self.link_stats.frames_sent += 1
                 if bpy.context.scene.serialThread_debug_mode:
                     print(f"Sent: {send_data}")
             else:
@@ -231,11 +503,29 @@ class SerialThread:
         except serial.SerialException as error:
             if bpy.context.scene.serialThread_debug_mode:
                 print(f"Failed to send data: {error}")
-
-
-    def queue_send_data(self, data):
-        """Queue data to be sent in the thread."""
-        self.send_queue.put(data)
+            # Let the thread loop see the failure and start the reconnect supervisor.
+            raise
+
+
+    def encode_send_frame(self, send_data):
+        # Outgoing frames carry the same sequence/CRC fields as incoming ones so
+        # the firmware can detect and report loss. Binary payloads arrive already
+        # packed as (frame_type, count, payload) and only need their header, bytes
+        # from stream codecs are written as they are.
+        if isinstance(send_data, tuple):
+            frame_type, count, payload = send_data
+            return wrap_binary_frame(frame_type, count, payload, self._tx_sequence)
+        if isinstance(send_data, bytes):
+            return send_data
+        frame = wrap_csv_frame(send_data, self._tx_sequence, self.use_sequence, self.use_crc)
+        return f"{frame}\n".encode()
+
+    def queue_send_data(self, data, stream="frame"):
+        """Queue data to be sent in the thread. A newer message on the same stream replaces an unsent one."""
+        if self.io_mode == 'PROCESS':
+            self.worker.send(data, stream)
+            return
+        self.send_queue.put(data, stream)
 
 
 
@@ -0,0 +1,121 @@
+import bpy
+from bpy.types import Operator
+
+# Live channels for drivers and Geometry Nodes inputs.
+#
+# The latest presented frame is published to bpy.app.driver_namespace, so
+# driver expressions read channels directly instead of chaining on transforms
+# written by the receive bindings:
+#
+#     bx(3)          channel 3 (0-based), 0.0 when the frame is shorter
+#     bx(3, 1.0)     the same with another default
+#     bx_text()      text part of the latest frame that had one
+#
+# Blender cannot see a namespace function as a dependency, so every driver also
+# gets a "tick" variable on the scene's driver_tick. driver_tick is written once
+# per presented frame: one depsgraph update re-evaluates all channel drivers,
+# instead of one RNA write per bound property.
+# Drivers with function calls need Auto Run Python Scripts to be enabled.
+
+
+class ChannelMailbox:
+
+    def __init__(self):
+        self.values = []
+        self.text = ""
+
+    def publish(self, numerical_data, text_data):
+        # A plain list: indexing it from many drivers is cheaper than NumPy scalars.
+        self.values = numerical_data.tolist() if hasattr(numerical_data, "tolist") else list(numerical_data)
+        if text_data:
+            self.text = text_data
+
+    def channel(self, index, default=0.0):
+        index = int(index)
+        values = self.values
+        return values[index] if 0 <= index < len(values) else default
+
+    def get_text(self):
+        return self.text
+
+
+mailbox = ChannelMailbox()
+
+
+def publish_driver_channels(scene, numerical_data, text_data):
+    mailbox.publish(numerical_data, text_data)
+    scene.driver_tick = (scene.driver_tick + 1) % 1000000
+
+
+def add_channel_driver(scene, owner, data_path, array_index, channel):
+    # One driver per array element, on consecutive channels from `channel`.
+    result = owner.driver_add(data_path, array_index)
+    fcurves = result if isinstance(result, list) else [result]
+    for offset, fcurve in enumerate(fcurves):
+        driver = fcurve.driver
+        driver.type = 'SCRIPTED'
+        driver.expression = f"bx({channel + offset})"
+        variable = driver.variables.get("tick") or driver.variables.new()
+        variable.name = "tick"
+        variable.type = 'SINGLE_PROP'
+        target = variable.targets[0]
+        target.id_type = 'SCENE'
+        target.id = scene
+        target.data_path = "driver_tick"
+    return len(fcurves)
+
+
+class AddChannelDriverOperator(Operator):
+    """Drive a property of the active object with received channels through bx(channel)"""
+    bl_idname = "object.add_channel_driver"
+    bl_label = "Add Channel Driver"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    data_path: bpy.props.StringProperty(
+        name="Data Path",
+        description="Property of the active object, e.g. location, data.energy or "
+                    "modifiers[\"GeometryNodes\"][\"Socket_2\"]",
+        default="location"
+    ) # type: ignore
+
+    array_index: bpy.props.IntProperty(
+        name="Array Index",
+        description="Element of an array property (-1 = all elements, on consecutive channels)",
+        default=-1,
+        min=-1
+    ) # type: ignore
+
+    channel: bpy.props.IntProperty(
+        name="Channel",
+        description="First received channel (0-based)",
+        default=0,
+        min=0
+    ) # type: ignore
+
+    @classmethod
+    def poll(cls, context):
+        return context.active_object is not None
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        scene = context.scene
+        try:
+            count = add_channel_driver(scene, context.active_object, self.data_path, self.array_index, self.channel)
+        except (TypeError, ValueError) as error:
+            self.report({'ERROR'}, f"Cannot add driver: {error}")
+            return {'CANCELLED'}
+        scene.use_driver_channels = True
+        self.report({'INFO'}, f"Added {count} channel drivers from channel {self.channel}")
+        return {'FINISHED'}
+
+
+def register():
+    bpy.app.driver_namespace["bx"] = mailbox.channel
+    bpy.app.driver_namespace["bx_text"] = mailbox.get_text
+
+
+def unregister():
+    for name in ("bx", "bx_text"):
+        bpy.app.driver_namespace.pop(name, None)
@@ -0,0 +1,148 @@
+import argparse
+import binascii
+import math
+import os
+import select
+import struct
+import sys
+import time
+
+# Firmware stand-in for testing the latency probe without hardware (Linux/macOS).
+# Only uses the standard library, run it directly:
+#
+#     python blendix_echo_stub.py --format csv --delay 2 --rate 100 --channels 6
+#
+# It opens a pseudo terminal, prints the device path to connect to from Blender,
+# echoes every ping after --delay milliseconds with its own clock reading added
+# (device clock = monotonic time + --offset ms), answers nothing else, and
+# optionally streams --channels sine values at --rate Hz so receive mode has data.
+# Protocol: see blendix_framing.
+
+BINARY_SYNC = b'\xA5\x5A'
+BINARY_HEADER = struct.Struct('<2sBHH')
+BINARY_CRC = struct.Struct('<H')
+FRAME_DATA = 0x01
+FRAME_PING = 0x05
+FRAME_ECHO = 0x06
+PROBE_PING = struct.Struct('<IQ')
+PROBE_ECHO = struct.Struct('<IQQ')
+
+
+def binary_frame(frame_type, count, payload, sequence=0):
+    body = BINARY_HEADER.pack(BINARY_SYNC, frame_type, sequence, count)[2:] + payload
+    return BINARY_SYNC + body + BINARY_CRC.pack(binascii.crc_hqx(body, 0xFFFF))
+
+
+class EchoStub:
+
+    def __init__(self, fd, frame_format, delay, offset, rate, channels):
+        self.fd = fd
+        self.frame_format = frame_format
+        self.delay = delay
+        self.offset = offset
+        self.rate = rate
+        self.channels = channels
+        self.buffer = bytearray()
+        self.replies = []
+        self.sequence = 0
+        self.echoes = 0
+
+    def device_us(self, now):
+        return int((now + self.offset) * 1e6)
+
+    def feed(self, chunk, now):
+        self.buffer += chunk
+        if self.frame_format == 'BINARY':
+            self.feed_binary(now)
+        else:
+            self.feed_csv(now)
+
+    def feed_csv(self, now):
+        *lines, rest = self.buffer.split(b'\n')
+        self.buffer = bytearray(rest)
+        for line in lines:
+            line = line.decode(errors='replace').strip()
+            if line.startswith('!P'):
+                probe_id, host_us = line[2:].split(',')[:2]
+                reply = f"!E{probe_id},{host_us},{self.device_us(now)}\n".encode()
+                self.replies.append((now + self.delay, reply))
+
+    def feed_binary(self, now):
+        buffer = self.buffer
+        while True:
+            start = buffer.find(BINARY_SYNC)
+            if start < 0 or len(buffer) - start < BINARY_HEADER.size:
+                break
+            _, frame_type, _, count = BINARY_HEADER.unpack_from(buffer, start)
+            size = count if frame_type != FRAME_DATA else count * 4
+            end = start + BINARY_HEADER.size + size + BINARY_CRC.size
+            if len(buffer) < end:
+                break
+            if frame_type == FRAME_PING and size >= PROBE_PING.size:
+                probe_id, host_us = PROBE_PING.unpack_from(buffer, start + BINARY_HEADER.size)
+                payload = PROBE_ECHO.pack(probe_id, host_us, self.device_us(now))
+                self.replies.append((now + self.delay, binary_frame(FRAME_ECHO, len(payload), payload)))
+            del buffer[:end]
+
+    def data_frame(self, now):
+        values = [math.sin(now * 2.0 * math.pi * 0.5 + k) for k in range(self.channels)]
+        self.sequence = (self.sequence + 1) % 0x10000
+        if self.frame_format == 'BINARY':
+            return binary_frame(FRAME_DATA, len(values), struct.pack(f'<{len(values)}f', *values), self.sequence)
+        return (", ".join(f"{value:.3f}" for value in values) + ";stub\n").encode()
+
+    def run(self):
+        next_data = time.monotonic()
+        while True:
+            now = time.monotonic()
+            waits = [0.1]
+            if self.replies:
+                waits.append(self.replies[0][0] - now)
+            if self.rate > 0:
+                waits.append(next_data - now)
+            readable, _, _ = select.select([self.fd], [], [], max(min(waits), 0.0))
+            now = time.monotonic()
+            if readable:
+                try:
+                    chunk = os.read(self.fd, 4096)
+                except OSError:
+                    # Nothing connected to the other end yet, or it was closed.
+                    time.sleep(0.05)
+                    continue
+                self.feed(chunk, now)
+
+            while self.replies and self.replies[0][0] <= now:
+                os.write(self.fd, self.replies.pop(0)[1])
+                self.echoes += 1
+            if self.rate > 0 and now >= next_data:
+                os.write(self.fd, self.data_frame(now))
+                next_data = max(next_data + 1.0 / self.rate, now)
+
+
+def main(argv=None):
+    import pty
+    import tty
+
+    parser = argparse.ArgumentParser(prog="blendix_echo_stub")
+    parser.add_argument("--format", choices=("csv", "binary"), default="csv")
+    parser.add_argument("--delay", type=float, default=0.0, help="echo delay in ms")
+    parser.add_argument("--offset", type=float, default=0.0, help="device clock offset in ms")
+    parser.add_argument("--rate", type=float, default=0.0, help="data frames per second (0 = none)")
+    parser.add_argument("--channels", type=int, default=3)
+    arguments = parser.parse_args(argv)
+
+    master, slave = pty.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    print(f"Echo stub on {os.ttyname(slave)} ({arguments.format}), Ctrl+C to stop", flush=True)
+    stub = EchoStub(master, arguments.format.upper(), arguments.delay / 1000.0, arguments.offset / 1000.0,
+                    arguments.rate, arguments.channels)
+    try:
+        stub.run()
+    except KeyboardInterrupt:
+        pass
+    print(f"{stub.echoes} echoes sent")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
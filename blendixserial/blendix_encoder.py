@@ -0,0 +1,113 @@
+import struct
+import numpy as np
+from .blendix_framing import FRAME_DATA, FRAME_PACKED, FRAME_PARTIAL
+from .blendix_codecs import get_codec
+
+# Outgoing frame encoder compiled once from the send binding list.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# Every channel is either a float with its own number of decimals, or a
+# fixed-point integer: round(value * scale), saturated to int16 or int32.
+# A frame is produced with one vectorised conversion followed by a single
+# str.format (text) or struct.pack (binary) call. The frame layout itself
+# belongs to the codec named by the frame format (see blendix_codecs).
+
+FIXED_LIMITS = {
+    'INT16': (-32768, 32767, 'h'),
+    'INT32': (-2147483648, 2147483647, 'i'),
+}
+
+PARTIAL_GROUP = struct.Struct('<HB')
+
+
+class FrameEncoder:
+
+    def __init__(self, precisions, fixed_scales, fixed_types):
+        # fixed_scales[i] == 0 marks a float channel, fixed_types[i] is ignored for those.
+        channel_count = len(precisions)
+        fixed_scales = np.asarray(fixed_scales, dtype=np.float64)
+        self.fixed_index = np.flatnonzero(fixed_scales)
+        self.fixed_scale = fixed_scales[self.fixed_index]
+        self.fixed_low = np.array([FIXED_LIMITS[fixed_types[i]][0] for i in self.fixed_index], dtype=np.float64)
+        self.fixed_high = np.array([FIXED_LIMITS[fixed_types[i]][1] for i in self.fixed_index], dtype=np.float64)
+
+        fields = []
+        codes = []
+        for i in range(channel_count):
+            if fixed_scales[i]:
+                fields.append("{:.0f}")
+                codes.append(FIXED_LIMITS[fixed_types[i]][2])
+            else:
+                fields.append(f"{{:.{precisions[i]}f}}")
+                codes.append('f')
+        self.values_template = ", ".join(fields)
+        self.csv_fields = fields
+        self.binary_codes = codes
+        self._group_formats = {}
+
+        self.binary_struct = struct.Struct('<' + ''.join(codes))
+        if len(self.fixed_index):
+            self.binary_type, self.binary_count = FRAME_PACKED, self.binary_struct.size
+        else:
+            self.binary_type, self.binary_count = FRAME_DATA, channel_count
+
+    def fixed_values(self, values):
+        scaled = np.rint(values[self.fixed_index] * self.fixed_scale)
+        # "+ 0.0" turns -0.0 into 0.0 so rounding never prints "-0".
+        return np.clip(scaled, self.fixed_low, self.fixed_high) + 0.0
+
+    def format_values(self, values):
+        # "1.00, 2.00, 3" with every channel's own format.
+        if len(self.fixed_index):
+            values = values.copy()
+            values[self.fixed_index] = self.fixed_values(values)
+        return self.values_template.format(*values.tolist())
+
+    def encode_csv(self, values):
+        return self.format_values(values) + ";"
+
+    def encode_binary(self, values):
+        # Payload only; the serial thread adds the header with its sequence number and the CRC.
+        if len(self.fixed_index):
+            arguments = values.astype(object)
+            arguments[self.fixed_index] = self.fixed_values(values).astype(np.int64).astype(object)
+        else:
+            arguments = values.tolist()
+        return self.binary_type, self.binary_count, self.binary_struct.pack(*arguments)
+
+    def prepare(self, values):
+        # Python values for encode_group, fixed-point channels already scaled and saturated.
+        prepared = values.tolist()
+        if len(self.fixed_index):
+            for i, value in zip(self.fixed_index.tolist(), self.fixed_values(values).tolist()):
+                prepared[i] = int(value)
+        return prepared
+
+    def group_template(self, start, width):
+        # Text fields of one binding's channels, for the codecs' partial frames.
+        template = self._group_formats.get((start, width, 'TEXT'))
+        if template is None:
+            template = ",".join(self.csv_fields[start:start + width])
+            self._group_formats[(start, width, 'TEXT')] = template
+        return template
+
+    def binary_group(self, prepared, start, width):
+        group_format = self._group_formats.get((start, width, 'BINARY'))
+        if group_format is None:
+            group_format = struct.Struct('<' + ''.join(self.binary_codes[start:start + width]))
+            self._group_formats[(start, width, 'BINARY')] = group_format
+        return PARTIAL_GROUP.pack(start, width) + group_format.pack(*prepared[start:start + width])
+
+    def binary_partial(self, pieces):
+        payload = b''.join(pieces)
+        return FRAME_PARTIAL, len(payload), payload
+
+    def encode_group(self, prepared, start, width, frame_format):
+        # One binding's piece of a partial frame (see blendix_framing).
+        return get_codec(frame_format).encode_group(self, prepared, start, width)
+
+    def encode_partial(self, pieces, frame_format):
+        return get_codec(frame_format).encode_partial(self, pieces)
+
+    def encode(self, values, frame_format):
+        return get_codec(frame_format).encode(self, values)
@@ -0,0 +1,115 @@
+import math
+import numpy as np
+
+# Per-channel filter stage run by the reader (thread or worker process) on every
+# decoded frame, before the frame reaches Blender.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# Each channel has one filter. Channels are grouped by filter type when the
+# bank is built, and each group is updated with a handful of array operations
+# per frame, so the cost hardly depends on the number of channels.
+#
+#     LOWPASS     exponential low-pass with a cutoff frequency
+#     ONE_EURO    low-pass whose cutoff rises with speed (min cutoff, beta, derivative cutoff)
+#     MEDIAN      moving median over the last N frames
+#     RATE_LIMIT  output moves at most rate units per second
+#
+# The spec is a dict of equally long per-channel lists (see receive_filter_spec
+# in blendix_bindings) so it can be passed to the worker process as JSON.
+
+FILTER_KINDS = ('NONE', 'LOWPASS', 'ONE_EURO', 'MEDIAN', 'RATE_LIMIT')
+
+
+def smoothing_factor(tau, dt):
+    # tau = 1 / (2 pi cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+def time_constant(cutoff):
+    return 1.0 / (2.0 * math.pi * np.maximum(cutoff, 1e-6))
+
+
+class FilterBank:
+
+    def __init__(self, spec):
+        kinds = np.asarray(spec["kind"])
+        cutoff = np.asarray(spec["cutoff"], dtype=np.float64)
+        self.size = len(kinds)
+
+        self.lowpass = np.flatnonzero(kinds == 'LOWPASS')
+        self.lowpass_tau = time_constant(cutoff[self.lowpass])
+
+        self.one_euro = np.flatnonzero(kinds == 'ONE_EURO')
+        self.one_euro_min_cutoff = cutoff[self.one_euro]
+        self.one_euro_beta = np.asarray(spec["beta"], dtype=np.float64)[self.one_euro]
+        self.one_euro_derivative_tau = time_constant(np.asarray(spec["derivative_cutoff"], dtype=np.float64)[self.one_euro])
+
+        self.rate_limit = np.flatnonzero(kinds == 'RATE_LIMIT')
+        self.rate = np.asarray(spec["rate"], dtype=np.float64)[self.rate_limit]
+
+        # Median channels are grouped by window length: [indices, history, write position]
+        median = np.flatnonzero(kinds == 'MEDIAN')
+        windows = np.asarray(spec["window"], dtype=np.int64)[median]
+        self.median_groups = [[median[windows == window], None, 0] for window in np.unique(windows)]
+        self.median_windows = [int(window) for window in np.unique(windows)]
+
+        self.reset()
+
+    def reset(self):
+        self.previous = None
+        self.derivative = np.zeros(len(self.one_euro))
+        self.last_time = None
+
+    def apply(self, values, now):
+        # Returns a new float64 array; channels past the configured layout pass through.
+        output = np.array(values, dtype=np.float64)
+        if not len(output):
+            # Text-only frame.
+            return output
+        if len(output) < self.size:
+            # The frame does not match the configured layout, keep it unfiltered.
+            self.reset()
+            return output
+
+        head = output[:self.size]
+        if self.previous is None:
+            self.previous = head.copy()
+            self.last_time = now
+            for group, window in zip(self.median_groups, self.median_windows):
+                group[1] = np.repeat(head[group[0], np.newaxis], window, axis=1)
+            return output
+
+        dt = max(now - self.last_time, 1e-6)
+        self.last_time = now
+        previous = self.previous
+
+        index = self.lowpass
+        if len(index):
+            head[index] = previous[index] + smoothing_factor(self.lowpass_tau, dt) * (head[index] - previous[index])
+
+        index = self.one_euro
+        if len(index):
+            speed = (head[index] - previous[index]) / dt
+            self.derivative += smoothing_factor(self.one_euro_derivative_tau, dt) * (speed - self.derivative)
+            tau = time_constant(self.one_euro_min_cutoff + self.one_euro_beta * np.abs(self.derivative))
+            head[index] = previous[index] + smoothing_factor(tau, dt) * (head[index] - previous[index])
+
+        for group in self.median_groups:
+            index, history, position = group
+            history[:, position] = head[index]
+            group[2] = (position + 1) % history.shape[1]
+            head[index] = np.median(history, axis=1)
+
+        index = self.rate_limit
+        if len(index):
+            step = self.rate * dt
+            head[index] = previous[index] + np.clip(head[index] - previous[index], -step, step)
+
+        self.previous = head.copy()
+        return output
+
+
+def build_filter_bank(spec):
+    if not spec or all(kind == 'NONE' for kind in spec["kind"]):
+        return None
+    return FilterBank(spec)
@@ -0,0 +1,242 @@
+import binascii
+import struct
+import numpy as np
+
+# Frame integrity helpers shared by the reader and the sender.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# CSV framing (sequence and CRC are both optional):
+#     [<seq>:]<values>;<text>[*<CRC>]
+#     e.g.  "17:1.00,2.00,3.00;hello*3FA2"
+# The CRC is CRC-16/CCITT-FALSE over every character before the '*',
+# written as four upper-case hex digits. Line codecs other than CSV (see
+# blendix_codecs) put their own payload in place of <values>;<text>.
+#
+# Binary framing (little endian):
+#     A5 5A | type u8 | seq u16 | count u16 | count x float32 | crc u16
+# The CRC covers everything after the two sync bytes up to the CRC itself.
+# FRAME_PACKED frames carry mixed float32/int16/int32 fields laid out as the
+# send channels are configured; their count field is the payload size in bytes.
+#
+# Partial frames (multi-rate sending) carry only the bindings that are due,
+# each tagged with the index of its first channel in the full frame layout:
+#     CSV:    "@<first>=<v>,<v>,...|<first>=<v>,...;"   e.g. "@0=1.00,2.00,3.00|12=0.50;"
+#     Binary: type FRAME_PARTIAL, count = payload size in bytes; the payload is
+#             a sequence of  first u16 | channels u8 | fields as in FRAME_PACKED
+#
+# Latency probes (see blendix_latency), never sequence-numbered or CRC'd in CSV:
+#     CSV:    host "!P<id>,<host_us>"   device echo "!E<id>,<host_us>[,<device_us>]"
+#     Binary: FRAME_PING  id u32 | host_us u64
+#             FRAME_ECHO  id u32 | host_us u64 [| device_us u64]
+#             count = payload size in bytes, sequence field 0
+# The device echoes id and host_us unchanged, device_us is its own clock on receipt.
+#
+# Control messages from the device:
+#     CSV:    "!A<credits>[,<lost>]"   (sent as their own line, no sequence/CRC)
+#     Binary: type FRAME_ACK, the sequence field carries the credits and an
+#             optional first value the number of frames the device lost.
+
+SEQUENCE_MODULO = 0x10000
+
+BINARY_SYNC = b'\xA5\x5A'
+BINARY_HEADER = struct.Struct('<2sBHH')
+BINARY_CRC = struct.Struct('<H')
+BINARY_MAX_PAYLOAD = 8192 * 4
+
+FRAME_DATA = 0x01
+FRAME_ACK = 0x02
+FRAME_PACKED = 0x03
+FRAME_PARTIAL = 0x04
+FRAME_PING = 0x05
+FRAME_ECHO = 0x06
+# Frame types whose count field is the payload size in bytes rather than a float count.
+BYTE_COUNT_FRAMES = (FRAME_PACKED, FRAME_PARTIAL, FRAME_PING, FRAME_ECHO)
+
+PROBE_PING = struct.Struct('<IQ')
+PROBE_ECHO = struct.Struct('<IQQ')
+
+CONTROL_PREFIX = '!'
+
+
+class FrameError(ValueError):
+    pass
+
+
+def crc16(data, crc=0xFFFF):
+    return binascii.crc_hqx(data, crc)
+
+
+class LinkStats:
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frames_ok = 0
+        self.frames_corrupt = 0
+        self.frames_lost = 0
+        self.frames_sent = 0
+        self.remote_lost = 0
+        self._expected_sequence = None
+
+    def check_sequence(self, sequence):
+        # Gaps of less than half the sequence space are counted as lost frames;
+        # anything else is a device restart or reordering and just resynchronises.
+        if self._expected_sequence is not None:
+            gap = (sequence - self._expected_sequence) % SEQUENCE_MODULO
+            if 0 < gap < SEQUENCE_MODULO // 2:
+                self.frames_lost += gap
+        self._expected_sequence = (sequence + 1) % SEQUENCE_MODULO
+
+    def summary(self):
+        text = f"OK {self.frames_ok} | Lost {self.frames_lost} | Corrupt {self.frames_corrupt}"
+        if self.remote_lost:
+            text += f" | Device lost {self.remote_lost}"
+        return text
+
+
+def parse_ack_line(line):
+    # "!A<credits>[,<lost>]" -> (credits, lost or None)
+    fields = line[2:].split(',')
+    try:
+        credits = int(fields[0])
+        lost = int(fields[1]) if len(fields) > 1 and fields[1].strip() else None
+    except ValueError:
+        raise FrameError(f"malformed acknowledgement '{line}'")
+    return credits, lost
+
+
+def parse_echo_line(line):
+    # "!E<id>,<host_us>[,<device_us>]" -> (id, host_us, device_us or None)
+    fields = line[2:].split(',')
+    try:
+        probe_id, host_us = int(fields[0]), int(fields[1])
+        device_us = int(fields[2]) if len(fields) > 2 and fields[2].strip() else None
+    except (ValueError, IndexError):
+        raise FrameError(f"malformed echo '{line}'")
+    return probe_id, host_us, device_us
+
+
+def decode_echo_payload(payload):
+    if len(payload) >= PROBE_ECHO.size:
+        return PROBE_ECHO.unpack_from(payload)
+    if len(payload) >= PROBE_PING.size:
+        return PROBE_PING.unpack_from(payload) + (None,)
+    raise FrameError("short echo frame")
+
+
+def encode_ping(probe_id, host_us, framing):
+    if framing == 'BINARY':
+        return wrap_binary_frame(FRAME_PING, PROBE_PING.size, PROBE_PING.pack(probe_id, host_us))
+    return f"{CONTROL_PREFIX}P{probe_id},{host_us}\n".encode()
+
+
+# CSV framing
+
+def unwrap_csv_frame(line, use_sequence=False, use_crc=False):
+    sequence = None
+
+    if use_crc:
+        body, star, checksum = line.rpartition('*')
+        if not star:
+            raise FrameError("missing CRC")
+        try:
+            expected = int(checksum.strip(), 16)
+        except ValueError:
+            raise FrameError(f"malformed CRC '{checksum}'")
+        if crc16(body.encode()) != expected:
+            raise FrameError("CRC mismatch")
+        line = body
+
+    if use_sequence:
+        prefix, colon, line = line.partition(':')
+        if not colon:
+            raise FrameError("missing sequence number")
+        try:
+            sequence = int(prefix) % SEQUENCE_MODULO
+        except ValueError:
+            raise FrameError(f"malformed sequence number '{prefix}'")
+
+    return sequence, line
+
+
+def wrap_csv_frame(payload, sequence=0, use_sequence=False, use_crc=False):
+    if use_sequence:
+        payload = f"{sequence}:{payload}"
+    if use_crc:
+        payload = f"{payload}*{crc16(payload.encode()):04X}"
+    return payload
+
+
+# Binary framing
+
+def binary_payload_size(frame_type, count):
+    return count if frame_type in BYTE_COUNT_FRAMES else count * 4
+
+
+def wrap_binary_frame(frame_type, count, payload, sequence=0):
+    body = BINARY_HEADER.pack(BINARY_SYNC, frame_type, sequence % SEQUENCE_MODULO, count)[2:] + payload
+    return BINARY_SYNC + body + BINARY_CRC.pack(crc16(body))
+
+
+def encode_binary_frame(values, sequence=0, frame_type=FRAME_DATA):
+    payload = np.asarray(values, dtype='<f4').tobytes()
+    return wrap_binary_frame(frame_type, len(payload) // 4, payload, sequence)
+
+
+def decode_binary_values(payload):
+    # Zero-copy, read-only float32 view over the frame payload.
+    return np.frombuffer(payload, dtype='<f4')
+
+
+class BinaryFrameSplitter:
+    """Accumulates raw bytes and yields complete binary frames, resyncing on corruption."""
+
+    def __init__(self, stats, check_crc=True):
+        self.stats = stats
+        self.check_crc = check_crc
+        self._buffer = bytearray()
+
+    def reset(self):
+        self._buffer.clear()
+
+    def feed(self, chunk):
+        buffer = self._buffer
+        buffer += chunk
+        frames = []
+        position = 0
+
+        while True:
+            start = buffer.find(BINARY_SYNC, position)
+            if start < 0:
+                # Keep a trailing first sync byte, it may be completed by the next chunk.
+                position = len(buffer) - 1 if buffer.endswith(BINARY_SYNC[:1]) else len(buffer)
+                break
+            if len(buffer) - start < BINARY_HEADER.size:
+                position = start
+                break
+
+            _, frame_type, sequence, count = BINARY_HEADER.unpack_from(buffer, start)
+            payload_size = binary_payload_size(frame_type, count)
+            if payload_size > BINARY_MAX_PAYLOAD:
+                self.stats.frames_corrupt += 1
+                position = start + 1
+                continue
+
+            end = start + BINARY_HEADER.size + payload_size + BINARY_CRC.size
+            if len(buffer) < end:
+                position = start
+                break
+
+            body = bytes(buffer[start + 2:end - BINARY_CRC.size])
+            if self.check_crc and crc16(body) != BINARY_CRC.unpack_from(buffer, end - BINARY_CRC.size)[0]:
+                # Skip only the sync bytes so a real frame hidden inside is still found.
+                self.stats.frames_corrupt += 1
+                position = start + 1
+                continue
+
+            frames.append((frame_type, sequence, body[BINARY_HEADER.size - 2:]))
+            position = end
+
+        del buffer[:position]
+        return frames
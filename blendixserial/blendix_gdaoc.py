@@ -1,29 +1,116 @@
 import bpy
+import time
 from .blendix_connection import serial_thread, serial_connection
-import math
+import numpy as np
 import serial
+from .blendix_stream import StreamPacer, RateMeter
+from .blendix_scheduler import SendScheduler
+from .blendix_drivers import publish_driver_channels
+from .blendix_bindings import (
+    channel_offsets,
+    get_receive_bindings,
+    get_send_bindings,
+    invalidate_bindings,
+    tag_view3d_redraw,
+)
 from bpy.app.handlers import persistent
 
 
 
+# Received frames are ingested on every timer tick: batched (notifier-free)
+# targets are written immediately, the frame is kept as the latest state.
+# Everything that makes Blender redraw - RNA property writes, text bodies and
+# the explicit 3D View redraw for batched targets - is presented with the
+# latest state at most display_rate times per second.
+#
+# "Applied" counts those throttled writes. "Drawn" is the redraw rate of the
+# busiest 3D View: the draw handler runs once per view, so every view has its
+# own meter and several open viewports don't add up.
+class DisplayThrottle:
+
+    def __init__(self):
+        self.pending = None
+        self.batched_dirty = False
+        self.last_present = 0.0
+        self.applied = RateMeter()
+        self.drawn = {}
+
+    def ingest(self, scene, numerical_data, text_data):
+        if len(numerical_data):
+            try:
+                if get_receive_bindings(scene).apply_batched(numerical_data):
+                    self.batched_dirty = True
+            except ReferenceError:
+                invalidate_bindings()
+        if not text_data and self.pending is not None:
+            # Keep text from a frame that was superseded before it was shown.
+            text_data = self.pending[1]
+        self.pending = (numerical_data, text_data)
+
+    def present(self, scene, force=False):
+        if self.pending is None and not self.batched_dirty:
+            return
+        now = time.perf_counter()
+        if not force and now - self.last_present < 1.0 / scene.display_rate:
+            return
+        self.last_present = now
+        self.applied.tick(now)
+
+        if self.pending is not None:
+            if scene.use_driver_channels:
+                publish_driver_channels(scene, *self.pending)
+            process_data(bpy.context, *self.pending)
+            self.pending = None
+        if self.batched_dirty:
+            self.batched_dirty = False
+            tag_view3d_redraw()
+
+    def count_draw(self, region):
+        pointer = region.as_pointer()
+        meter = self.drawn.get(pointer)
+        if meter is None:
+            meter = self.drawn[pointer] = RateMeter()
+        meter.tick()
+
+    def drawn_rate(self):
+        rates = {pointer: meter.rate() for pointer, meter in self.drawn.items()}
+        # Views that stopped drawing for a second are closed or hidden.
+        for pointer, rate in rates.items():
+            if not rate:
+                del self.drawn[pointer]
+        return max(rates.values(), default=0)
+
+    def summary(self):
+        return f"Applied {self.applied.rate()} Hz | Drawn {self.drawn_rate()} Hz"
+
+
+display_throttle = DisplayThrottle()
+
+
+def count_viewport_draw():
+    display_throttle.count_draw(bpy.context.region)
+
+
 def timer_func():
     if not hasattr(timer_func, "last_numerical_data"):
         timer_func.last_numerical_data = None
     if not hasattr(timer_func, "last_text_data"):
         timer_func.last_text_data = None
 
-    if serial_connection._serial_connection is not None and not serial_thread.pause_movement:
-        latest_data = None
-        while not serial_thread.data_queue.empty():
-            latest_data = serial_thread.get_data_from_queue()  
+    if serial_thread.pause_movement and serial_thread.is_link_open():
+        # Other hub subscribers keep receiving in process mode while movement is stopped.
+        serial_thread.pump_worker_samples()
+
+    if serial_thread.is_link_open() and not serial_thread.pause_movement:
+        latest_data = serial_thread.get_latest_data()
         if latest_data:
             numerical_data, text_data = latest_data  
 
-            if numerical_data != timer_func.last_numerical_data or text_data != timer_func.last_text_data:
+            if not is_same_frame(numerical_data, timer_func.last_numerical_data) or text_data != timer_func.last_text_data:
                 if bpy.context.scene.data_processing_received_debug_mode:
                     print(f"Data Processing Received:--> Data in Queue - Numerical: {numerical_data}, Text: '{text_data}'")
-                process_data(bpy.context, numerical_data, text_data)
 
+                display_throttle.ingest(bpy.context.scene, numerical_data, text_data)
                 timer_func.last_numerical_data = numerical_data
                 timer_func.last_text_data = text_data
             else:
@@ -32,33 +119,62 @@ def timer_func():
         else:
             if bpy.context.scene.data_processing_received_debug_mode:
                 print("Data Processing Received:--> No data available in the queue")
+
+        display_throttle.present(bpy.context.scene)
     
     return  bpy.context.scene.updateSceneDelay   
 
+# The serial thread cannot touch scene data; its link state is relayed to the
+# connection panel from here.
+def connection_status_timer():
+    scene = bpy.context.scene
+    if scene is None:
+        return 0.25
+    props = scene.serial_connection_properties
+    serial_thread.refresh_worker_state()
+    if props.is_connected and props.connection_status != serial_thread.link_state:
+        props.connection_status = serial_thread.link_state
+        if serial_thread.link_state == "Connection lost":
+            props.is_connected = False
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+    return 0.25
+
+
+def latency_probe_timer():
+    scene = bpy.context.scene
+    if scene is None:
+        return 0.5
+    props = scene.serial_connection_properties
+    if not (props.use_latency_probe and serial_thread.is_link_open()):
+        return 0.5
+    serial_thread.request_ping()
+    tag_view3d_redraw()
+    return 1.0 / props.probe_rate
+
+
 # Timer + Keyframe Shared 
-def send_serial_data():
+def send_serial_data(depsgraph=None):
     scene = bpy.context.scene
 
     if (
-        serial_connection._serial_connection is not None
-        and serial_connection._serial_connection.is_open
+        serial_thread.is_link_open()
         and serial_thread.pause_movement is False
         and serial_thread.mode in ['send', 'both']
     ):
         try:
-            data_to_send = ""
-
-            for i, item in enumerate(scene.send_object_collection):
-                obj = item.sel_object
-                property_name = item.property_name
-                selected_axes = item.selected_axes
-
-                data_to_send += format_data_for_object(obj, property_name, selected_axes)
+            if depsgraph is None:
+                depsgraph = bpy.context.evaluated_depsgraph_get()
+            send_bindings = get_send_bindings(scene)
+            try:
+                values = send_bindings.gather(depsgraph)
+            except ReferenceError:
+                invalidate_bindings()
+                return
 
-                if i < len(scene.send_object_collection) - 1:
-                    data_to_send += ", "
-
-            data_to_send += ";"
+            data_to_send = send_bindings.encoder.encode(values, serial_thread.frame_format)
 
             serial_thread.queue_send_data(data_to_send)
 
@@ -80,84 +196,187 @@ def send_timer_func():
 
 # Keyframe-Based – triggered by timeline frame changes 
 @persistent
-def on_frame_change_post(scene):
+def on_frame_change_post(scene, depsgraph=None):
+    if scene.send_data_method == 'STREAM':
+        send_stream_block(scene, depsgraph)
+        return
+
     if scene.send_data_method != 'KEYFRAME':
         return  
 
     frame_skip_interval = getattr(scene, "frame_skip_interval", 1)
     if frame_skip_interval == 0 or scene.frame_current % frame_skip_interval == 0:
-        send_serial_data()
+        send_serial_data(depsgraph)
 
 
 
-def process_data(context, numerical_data, text_data):
-    scene = context.scene
-    if numerical_data:
-        update_objects(scene, numerical_data)
-        update_axis_text_objects(scene, numerical_data)
-    if text_data:
-        update_received_text(text_data) 
+# Stream-Based – during playback every frame change samples the sent F-curves at
+# sub-frame times and hands the encoded setpoints to the pacing thread, which
+# emits them at stream_rate. Outside playback a single frame is sent.
+def send_stream_block(scene, depsgraph):
+    if (
+        not serial_thread.is_link_open()
+        or serial_thread.pause_movement
+        or serial_thread.mode not in ['send', 'both']
+    ):
+        return
 
+    screen = bpy.context.screen
+    if screen is None or not screen.is_animation_playing:
+        send_serial_data(depsgraph)
+        return
 
-def update_objects(scene, numerical_data):
-    for i, item in enumerate(scene.custom_object_collection):
+    now = time.perf_counter()
+    fps = scene.render.fps / scene.render.fps_base
+    samples_per_frame = max(1, round(scene.stream_rate / fps))
+    frame = scene.frame_current + scene.frame_subframe
+    frames = [frame + k / samples_per_frame for k in range(samples_per_frame)]
 
-        if i * 3 + 2 >= len(numerical_data):
-            continue
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+    send_bindings = get_send_bindings(scene)
+    try:
+        block = send_bindings.sample_animation(frames, send_bindings.gather(depsgraph))
+    except ReferenceError:
+        invalidate_bindings()
+        return
 
-        selected_object = item.sel_object
-        property_name = item.property_name
-        selected_axes = item.selected_axes
+    encoder = send_bindings.encoder
+    frame_format = serial_thread.frame_format
+    payloads = [encoder.encode(row, frame_format) for row in block]
+    stream_pacer.start()
+    stream_pacer.schedule_block(now, 1.0 / (fps * samples_per_frame), payloads)
 
-        if selected_object:
-            base_index = i * 3
-            if property_name == "location":
-                update_location(selected_object, selected_axes, numerical_data, base_index)
-            elif property_name == "rotation_euler":
-                update_rotation(selected_object, selected_axes, numerical_data, base_index)
-            elif property_name == "scale":
-                update_scale(selected_object, selected_axes, numerical_data, base_index)
 
+def queue_stream_sample(payload):
+    serial_thread.queue_send_data(payload, stream="stream")
 
 
-def update_location(obj, selected_axes, numerical_data, base_index):
-    if "X" in selected_axes and base_index < len(numerical_data):
-        obj.location.x = numerical_data[base_index]
-    if "Y" in selected_axes and base_index + 1 < len(numerical_data):
-        obj.location.y = numerical_data[base_index + 1]
-    if "Z" in selected_axes and base_index + 2 < len(numerical_data):
-        obj.location.z = numerical_data[base_index + 2]
+stream_pacer = StreamPacer(queue_stream_sample)
 
 
+# Multi-Rate – each object is sent at its own rate. A tick sends one partial
+# frame with the objects that are due, highest priority first, within what the
+# link can carry at its baud rate.
+def send_scheduled_bindings(scene):
+    if (
+        not serial_thread.is_link_open()
+        or serial_thread.pause_movement
+        or serial_thread.mode not in ['send', 'both']
+    ):
+        send_scheduler.last_tick = None
+        return
+
+    send_bindings = get_send_bindings(scene)
+    send_scheduler.configure(send_bindings.schedule_layout)
+    now = time.perf_counter()
+    if not send_scheduler.due(now):
+        return
+
+    try:
+        values = send_bindings.gather(bpy.context.evaluated_depsgraph_get())
+    except ReferenceError:
+        invalidate_bindings()
+        return
+
+    encoder = send_bindings.encoder
+    frame_format = serial_thread.frame_format
+    prepared = encoder.prepare(values)
+    send_scheduler.refill(now, serial_connection._baud_rate / 10.0, 1.0 / scene.schedule_rate)
+    pieces = send_scheduler.select(
+        now, lambda binding: encoder.encode_group(prepared, binding.start, binding.width, frame_format)
+    )
+    if not pieces:
+        return
+
+    data_to_send = encoder.encode_partial(pieces, frame_format)
+    serial_thread.queue_send_data(data_to_send, stream="scheduled")
+    if scene.data_processing_send_debug_mode:
+        print(f"Data Processing Debugging:--> Partial frame queued to send: {data_to_send}")
+
+
+def scheduled_send_timer():
+    scene = bpy.context.scene
+    if scene.send_data_method != 'SCHEDULED':
+        return 0.1
+    send_scheduled_bindings(scene)
+    return send_scheduler.next_interval(time.perf_counter(), 1.0 / scene.schedule_rate)
 
-def update_rotation(obj, selected_axes, numerical_data, base_index):
-    if base_index < len(numerical_data) and "X" in selected_axes:
-        obj.rotation_euler.x = numerical_data[base_index] / 360 * 2 * math.pi
-    if base_index + 1 < len(numerical_data) and "Y" in selected_axes:
-        obj.rotation_euler.y = numerical_data[base_index + 1] / 360 * 2 * math.pi
-    if base_index + 2 < len(numerical_data) and "Z" in selected_axes:
-        obj.rotation_euler.z = numerical_data[base_index + 2] / 360 * 2 * math.pi
 
+send_scheduler = SendScheduler()
 
-def update_scale(obj, selected_axes, numerical_data, base_index):
-    if "X" in selected_axes and base_index < len(numerical_data):
-        obj.scale.x = numerical_data[base_index]
-    if "Y" in selected_axes and base_index + 1 < len(numerical_data):
-        obj.scale.y = numerical_data[base_index + 1]
-    if "Z" in selected_axes and base_index + 2 < len(numerical_data):
-        obj.scale.z = numerical_data[base_index + 2]
+
+# Change-Based – triggered by depsgraph updates touching a sent object, e.g. while
+# dragging a gizmo. Sends immediately, at most send_change_rate times per second;
+# a trailing send is scheduled so the final state is never lost.
+@persistent
+def on_depsgraph_update_post(scene, depsgraph):
+    if scene.send_data_method != 'DEPSGRAPH' or serial_thread.pause_movement:
+        return
+
+    try:
+        if not get_send_bindings(scene).is_affected_by(depsgraph):
+            return
+    except ReferenceError:
+        invalidate_bindings()
+        return
+
+    min_interval = 1.0 / scene.send_change_rate
+    elapsed = time.perf_counter() - on_depsgraph_update_post.last_send
+    if elapsed >= min_interval:
+        on_depsgraph_update_post.last_send = time.perf_counter()
+        send_serial_data(depsgraph)
+    elif not bpy.app.timers.is_registered(send_trailing_change):
+        bpy.app.timers.register(send_trailing_change, first_interval=min_interval - elapsed)
+
+on_depsgraph_update_post.last_send = 0.0
+
+
+def send_trailing_change():
+    on_depsgraph_update_post.last_send = time.perf_counter()
+    send_serial_data()
+    return None
+
+
+def is_same_frame(numerical_data, last_numerical_data):
+    # Binary frames arrive as NumPy arrays, CSV frames as lists.
+    if numerical_data is None or last_numerical_data is None:
+        return numerical_data is last_numerical_data
+    if len(numerical_data) != len(last_numerical_data):
+        return False
+    if isinstance(numerical_data, list) and isinstance(last_numerical_data, list):
+        return numerical_data == last_numerical_data
+    return np.array_equal(numerical_data, last_numerical_data)
+
+
+def process_data(context, numerical_data, text_data):
+    scene = context.scene
+    if len(numerical_data):
+        update_objects(scene, numerical_data)
+        update_axis_text_objects(scene, numerical_data)
+    if text_data:
+        update_received_text(text_data) 
+
+
+def update_objects(scene, numerical_data):
+    try:
+        get_receive_bindings(scene).apply_properties(numerical_data)
+    except ReferenceError:
+        # A bound object or datablock was removed since the bindings were compiled.
+        invalidate_bindings()
 
 
 def update_axis_text_objects(scene, numerical_data):
     # Update text objects associated with custom objects in the scene.
-    for i, item in enumerate(scene.custom_object_collection):
+    collection = scene.custom_object_collection
+    for item, base_index in zip(collection, channel_offsets(collection)):
         text_object_axis = item.text_object_axis
         show_x = item.show_x
         show_y = item.show_y
         show_z = item.show_z
 
         if text_object_axis:
-            axis_text = build_axis_text(i, show_x, show_y, show_z, numerical_data)
+            axis_text = build_axis_text(base_index, show_x, show_y, show_z, numerical_data)
             text_object_axis.data.body = axis_text
 
 def update_received_text(text_data):
@@ -167,62 +386,72 @@ def update_received_text(text_data):
         if received_text_obj and received_text_obj.type == 'FONT':
             received_text_obj.data.body = text_data
 
-def build_axis_text(index, show_x, show_y, show_z, numerical_data):
+def build_axis_text(base_index, show_x, show_y, show_z, numerical_data):
     axis_text_parts = []
     
-    if show_x and (index * 3 < len(numerical_data)):
-        axis_text_parts.append(f" {numerical_data[index * 3]:.2f}")
-    if show_y and (index * 3 + 1 < len(numerical_data)):
-        axis_text_parts.append(f" {numerical_data[index * 3 + 1]:.2f}")
-    if show_z and (index * 3 + 2 < len(numerical_data)):
-        axis_text_parts.append(f" {numerical_data[index * 3 + 2]:.2f}")
+    if show_x and (base_index < len(numerical_data)):
+        axis_text_parts.append(f" {numerical_data[base_index]:.2f}")
+    if show_y and (base_index + 1 < len(numerical_data)):
+        axis_text_parts.append(f" {numerical_data[base_index + 1]:.2f}")
+    if show_z and (base_index + 2 < len(numerical_data)):
+        axis_text_parts.append(f" {numerical_data[base_index + 2]:.2f}")
     
     use_newline = bpy.context.scene.axis_text_newline
     separator = "\n" if use_newline else " "
     
     return separator.join(axis_text_parts)
 
-                
-def format_data_for_object(obj, transform_property, selected_axes):
 
-    if obj is None:
-        return "0.00, 0.00, 0.00"
-    
-    x_value = "0.00"
-    y_value = "0.00"
-    z_value = "0.00"
-    
 
-    if transform_property == 'location':
-        if 'X' in selected_axes:
-            x_value = f"{obj.location.x:.2f}"
-        if 'Y' in selected_axes:
-            y_value = f"{obj.location.y:.2f}"
-        if 'Z' in selected_axes:
-            z_value = f"{obj.location.z:.2f}"
-            
-    elif transform_property == 'rotation_euler':
-        rotation_degrees = [math.degrees(angle) for angle in obj.rotation_euler]
-        if 'X' in selected_axes:
-            x_value = f"{rotation_degrees[0]:.2f}"
-        if 'Y' in selected_axes:
-            y_value = f"{rotation_degrees[1]:.2f}"
-        if 'Z' in selected_axes:
-            z_value = f"{rotation_degrees[2]:.2f}"
-            
-    elif transform_property == 'scale':
-        if 'X' in selected_axes:
-            x_value = f"{obj.scale.x:.2f}"
-        if 'Y' in selected_axes:
-            y_value = f"{obj.scale.y:.2f}"
-        if 'Z' in selected_axes:
-            z_value = f"{obj.scale.z:.2f}"
-
-    return f"{x_value}, {y_value}, {z_value}"
-
-
-
-bpy.app.handlers.frame_change_post.append(on_frame_change_post)
-bpy.app.timers.register(timer_func, persistent=True)
-bpy.app.timers.register(send_timer_func, persistent=True)
 
+# Loading a file replaces the scene holding the connection properties, so the
+# connection is closed first and the loaded (saved as connected) state reset.
+@persistent
+def on_load_pre(*args):
+    stream_pacer.stop()
+    serial_connection.disconnect(serial_thread)
+
+
+@persistent
+def on_load_post(*args):
+    for scene in bpy.data.scenes:
+        props = scene.serial_connection_properties
+        props.is_connected = False
+        props.connection_status = "Disconnected"
+
+
+HANDLERS = (
+    (bpy.app.handlers.frame_change_post, on_frame_change_post),
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update_post),
+    (bpy.app.handlers.load_pre, on_load_pre),
+    (bpy.app.handlers.load_post, on_load_post),
+)
+TIMERS = (timer_func, send_timer_func, scheduled_send_timer, connection_status_timer, latency_probe_timer)
+
+viewport_draw_handler = None
+
+
+def register():
+    global viewport_draw_handler
+    for handlers, handler in HANDLERS:
+        if handler not in handlers:
+            handlers.append(handler)
+    for timer in TIMERS:
+        if not bpy.app.timers.is_registered(timer):
+            bpy.app.timers.register(timer, persistent=True)
+    viewport_draw_handler = bpy.types.SpaceView3D.draw_handler_add(count_viewport_draw, (), 'WINDOW', 'POST_PIXEL')
+
+
+def unregister():
+    global viewport_draw_handler
+    stream_pacer.stop()
+    serial_connection.disconnect(serial_thread)
+    for handlers, handler in HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
+    for timer in TIMERS + (send_trailing_change,):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+    if viewport_draw_handler is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(viewport_draw_handler, 'WINDOW')
+        viewport_draw_handler = None
@@ -0,0 +1,183 @@
+import argparse
+import json
+import signal
+import sys
+import time
+import bpy
+from .blendix_connection import serial_connection, serial_thread
+from .blendix_gdaoc import display_throttle, send_serial_data, send_scheduled_bindings
+from .blendix_operators import connect_scene
+
+# Headless bridge for background sessions (blender -b), where timers and the
+# N-panel operators do not run. The bridge connects with the scene's saved
+# settings, overridden by a JSON config, and runs receive/send on its own loop:
+#
+#     blender -b rig.blend --python-expr "import bpy; bpy.ops.wm.blendix_headless(config='bridge.json')"
+#
+# The operator is in blendix_operators; this module is left out of auto_load and
+# only imported when the bridge runs.
+#
+# Config keys (all optional except port):
+#     port             serial device, e.g. "/dev/ttyUSB0" or a pty for local tests
+#     baud_rate        default: the scene's baud rate
+#     scene            scene name, default: the active scene
+#     mode             "send" | "receive" | "both", default: the scene's mode
+#     io_mode          "THREAD" | "PROCESS"
+#     frame_format     codec name: "CSV" | "CSV_FIXED" | "JSON" | "BINARY" | "MSGPACK"
+#                      (see blendix_codecs), use_sequence, use_crc
+#     rate             loop rate in Hz, 0 = the scene's frame rate
+#     duration         seconds to run, 0 = until interrupted (or the end of the
+#                      frame range with send_animation)
+#     send_animation   step through the frame range and send every frame
+#     record           keyframe received object and bone targets, one frame per tick
+#     save             path to save the .blend to on exit, "*" for the opened file
+
+SCENE_OVERRIDES = {
+    "mode": ("serial_thread_modes", None),
+    "io_mode": ("io_mode", "serial_connection_properties"),
+    "frame_format": ("frame_format", "serial_connection_properties"),
+    "use_sequence": ("use_sequence", "serial_connection_properties"),
+    "use_crc": ("use_crc", "serial_connection_properties"),
+}
+
+
+def load_config(config):
+    if isinstance(config, dict):
+        return config
+    with open(bpy.path.abspath(config)) as config_file:
+        return json.load(config_file)
+
+
+def apply_overrides(scene, config):
+    for key, (attribute, owner) in SCENE_OVERRIDES.items():
+        if key in config:
+            setattr(getattr(scene, owner) if owner else scene, attribute, config[key])
+
+
+def record_keyframes(scene, frame):
+    # Object transforms and pose bone channels; data path and attribute targets are not recorded.
+    for item in scene.custom_object_collection:
+        obj = item.sel_object
+        if obj is None or item.property_name == "matrix_world":
+            continue
+        if item.target_type == 'OBJECT':
+            obj.keyframe_insert(item.property_name, frame=frame)
+        elif item.target_type == 'BONE' and obj.pose:
+            pose_bone = obj.pose.bones.get(item.bone_name)
+            if pose_bone is not None:
+                pose_bone.keyframe_insert(item.property_name, frame=frame)
+
+
+class HeadlessBridge:
+
+    def __init__(self, config):
+        self.config = load_config(config)
+        name = self.config.get("scene")
+        self.scene = bpy.data.scenes[name] if name else bpy.context.scene
+        self.running = False
+        self.ticks = 0
+        self.frames_received = 0
+
+    def stop(self, *args):
+        self.running = False
+
+    def connect(self):
+        config = self.config
+        apply_overrides(self.scene, config)
+        return connect_scene(self.scene, config.get("port"), config.get("baud_rate"))
+
+    def run(self):
+        config = self.config
+        scene = self.scene
+        if not self.connect():
+            print(f"blendixserial headless:--> Failed to connect to {serial_connection._port_name}")
+            return False
+
+        mode = scene.serial_thread_modes
+        fps = scene.render.fps / scene.render.fps_base
+        interval = 1.0 / (config.get("rate") or fps)
+        duration = config.get("duration", 0)
+        send_animation = config.get("send_animation", False) and mode in {'send', 'both'}
+        record = config.get("record", False) and mode in {'receive', 'both'}
+        frame = scene.frame_start
+
+        serial_thread.pause_movement = False
+        self.running = True
+        previous_handler = signal.signal(signal.SIGTERM, self.stop)
+        print(f"blendixserial headless:--> Connected to {serial_connection._port_name}, mode {mode}, "
+              f"{1.0 / interval:.1f} Hz")
+
+        started = time.perf_counter()
+        next_tick = started
+        try:
+            while self.running:
+                if send_animation:
+                    if frame > scene.frame_end:
+                        break
+                    scene.frame_set(frame)
+                    if scene.send_data_method not in {'KEYFRAME', 'STREAM'}:
+                        # Those methods already send from their frame change handler.
+                        send_serial_data()
+                elif mode in {'send', 'both'}:
+                    if scene.send_data_method == 'SCHEDULED':
+                        send_scheduled_bindings(scene)
+                    else:
+                        send_serial_data()
+
+                if mode in {'receive', 'both'}:
+                    latest_data = serial_thread.get_latest_data()
+                    if latest_data:
+                        self.frames_received += 1
+                        display_throttle.ingest(scene, *latest_data)
+                        display_throttle.present(scene, force=True)
+                    if record:
+                        record_keyframes(scene, frame)
+
+                frame += 1
+                self.ticks += 1
+                if duration and time.perf_counter() - started >= duration:
+                    break
+                if not serial_thread.is_link_open() and not serial_thread.auto_reconnect:
+                    print("blendixserial headless:--> Connection lost")
+                    break
+
+                next_tick += interval
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind: do not try to catch up with a burst of ticks.
+                    next_tick = time.perf_counter()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+            serial_thread.pause_movement = True
+            serial_connection.disconnect(serial_thread)
+
+        print(f"blendixserial headless:--> {self.ticks} ticks, {self.frames_received} frames received, "
+              f"{serial_thread.link_stats.summary()}")
+
+        save = config.get("save")
+        if save:
+            if save == "*":
+                bpy.ops.wm.save_mainfile()
+            else:
+                bpy.ops.wm.save_as_mainfile(filepath=bpy.path.abspath(save), copy=True)
+        return True
+
+
+def run_headless(config):
+    """Run the bridge until the duration ends or the process is interrupted. config: dict or JSON path."""
+    return HeadlessBridge(config).run()
+
+
+def main(argv=None):
+    # Arguments after "--" on the Blender command line, e.g. blender -b rig.blend --python-expr "..." -- --config bridge.json
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="blendixserial headless")
+    parser.add_argument("--config", required=True, help="JSON bridge configuration")
+    arguments = parser.parse_args(argv)
+    return run_headless(arguments.config)
+
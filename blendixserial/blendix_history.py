@@ -0,0 +1,100 @@
+import threading
+import numpy as np
+
+# Fixed-size history of selected channels for the channel scope.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# One float32 ring of shape (length, channels) allocated up front; samples are
+# appended from the hub's publishing thread, the viewport reads an ordered copy.
+# Channels missing from a shorter frame are stored as NaN (drawn at the bottom
+# edge of the scope); text-only frames are not samples and are skipped.
+
+SCOPE_MAX_CHANNELS = 32
+
+
+def parse_channel_list(text):
+    # "0-3, 8, 12" -> [0, 1, 2, 3, 8, 12]; raises ValueError when malformed.
+    channels = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition('-')
+        if dash:
+            channels.extend(range(int(first), int(last) + 1))
+        else:
+            channels.append(int(first))
+    if any(channel < 0 for channel in channels):
+        raise ValueError("channels are 0 or higher")
+    return list(dict.fromkeys(channels))[:SCOPE_MAX_CHANNELS]
+
+
+class ChannelHistory:
+
+    def __init__(self, channels=(), length=1000):
+        self._lock = threading.Lock()
+        self.configure(channels, length)
+
+    def configure(self, channels, length):
+        with self._lock:
+            self.channels = np.array(channels, dtype=np.int64)
+            self.last_channel = int(self.channels.max()) if len(self.channels) else -1
+            self.length = max(2, length)
+            self.values = np.full((self.length, len(self.channels)), np.nan, dtype=np.float32)
+            self.count = 0
+            # Bumped on every append, the viewport only rebuilds its batches when it changed.
+            self.version = 0
+
+    def append(self, values):
+        if not len(values):
+            # Text-only frame.
+            return
+        with self._lock:
+            channels = self.channels
+            if not len(channels):
+                return
+            row = self.values[self.count % self.length]
+            values = np.asarray(values)
+            if len(values) > self.last_channel:
+                row[:] = values[channels]
+            else:
+                present = channels < len(values)
+                row[:] = np.nan
+                row[present] = values[channels[present]]
+            self.count += 1
+            self.version += 1
+
+    def append_sample(self, sample):
+        # Hub callback.
+        self.append(sample.values)
+
+    def snapshot(self):
+        # (values, valid sample count) with the oldest sample first.
+        with self._lock:
+            count = min(self.count, self.length)
+            start = self.count % self.length
+            if count < self.length:
+                ordered = self.values[:count].copy()
+            else:
+                ordered = np.concatenate((self.values[start:], self.values[:start]))
+            return ordered, count
+
+
+def decimate_trace(x, y, columns):
+    # A trace with more samples than pixel columns, as the lowest and highest
+    # sample of each column: it draws the same strip with at most 2 * columns points.
+    points = len(x)
+    if points <= 2 * columns:
+        return x, y
+    size = -(-points // columns)
+    starts = np.arange(0, points, size)
+    full = points - points % size
+    blocks = y[:full].reshape(-1, size, y.shape[1])
+    lows, highs = blocks.min(axis=1), blocks.max(axis=1)
+    if full < points:
+        lows = np.vstack((lows, y[full:].min(axis=0)))
+        highs = np.vstack((highs, y[full:].max(axis=0)))
+    decimated = np.empty((2 * len(starts), y.shape[1]), dtype=y.dtype)
+    decimated[0::2] = lows
+    decimated[1::2] = highs
+    return np.repeat(x[starts], 2), decimated
@@ -0,0 +1,302 @@
+import struct
+import numpy as np
+from multiprocessing import shared_memory
+
+# Shared-memory rings between Blender and the out-of-process I/O worker.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# SampleRing (worker -> Blender), one writer and one reader:
+#     header  u64[32]   sequence, slots, channels, text_bytes, link state,
+#                       calibration capture count, counters
+#     per slot          u64 sequence, u32 value count, u32 text length,
+#                       float64[channels] values, u8[text_bytes] text
+#     capture           float64[2, channels] raw minimum and maximum while a
+#                       calibration capture is running
+#     probes            float64[PROBE_SLOTS, 4] latency probe samples, a ring
+#                       indexed by the header's probe count
+# A slot is marked with sequence 0 while it is being written and with its own
+# sequence once complete; the header sequence is published last. The reader
+# checks the slot's sequence, copies the values and text, and checks the
+# sequence again, discarding the copy when the writer got to the slot in
+# between. Readers get copies, not views into shared memory: a view could be
+# overwritten at any time once the writer wraps around the ring.
+#
+# CommandRing (Blender -> worker), one writer and one reader:
+#     head u64 | tail u64 | capacity u64 | data[capacity]
+# Records are a u32 length followed by the record bytes. A record that does
+# not fit is rejected instead of overwriting unread data.
+
+HEADER_FIELDS = 32
+HEADER_SEQUENCE = 0
+HEADER_SLOTS = 1
+HEADER_CHANNELS = 2
+HEADER_TEXT_BYTES = 3
+HEADER_LINK_STATE = 4
+HEADER_CAPTURE_COUNT = 5
+HEADER_CAPTURE_CHANNELS = 6
+HEADER_PROBE_COUNT = 7
+# Counters published by the worker, in this order, from HEADER_COUNTERS on.
+HEADER_COUNTERS = 8
+COUNTER_NAMES = (
+    "frames_ok",
+    "frames_corrupt",
+    "frames_lost",
+    "frames_sent",
+    "remote_lost",
+    "dropped_stale",
+    "dropped_overflow",
+    "replaced",
+    "stalls",
+    "outages",
+    "credits",
+    "probes_sent",
+    "probes_lost",
+)
+
+PROBE_SLOTS = 256
+
+LINK_STARTING = 0
+LINK_CONNECTED = 1
+LINK_RECONNECTING = 2
+LINK_LOST = 3
+
+RECORD_LENGTH = struct.Struct('<I')
+
+
+def release_shared_memory(memory, unlink=False):
+    try:
+        memory.close()
+    except BufferError:
+        # A sample view is still referenced somewhere; the mapping goes away with it.
+        pass
+    if unlink:
+        try:
+            memory.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def attach_shared_memory(name):
+    memory = shared_memory.SharedMemory(name=name)
+    # Before Python 3.13 attaching also registers the block with this process's
+    # resource tracker, which would unlink it when the worker exits.
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(memory._name, "shared_memory")
+    except (ImportError, AttributeError, KeyError):
+        pass
+    return memory
+
+
+class SampleRing:
+
+    def __init__(self, name=None, slots=64, channels=8192, text_bytes=256):
+        # Without a name a new ring is created; with one, an existing ring is attached.
+        if name is None:
+            slot_size = 16 + channels * 8 + text_bytes
+            size = HEADER_FIELDS * 8 + slots * slot_size + 2 * channels * 8 + PROBE_SLOTS * 4 * 8
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+            self.header = np.ndarray((HEADER_FIELDS,), dtype=np.uint64, buffer=self.memory.buf)
+            self.header[:] = 0
+            self.header[HEADER_SLOTS] = slots
+            self.header[HEADER_CHANNELS] = channels
+            self.header[HEADER_TEXT_BYTES] = text_bytes
+        else:
+            self.memory = attach_shared_memory(name)
+            self.owner = False
+            self.header = np.ndarray((HEADER_FIELDS,), dtype=np.uint64, buffer=self.memory.buf)
+            slots = int(self.header[HEADER_SLOTS])
+            channels = int(self.header[HEADER_CHANNELS])
+            text_bytes = int(self.header[HEADER_TEXT_BYTES])
+
+        self.name = self.memory.name
+        self.slots = slots
+        self.channels = channels
+        self.text_bytes = text_bytes
+
+        slot_dtype = np.dtype([
+            ('sequence', '<u8'),
+            ('count', '<u4'),
+            ('text_length', '<u4'),
+            ('values', '<f8', (channels,)),
+            ('text', 'u1', (text_bytes,)),
+        ])
+        slot_array = np.ndarray((slots,), dtype=slot_dtype, buffer=self.memory.buf, offset=HEADER_FIELDS * 8)
+        self.slot_sequence = slot_array['sequence']
+        self.slot_count = slot_array['count']
+        self.slot_text_length = slot_array['text_length']
+        self.slot_values = slot_array['values']
+        self.slot_text = slot_array['text']
+        self.capture_values = np.ndarray(
+            (2, channels), dtype=np.float64, buffer=self.memory.buf,
+            offset=HEADER_FIELDS * 8 + slot_array.nbytes,
+        )
+        self.probe_values = np.ndarray(
+            (PROBE_SLOTS, 4), dtype=np.float64, buffer=self.memory.buf,
+            offset=HEADER_FIELDS * 8 + slot_array.nbytes + self.capture_values.nbytes,
+        )
+        self._read_sequence = 0
+        self._read_probes = 0
+
+    def close(self):
+        # Drop the NumPy views first, SharedMemory refuses to close with exported buffers.
+        self.header = self.slot_sequence = self.slot_count = None
+        self.slot_text_length = self.slot_values = self.slot_text = self.capture_values = None
+        self.probe_values = None
+        release_shared_memory(self.memory, unlink=self.owner)
+
+    # Writer side
+
+    def write(self, values, text=b""):
+        sequence = int(self.header[HEADER_SEQUENCE]) + 1
+        slot = sequence % self.slots
+        count = min(len(values), self.channels)
+        text = text[:self.text_bytes]
+
+        self.slot_sequence[slot] = 0
+        self.slot_values[slot, :count] = values[:count]
+        self.slot_count[slot] = count
+        self.slot_text[slot, :len(text)] = np.frombuffer(text, dtype=np.uint8)
+        self.slot_text_length[slot] = len(text)
+        self.slot_sequence[slot] = sequence
+        self.header[HEADER_SEQUENCE] = sequence
+
+    def publish_counters(self, values):
+        self.header[HEADER_COUNTERS:HEADER_COUNTERS + len(values)] = values
+
+    def publish_capture(self, minimum, maximum, count):
+        channels = min(len(minimum), self.channels)
+        self.capture_values[0, :channels] = minimum[:channels]
+        self.capture_values[1, :channels] = maximum[:channels]
+        self.header[HEADER_CAPTURE_CHANNELS] = channels
+        self.header[HEADER_CAPTURE_COUNT] = count
+
+    def clear_capture(self):
+        self.header[HEADER_CAPTURE_COUNT] = 0
+
+    def publish_probe(self, sample):
+        count = int(self.header[HEADER_PROBE_COUNT])
+        self.probe_values[count % PROBE_SLOTS] = sample
+        self.header[HEADER_PROBE_COUNT] = count + 1
+
+    def set_link_state(self, state):
+        self.header[HEADER_LINK_STATE] = state
+
+    # Reader side
+
+    def read_slot(self, slot, sequence):
+        # Seqlock read: the writer zeroes the slot's sequence while it writes, so a
+        # copy taken between two reads of the expected sequence is consistent.
+        if int(self.slot_sequence[slot]) != sequence:
+            return None
+        count = min(int(self.slot_count[slot]), self.channels)
+        text_length = min(int(self.slot_text_length[slot]), self.text_bytes)
+        values = self.slot_values[slot, :count].copy()
+        text = bytes(self.slot_text[slot, :text_length])
+        if int(self.slot_sequence[slot]) != sequence:
+            return None
+        return values, text.decode(errors='replace')
+
+    def latest(self):
+        # Returns (values, text) copies of the newest sample not read yet, or None.
+        sequence = int(self.header[HEADER_SEQUENCE])
+        if sequence == self._read_sequence:
+            return None
+        sample = self.read_slot(sequence % self.slots, sequence)
+        if sample is not None:
+            # When overwritten while reading, the next call picks up the newer sample.
+            self._read_sequence = sequence
+        return sample
+
+    def unread(self):
+        # Every sample not read yet as (values, text) copies, oldest first. At most
+        # slots - 1: older ones were overwritten, the next slot may be in writing.
+        sequence = int(self.header[HEADER_SEQUENCE])
+        samples = []
+        for current in range(max(self._read_sequence + 1, sequence - self.slots + 2), sequence + 1):
+            sample = self.read_slot(current % self.slots, current)
+            if sample is not None:
+                samples.append(sample)
+        self._read_sequence = sequence
+        return samples
+
+    def sequence(self):
+        return int(self.header[HEADER_SEQUENCE])
+
+    def counters(self):
+        return dict(zip(COUNTER_NAMES, self.header[HEADER_COUNTERS:HEADER_COUNTERS + len(COUNTER_NAMES)].tolist()))
+
+    def capture(self):
+        # (minimum, maximum, frame count) of the running or last calibration capture.
+        if not self.header[HEADER_CAPTURE_COUNT]:
+            return None, None, 0
+        channels = int(self.header[HEADER_CAPTURE_CHANNELS])
+        return (
+            self.capture_values[0, :channels].copy(),
+            self.capture_values[1, :channels].copy(),
+            int(self.header[HEADER_CAPTURE_COUNT]),
+        )
+
+    def probe_samples(self):
+        # Probe samples published since the last call, oldest first.
+        count = int(self.header[HEADER_PROBE_COUNT])
+        first = max(self._read_probes, count - PROBE_SLOTS)
+        self._read_probes = count
+        return [tuple(self.probe_values[index % PROBE_SLOTS].tolist()) for index in range(first, count)]
+
+    def link_state(self):
+        return int(self.header[HEADER_LINK_STATE])
+
+
+class CommandRing:
+
+    def __init__(self, name=None, capacity=1 << 20):
+        # The capacity is stored in the block because some platforms round its size up.
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=24 + capacity)
+            self.owner = True
+            self.positions = np.ndarray((3,), dtype=np.uint64, buffer=self.memory.buf)
+            self.positions[:] = (0, 0, capacity)
+        else:
+            self.memory = attach_shared_memory(name)
+            self.owner = False
+            self.positions = np.ndarray((3,), dtype=np.uint64, buffer=self.memory.buf)
+            capacity = int(self.positions[2])
+        self.name = self.memory.name
+        self.capacity = capacity
+        self.data = self.memory.buf[24:24 + capacity]
+
+    def close(self):
+        self.data.release()
+        self.positions = None
+        release_shared_memory(self.memory, unlink=self.owner)
+
+    def _copy_in(self, position, record):
+        start = position % self.capacity
+        first = min(len(record), self.capacity - start)
+        self.data[start:start + first] = record[:first]
+        self.data[:len(record) - first] = record[first:]
+
+    def _copy_out(self, position, size):
+        start = position % self.capacity
+        first = min(size, self.capacity - start)
+        return bytes(self.data[start:start + first]) + bytes(self.data[:size - first])
+
+    def put(self, record):
+        head, tail = int(self.positions[0]), int(self.positions[1])
+        size = RECORD_LENGTH.size + len(record)
+        if size > self.capacity - (head - tail):
+            return False
+        self._copy_in(head, RECORD_LENGTH.pack(len(record)) + record)
+        self.positions[0] = head + size
+        return True
+
+    def get(self):
+        head, tail = int(self.positions[0]), int(self.positions[1])
+        if head == tail:
+            return None
+        length = RECORD_LENGTH.unpack(self._copy_out(tail, RECORD_LENGTH.size))[0]
+        record = self._copy_out(tail + RECORD_LENGTH.size, length)
+        self.positions[1] = tail + RECORD_LENGTH.size + length
+        return record
@@ -0,0 +1,129 @@
+import csv
+import math
+import time
+from collections import deque
+import numpy as np
+
+# Round-trip latency probe.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# The host writes a ping carrying an id and its own timestamp in microseconds
+# (see blendix_framing); the firmware echoes both back, ideally adding its own
+# clock reading taken when the ping arrived. The round trip is measured on the
+# host clock from the moment the ping is written until the echo is parsed, so
+# it includes driver, USB and firmware loop delays in both directions.
+#
+# With a device timestamp the clock offset is estimated as in NTP:
+#     offset = device time - (host send time + rtt / 2)
+# taken from the sample with the smallest round trip in the window, the one
+# least disturbed by queueing. device time = host time + offset.
+
+PROBE_WINDOW = 1000
+
+
+class LatencyProbe:
+
+    def __init__(self, window=PROBE_WINDOW, timeout=2.0):
+        self.window = window
+        self.timeout = timeout
+        self.epoch = time.perf_counter()
+        self.reset()
+
+    def reset(self):
+        # Samples are (id, send time in s since the epoch, rtt in s, offset in s or nan).
+        self.samples = deque(maxlen=self.window)
+        self.pending = {}
+        self.next_id = 1
+        self.sent = 0
+        self.lost = 0
+        self.unmatched = 0
+
+    def ping(self, now=None):
+        # Returns (id, host_us) for a ping written now.
+        if now is None:
+            now = time.perf_counter()
+        self.expire(now)
+        probe_id = self.next_id
+        self.next_id = (self.next_id + 1) % 0x100000000 or 1
+        self.pending[probe_id] = now
+        self.sent += 1
+        return probe_id, int((now - self.epoch) * 1e6)
+
+    def waiting(self, now=None):
+        # True while a ping may still be answered.
+        if self.pending:
+            self.expire(time.perf_counter() if now is None else now)
+        return bool(self.pending)
+
+    def expire(self, now):
+        for probe_id, sent in list(self.pending.items()):
+            if now - sent > self.timeout:
+                del self.pending[probe_id]
+                self.lost += 1
+
+    def echo(self, probe_id, host_us, device_us=None, now=None):
+        # Returns the new sample, or None for an echo that matches no pending ping
+        # (too late, or from before a reconnect).
+        if now is None:
+            now = time.perf_counter()
+        sent = self.pending.pop(probe_id, None)
+        if sent is None:
+            self.unmatched += 1
+            return None
+        rtt = now - sent
+        sent -= self.epoch
+        offset = device_us * 1e-6 - (sent + rtt / 2.0) if device_us is not None else math.nan
+        sample = (probe_id, sent, rtt, offset)
+        self.samples.append(sample)
+        return sample
+
+    def add(self, sample):
+        # Samples measured elsewhere (the worker process).
+        probe_id, sent, rtt, offset = sample
+        self.samples.append((int(probe_id), sent, rtt, offset))
+
+    def statistics(self):
+        # A copy: echoes are added by the serial thread while the panel reads.
+        samples = list(self.samples)
+        if not samples:
+            return None
+        rtt = np.array([sample[2] for sample in samples]) * 1000.0
+        p50, p95, p99 = np.percentile(rtt, (50, 95, 99))
+        stats = {
+            "count": len(rtt),
+            "min": rtt.min(),
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "max": rtt.max(),
+            "jitter": rtt.std(),
+            "offset": None,
+        }
+        timed = [sample for sample in samples if not math.isnan(sample[3])]
+        if timed:
+            stats["offset"] = min(timed, key=lambda sample: sample[2])[3] * 1000.0
+        return stats
+
+    def summary(self):
+        stats = self.statistics()
+        if stats is None:
+            return f"No echoes ({self.sent} pings)" if self.sent else "Probe idle"
+        text = f"RTT {stats['p50']:.2f} ms | p95 {stats['p95']:.2f} | p99 {stats['p99']:.2f} | max {stats['max']:.2f}"
+        if self.lost:
+            text += f" | Lost {self.lost}"
+        return text
+
+    def offset_summary(self):
+        stats = self.statistics()
+        if stats is None or stats["offset"] is None:
+            return None
+        return f"Clock offset {stats['offset']:.3f} ms | Jitter {stats['jitter']:.2f} ms | {stats['count']} echoes"
+
+    def export(self, path):
+        with open(path, "w", newline="") as export_file:
+            writer = csv.writer(export_file)
+            writer.writerow(("id", "sent_s", "rtt_ms", "offset_ms"))
+            for probe_id, sent, rtt, offset in list(self.samples):
+                writer.writerow((probe_id, f"{sent:.6f}", f"{rtt * 1000.0:.3f}",
+                                 "" if math.isnan(offset) else f"{offset * 1000.0:.3f}"))
+        return len(self.samples)
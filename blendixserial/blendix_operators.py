@@ -1,6 +1,18 @@
 import bpy
+import fnmatch
+import re
 from bpy_types import Operator
+from bpy_extras.io_utils import ExportHelper
 from .blendix_connection import serial_connection, serial_thread
+from .blendix_bindings import (
+    invalidate_bindings,
+    receive_binding_error,
+    send_binding_error,
+    binding_width,
+    send_binding_width,
+)
+from .blendix_properties import sync_receive_filters, sync_calibration, deferred_binding_updates
+from .blendix_codecs import BUILTIN_CODECS, benchmark_codecs
 
 
 class AddCustomObject(Operator):
@@ -13,6 +25,9 @@ class AddCustomObject(Operator):
 
         new_item = scene.custom_object_collection.add()
         new_item.sel_object = None  
+        scene.custom_object_index = len(scene.custom_object_collection) - 1
+        invalidate_bindings()
+        sync_receive_filters(scene)
         self.report({'INFO'}, "Object Added")
         return {'FINISHED'}
 
@@ -25,11 +40,32 @@ class RemoveCustomObject(Operator):
 
     def execute(self, context):
         scene = context.scene
+        if not 0 <= self.index < len(scene.custom_object_collection):
+            return {'CANCELLED'}
         scene.custom_object_collection.remove(self.index)
+        scene.custom_object_index = min(scene.custom_object_index, len(scene.custom_object_collection) - 1)
+        invalidate_bindings()
+        sync_receive_filters(scene)
         self.report({'INFO'}, "Object Removed")
         return {'FINISHED'}
 
 
+def draw_filter_box(layout, item):
+    box = layout.box()
+    box.label(text="Filter", icon="MOD_SMOOTH")
+    box.prop(item, "filter_type", text="")
+    if item.filter_type in {'LOWPASS', 'ONE_EURO'}:
+        box.prop(item, "filter_cutoff")
+    if item.filter_type == 'ONE_EURO':
+        row = box.row(align=True)
+        row.prop(item, "filter_beta")
+        row.prop(item, "filter_derivative_cutoff")
+    elif item.filter_type == 'MEDIAN':
+        box.prop(item, "filter_window")
+    elif item.filter_type == 'RATE_LIMIT':
+        box.prop(item, "filter_rate")
+
+
 class ShowSettingsPopup(bpy.types.Operator):
     """Show Settings Popup"""
     bl_idname = "wm.object_prop_window"
@@ -54,6 +90,49 @@ class ShowSettingsPopup(bpy.types.Operator):
         layout.separator() 
 
   
+        box = layout.box()
+        box.label(text="Target", icon="OBJECT_DATA")
+        box.prop(item, "target_type", expand=True)
+        if item.target_type == 'BONE':
+            if item.sel_object and item.sel_object.type == 'ARMATURE':
+                box.prop_search(item, "bone_name", item.sel_object.pose, "bones", text="Bone")
+                if item.property_name == "matrix_world":
+                    box.label(text="Matrix channels are not supported for bones", icon="ERROR")
+            else:
+                box.label(text="Select an armature object", icon="ERROR")
+        elif item.target_type == 'ATTRIBUTE':
+            if item.sel_object and item.sel_object.type in {'MESH', 'POINTCLOUD'}:
+                box.prop_search(item, "attribute_name", item.sel_object.data, "attributes", text="Attribute")
+            else:
+                box.prop(item, "attribute_name")
+            box.prop(item, "array_length")
+            error = receive_binding_error(self.index)
+            if error:
+                box.label(text=f"Attribute error: {error}", icon="ERROR")
+            draw_filter_box(layout, item)
+            layout.separator()
+            return
+        elif item.target_type == 'PATH':
+            box.prop(item, "data_path", text="Path")
+            row = box.row(align=True)
+            row.prop(item, "path_channels")
+            row.prop(item, "array_index")
+            row = box.row(align=True)
+            row.prop(item, "gain")
+            row.prop(item, "offset")
+            row = box.row(align=True)
+            row.prop(item, "use_clamp")
+            sub = row.row(align=True)
+            sub.enabled = item.use_clamp
+            sub.prop(item, "clamp_min")
+            sub.prop(item, "clamp_max")
+            error = receive_binding_error(self.index)
+            if error:
+                box.label(text=f"Path error: {error}", icon="ERROR")
+            draw_filter_box(layout, item)
+            layout.separator()
+            return
+
         box = layout.box()
         box.label(text="Transform Properties", icon="FILE_3D")
         
@@ -65,12 +144,15 @@ class ShowSettingsPopup(bpy.types.Operator):
         row.prop(item, "property_name", text="")
 
         col = split.column()
+        col.enabled = item.property_name in {"location", "rotation_euler", "scale"}
         row = col.row(align=True)
         row.label(text="Axes:")
         row.prop(item, "selected_axes", text="")
         
         box.separator() 
 
+        draw_filter_box(layout, item)
+
         box = layout.box()
         box.label(text="Show Axes", icon="ORIENTATION_GLOBAL")
         box.prop(item, "text_object_axis", text="Text Object")
@@ -136,6 +218,126 @@ class StopMovementOperator(Operator):
         return {'FINISHED'}
 
 
+class StartCalibrationCaptureOperator(Operator):
+    """Record the raw range of every received channel. Move each sensor through its full range, then click Finish"""
+    bl_idname = "object.start_calibration_capture"
+    bl_label = "Capture Calibration Range"
+
+    _timer = None
+
+    def invoke(self, context, event):
+        serial_thread.start_calibration_capture()
+        self._timer = context.window_manager.event_timer_add(0.2, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        self.report({'INFO'}, "Capturing calibration range")
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            serial_thread.finish_calibration_capture()
+            self.report({'INFO'}, "Calibration capture cancelled")
+            return self.finish(context, {'CANCELLED'})
+        if not serial_thread.calibrator.capturing:
+            return self.finish(context, {'FINISHED'})
+        if event.type == 'TIMER':
+            # Keep the frame counter in the panel moving.
+            for area in context.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+        return {'PASS_THROUGH'}
+
+    def finish(self, context, result):
+        context.window_manager.event_timer_remove(self._timer)
+        return result
+
+
+class FinishCalibrationCaptureOperator(Operator):
+    """Map the captured range of every channel onto its Low/High values"""
+    bl_idname = "object.finish_calibration_capture"
+    bl_label = "Finish Calibration Capture"
+
+    def execute(self, context):
+        scene = context.scene
+        minimum, maximum, frame_count = serial_thread.finish_calibration_capture()
+        if not frame_count:
+            self.report({'WARNING'}, "No frames received during the capture")
+            return {'CANCELLED'}
+
+        channels = scene.calibration_channels
+        while len(channels) < len(maximum):
+            channels.add()
+
+        mapped = 0
+        for channel, low, high in zip(channels, minimum.tolist(), maximum.tolist()):
+            if high <= low:
+                continue
+            gain = (channel.target_max - channel.target_min) / (high - low)
+            channel.gain = gain
+            channel.offset = channel.target_min - low * gain
+            channel.invert = False
+            mapped += 1
+
+        scene.use_calibration = True
+        sync_calibration(scene)
+        self.report({'INFO'}, f"Calibrated {mapped} of {len(maximum)} channels from {frame_count} frames")
+        return {'FINISHED'}
+
+
+class ClearCalibrationOperator(Operator):
+    """Remove the calibration table"""
+    bl_idname = "object.clear_calibration"
+    bl_label = "Clear Calibration"
+
+    def execute(self, context):
+        context.scene.calibration_channels.clear()
+        sync_calibration(context.scene)
+        self.report({'INFO'}, "Calibration cleared")
+        return {'FINISHED'}
+
+
+def connect_scene(scene, port_name=None, baud_rate=None):
+    # Push the scene's connection settings to the serial thread and open the link.
+    # Shared by the connect operator and the headless bridge; returns True when connected.
+    props = scene.serial_connection_properties
+    serial_connection._port_name = port_name or props.port_name
+    serial_connection._baud_rate = baud_rate or props.get_baud_rate()
+    serial_connection.set_link_profile(
+        read_timeout=props.read_timeout,
+        inter_byte_timeout=props.inter_byte_timeout,
+        write_timeout=props.write_timeout,
+        rx_buffer_size=props.rx_buffer_size,
+        tx_buffer_size=props.tx_buffer_size,
+        low_latency=props.low_latency,
+    )
+    serial_thread.set_mode(scene.serial_thread_modes)
+    serial_thread.set_integrity(props.frame_format, props.use_sequence, props.use_crc)
+    serial_thread.auto_reconnect = props.auto_reconnect
+    sync_receive_filters(scene)
+    sync_calibration(scene)
+    serial_thread.send_queue.configure(
+        props.send_queue_size, props.send_deadline / 1000.0, props.use_flow_control, props.initial_credits
+    )
+
+    # Stop a worker left over from a previous connection before the port is reopened.
+    serial_thread.stop_serial_thread()
+    io_mode = props.io_mode
+    if io_mode == 'PROCESS' and serial_thread.codec.name not in BUILTIN_CODECS:
+        # The worker process cannot import codecs registered by other add-ons.
+        io_mode = 'THREAD'
+        if scene.serial_debug_mode:
+            print(f"Serial Connection Debug:--> Codec {serial_thread.codec.name} runs in Thread I/O")
+    serial_thread.io_mode = io_mode
+
+    if io_mode == 'PROCESS':
+        return serial_thread.start_worker_process()
+
+    serial_connection.connect_serial()
+    if not serial_thread.is_link_open():
+        return False
+    serial_thread.start_serial_thread()
+    return True
+
+
 class ConnectSerialOperator(Operator):
     """Click to connect to a serial port."""
     bl_idname = "serial.connect"
@@ -143,20 +345,11 @@ class ConnectSerialOperator(Operator):
 
     def execute(self, context):
         props = context.scene.serial_connection_properties
-        serial_connection._port_name = props.port_name
-        serial_connection._baud_rate = int(props.baud_rate)
-
-        serial_connection.connect_serial()
-        serial_thread.start_serial_thread() 
-
-        try:
-
-            if serial_connection._serial_connection and serial_connection._serial_connection.is_open:
-                props.is_connected = True
-                props.connection_status = "Connected"
-                self.report({'INFO'}, "Connected")
-
-        except:
+        if connect_scene(context.scene):
+            props.is_connected = True
+            props.connection_status = "Connected"
+            self.report({'INFO'}, "Connected")
+        else:
             self.report({'ERROR'}, f"Failed to connect to serial port {serial_connection._port_name}")
         return {'FINISHED'}
 
@@ -169,13 +362,83 @@ class DisconnectSerialOperator(Operator):
     def execute(self, context):
         serial_connection.disconnect(serial_thread)
         props = context.scene.serial_connection_properties
-        if not serial_connection._serial_connection or not serial_connection._serial_connection.is_open:
+        if not serial_thread.is_link_open():
             props.is_connected = False
             props.connection_status = "Disconnected"
             self.report({'INFO'}, "Disconnected")
         return {'FINISHED'}
 
 
+class HeadlessBridgeOperator(Operator):
+    """Run the serial bridge without UI, blocking until it finishes (for blender -b)"""
+    bl_idname = "wm.blendix_headless"
+    bl_label = "Run Headless Serial Bridge"
+
+    config: bpy.props.StringProperty(
+        name="Config",
+        description="JSON bridge configuration file",
+        subtype='FILE_PATH'
+    ) # type: ignore
+
+    def execute(self, context):
+        # Not loaded with the add-on, see blendix_headless.
+        from .blendix_headless import main, run_headless
+        if self.config:
+            succeeded = run_headless(self.config)
+        else:
+            succeeded = main()
+        return {'FINISHED'} if succeeded else {'CANCELLED'}
+
+
+
+
+class ExportLatencyOperator(Operator, ExportHelper):
+    """Save the latency probe samples (round trip time and clock offset per echo) as CSV"""
+    bl_idname = "serial.export_latency"
+    bl_label = "Export Latency Samples"
+
+    filename_ext = ".csv"
+
+    filter_glob: bpy.props.StringProperty(default="*.csv", options={'HIDDEN'}) # type: ignore
+
+    def execute(self, context):
+        count = serial_thread.probe.export(self.filepath)
+        self.report({'INFO'}, f"Exported {count} latency samples")
+        return {'FINISHED'}
+
+
+class BenchmarkCodecsOperator(Operator):
+    """Measure the decode cost per frame of every registered codec, splitting included (printed to the console)"""
+    bl_idname = "serial.benchmark_codecs"
+    bl_label = "Benchmark Codecs"
+
+    channels: bpy.props.IntProperty(
+        name="Channels",
+        description="Values per frame",
+        default=16,
+        min=1,
+        max=1024
+    ) # type: ignore
+
+    frames: bpy.props.IntProperty(
+        name="Frames",
+        description="Frames decoded per codec",
+        default=20000,
+        min=100
+    ) # type: ignore
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        results = benchmark_codecs(self.channels, self.frames)
+        print(f"Codec benchmark, {self.channels} channels:")
+        for name, (microseconds, size) in results.items():
+            print(f"    {name:<12} {microseconds:8.2f} us/frame  {size:6.1f} bytes/frame")
+        fastest = min(results, key=lambda name: results[name][0])
+        self.report({'INFO'}, " | ".join(f"{name} {results[name][0]:.1f} us" for name in results)
+                    + f" (fastest {fastest})")
+        return {'FINISHED'}
 
 
 class ShowSettingsPopupSend(bpy.types.Operator):
@@ -201,6 +464,34 @@ class ShowSettingsPopupSend(bpy.types.Operator):
         layout.label(text=f"Send Keyframe Data {object_number}", icon='ANIM')
         layout.separator() 
 
+        box = layout.box()
+        box.label(text="Source", icon="OBJECT_DATA")
+        box.prop(item, "source_type", expand=True)
+        if item.source_type == 'BONE':
+            if item.sel_object and item.sel_object.type == 'ARMATURE':
+                box.prop_search(item, "bone_name", item.sel_object.pose, "bones", text="Bone")
+            else:
+                box.label(text="Select an armature object", icon="ERROR")
+        elif item.source_type == 'PATH':
+            box.prop(item, "data_path", text="Path")
+            row = box.row(align=True)
+            row.prop(item, "path_channels")
+            row.prop(item, "array_index")
+        error = send_binding_error(self.index)
+        if error:
+            box.label(text=f"Source error: {error}", icon="ERROR")
+
+        box = layout.box()
+        box.label(text="Encoding", icon="LINENUMBERS_ON")
+        box.prop(item, "value_format", expand=True)
+        if item.value_format == 'FIXED':
+            row = box.row(align=True)
+            row.prop(item, "fixed_scale")
+            row.prop(item, "fixed_type", text="")
+        else:
+            box.prop(item, "precision")
+        if item.source_type == 'PATH':
+            return
 
         box = layout.box()
         box.label(text="Transform Properties", icon="FILE_3D")
@@ -213,6 +504,7 @@ class ShowSettingsPopupSend(bpy.types.Operator):
         row.prop(item, "property_name", text="")
 
         col = split.column()
+        col.enabled = item.property_name in {"location", "rotation_euler", "scale"}
         row = col.row(align=True)
         row.label(text="Axes:")
         row.prop(item, "selected_axes", text="")
@@ -229,6 +521,8 @@ class AddSendObject(Operator):
         scene = context.scene
         new_item = scene.send_object_collection.add()
         new_item.sel_object = None  
+        scene.send_object_index = len(scene.send_object_collection) - 1
+        invalidate_bindings()
         self.report({'INFO'}, "Object Added for Sending")
         return {'FINISHED'}
 
@@ -240,11 +534,165 @@ class RemoveSendObject(Operator):
 
     def execute(self, context):
         scene = context.scene
+        if not 0 <= self.index < len(scene.send_object_collection):
+            return {'CANCELLED'}
         scene.send_object_collection.remove(self.index)
+        scene.send_object_index = min(scene.send_object_index, len(scene.send_object_collection) - 1)
+        invalidate_bindings()
         self.report({'INFO'}, "Object Removed")
         return {'FINISHED'}
 
 
+def natural_key(name):
+    # "Servo_2" before "Servo_10", so channels follow the numbering of the rig.
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+class BulkAddBindingsOperator(Operator):
+    """Create one binding per object (or selected pose bone) from the selection, a name pattern or a collection. Channels are assigned in name order after the existing bindings"""
+    bl_idname = "object.bulk_add_bindings"
+    bl_label = "Add Bindings in Bulk"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    direction: bpy.props.EnumProperty(
+        name="Direction",
+        items=[
+            ("RECEIVE", "Receive", "Add receive bindings"),
+            ("SEND", "Send", "Add send bindings"),
+        ],
+        default="RECEIVE"
+    ) # type: ignore
+
+    source: bpy.props.EnumProperty(
+        name="Objects",
+        items=[
+            ("SELECTION", "Selection", "Selected objects, or the selected bones in Pose Mode"),
+            ("PATTERN", "Name Pattern", "Scene objects whose name matches a pattern"),
+            ("COLLECTION", "Collection", "Objects of a collection and its children"),
+        ],
+        default="SELECTION"
+    ) # type: ignore
+
+    pattern: bpy.props.StringProperty(
+        name="Pattern",
+        description="Object names to match, * and ? are wildcards, e.g. Servo_*",
+        default="*"
+    ) # type: ignore
+
+    collection_name: bpy.props.StringProperty(
+        name="Collection"
+    ) # type: ignore
+
+    property_name: bpy.props.EnumProperty(
+        name="Property",
+        items=[
+            ("location", "Location", "3 channels: X, Y, Z"),
+            ("rotation_euler", "Rotation", "3 channels: X, Y, Z in degrees"),
+            ("scale", "Scale", "3 channels: X, Y, Z"),
+            ("rotation_quaternion", "Quaternion", "4 channels: W, X, Y, Z"),
+            ("rotation_axis_angle", "Axis Angle", "4 channels: angle in degrees, axis X, Y, Z"),
+            ("matrix_world", "Matrix 3x4", "12 channels: world matrix rows 1-3, row-major"),
+        ],
+        default="rotation_euler"
+    ) # type: ignore
+
+    selected_axes: bpy.props.EnumProperty(
+        name="Axes",
+        items=[
+            ("X", "X", ""),
+            ("Y", "Y", ""),
+            ("Z", "Z", ""),
+            ("XY", "XY", ""),
+            ("XZ", "XZ", ""),
+            ("YZ", "YZ", ""),
+            ("XYZ", "XYZ", ""),
+        ],
+        default="XYZ"
+    ) # type: ignore
+
+    skip_existing: bpy.props.BoolProperty(
+        name="Skip Existing",
+        description="Skip objects and bones that already have a binding for this property",
+        default=True
+    ) # type: ignore
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "direction", expand=True)
+        layout.prop(self, "source")
+        if self.source == 'PATTERN':
+            layout.prop(self, "pattern")
+        elif self.source == 'COLLECTION':
+            layout.prop_search(self, "collection_name", bpy.data, "collections")
+        layout.prop(self, "property_name")
+        row = layout.row()
+        row.enabled = self.property_name in {"location", "rotation_euler", "scale"}
+        row.prop(self, "selected_axes")
+        layout.prop(self, "skip_existing")
+
+    def targets(self, context):
+        # (object, bone name) pairs in name order.
+        if self.source == 'SELECTION' and context.mode == 'POSE':
+            bones = [(bone.id_data, bone.name) for bone in context.selected_pose_bones or ()]
+            return sorted(bones, key=lambda target: (target[0].name, natural_key(target[1])))
+
+        if self.source == 'SELECTION':
+            objects = context.selected_objects
+        elif self.source == 'PATTERN':
+            objects = [obj for obj in context.scene.objects if fnmatch.fnmatchcase(obj.name, self.pattern)]
+        else:
+            collection = bpy.data.collections.get(self.collection_name)
+            objects = collection.all_objects if collection else ()
+        return [(obj, "") for obj in sorted(objects, key=lambda obj: natural_key(obj.name))]
+
+    def execute(self, context):
+        scene = context.scene
+        is_receive = self.direction == 'RECEIVE'
+        collection = scene.custom_object_collection if is_receive else scene.send_object_collection
+        width = binding_width if is_receive else send_binding_width
+        bone_type = 'BONE'
+        plain_type = 'OBJECT' if is_receive else 'LOCAL'
+
+        existing = set()
+        first_channel = 0
+        for item in collection:
+            first_channel += width(item)
+            item_type = item.target_type if is_receive else item.source_type
+            if item_type in {bone_type, plain_type}:
+                existing.add((item.sel_object, item.bone_name if item_type == bone_type else "", item.property_name))
+
+        added = 0
+        with deferred_binding_updates(scene):
+            for obj, bone_name in self.targets(context):
+                if self.skip_existing and (obj, bone_name, self.property_name) in existing:
+                    continue
+                item = collection.add()
+                if is_receive:
+                    item.target_type = bone_type if bone_name else plain_type
+                else:
+                    item.source_type = bone_type if bone_name else plain_type
+                item.bone_name = bone_name
+                item.property_name = self.property_name
+                item.selected_axes = self.selected_axes
+                item.sel_object = obj
+                added += 1
+
+        if not added:
+            self.report({'WARNING'}, "No new objects to bind")
+            return {'CANCELLED'}
+
+        last_channel = sum(width(item) for item in collection[len(collection) - added:]) + first_channel - 1
+        if is_receive:
+            scene.custom_object_index = len(collection) - 1
+        else:
+            scene.send_object_index = len(collection) - 1
+        self.report({'INFO'}, f"Added {added} bindings on channels {first_channel}-{last_channel}")
+        return {'FINISHED'}
+
+
 class SerialThreadModeOperator(bpy.types.Operator):
     """Operator to select serial thread mode"""
     bl_idname = "serial_thread.select_mode"
@@ -282,6 +730,7 @@ class ShowDebugPopup(bpy.types.Operator):
         layout.prop(scene, "serialThread_debug_mode")
         layout.prop(scene, "data_processing_received_debug_mode")
         layout.prop(scene, "data_processing_send_debug_mode")
+        layout.prop(scene, "panel_timing_debug_mode")
 
        
 
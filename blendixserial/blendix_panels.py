@@ -1,6 +1,103 @@
 
+import fnmatch
+import time
 from bpy_types import Panel
+from bpy.types import UIList
 from .blendix_connection import serial_thread
+from .blendix_gdaoc import stream_pacer, display_throttle, send_scheduler
+from .blendix_bindings import channel_offsets, send_binding_width, receive_binding_error, send_binding_error
+from .blendix_codecs import BUILTIN_CODECS, get_codec
+
+
+# Binding lists. template_list draws only the visible rows; the filter and the
+# first-channel column are computed once per redraw in filter_items. Channels
+# are numbered from 0 everywhere in the UI, like the frame indices and bx().
+
+_first_channels = {}
+
+
+def filter_bindings(ui_list, items):
+    flags = [ui_list.bitflag_filter_item] * len(items)
+    if ui_list.filter_name:
+        # Matched against "<object> <bone or data path>", wildcards allowed.
+        pattern = f"*{ui_list.filter_name.lower()}*"
+        for i, item in enumerate(items):
+            name = item.sel_object.name if item.sel_object else ""
+            if not fnmatch.fnmatchcase(f"{name} {item.bone_name} {item.data_path}".lower(), pattern):
+                flags[i] = 0
+    return flags
+
+
+def binding_label(item, kind):
+    if kind == 'BONE':
+        return f"{item.bone_name or '?'} {item.property_name}"
+    if kind == 'PATH':
+        return item.data_path or "?"
+    if kind == 'ATTRIBUTE':
+        return item.attribute_name or "?"
+    return item.property_name
+
+
+class BLENDIX_UL_receive_bindings(UIList):
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        _first_channels[propname] = channel_offsets(items)
+        return filter_bindings(self, items), []
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        offsets = _first_channels.get("custom_object_collection", ())
+        row = layout.row(align=True)
+        row.label(text=f"{offsets[index] if index < len(offsets) else '-'}")
+        row.prop(item, "sel_object", text="")
+        row.label(text=binding_label(item, item.target_type))
+        if receive_binding_error(index):
+            row.label(text="", icon='ERROR')
+        row.operator("wm.object_prop_window", text="", icon="PRESET", emboss=False).index = index
+
+
+class BLENDIX_UL_send_bindings(UIList):
+
+    def filter_items(self, context, data, propname):
+        items = getattr(data, propname)
+        _first_channels[propname] = channel_offsets(items, send_binding_width)
+        return filter_bindings(self, items), []
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        offsets = _first_channels.get("send_object_collection", ())
+        row = layout.row(align=True)
+        row.label(text=f"{offsets[index] if index < len(offsets) else '-'}")
+        row.prop(item, "sel_object", text="")
+        row.label(text=binding_label(item, item.source_type))
+        if send_binding_error(index):
+            row.label(text="", icon='ERROR')
+        row.operator("wm.object_prop_window_send", text="", icon="PRESET", emboss=False).index = index
+
+
+class BLENDIX_UL_calibration_channels(UIList):
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        row = layout.row(align=True)
+        row.label(text=f"Channel {index}")
+        row.label(text=f"x {item.gain:.4g} + {item.offset:.4g}")
+        if serial_thread.calibration_error(index):
+            row.label(text="", icon='ERROR')
+
+
+class DrawTimer:
+    """Smoothed time spent building a panel's layout."""
+
+    def __init__(self):
+        self.average = 0.0
+
+    def record(self, seconds):
+        self.average = seconds if not self.average else self.average + 0.1 * (seconds - self.average)
+
+    def summary(self):
+        return f"Panel draw {self.average * 1000.0:.2f} ms"
+
+
+panel_draw_timer = DrawTimer()
 
 
 class SerialConnectionPanel(Panel):
@@ -31,11 +128,73 @@ class SerialConnectionPanel(Panel):
         split = settings_box.split(factor=0.3) 
         split.label(text="Baud Rate")
         split.prop(serial_props, "baud_rate", text="")
+        if serial_props.baud_rate == "CUSTOM":
+            split = settings_box.split(factor=0.3)
+            split.label(text="Custom")
+            split.prop(serial_props, "custom_baud_rate", text="")
+
+        settings_box.prop(serial_props, "show_link_profile",
+                          icon='TRIA_DOWN' if serial_props.show_link_profile else 'TRIA_RIGHT', emboss=False)
+        if serial_props.show_link_profile:
+            profile_col = settings_box.column(align=True)
+            profile_col.prop(serial_props, "read_timeout")
+            profile_col.prop(serial_props, "inter_byte_timeout")
+            profile_col.prop(serial_props, "write_timeout")
+            profile_col.separator()
+            profile_col.prop(serial_props, "rx_buffer_size")
+            profile_col.prop(serial_props, "tx_buffer_size")
+            profile_col.separator()
+            profile_col.prop(serial_props, "low_latency")
+            profile_col.prop(serial_props, "auto_reconnect")
+            profile_col.prop(serial_props, "io_mode")
+            profile_col.separator()
+            probe_row = profile_col.row(align=True)
+            probe_row.prop(serial_props, "use_latency_probe")
+            sub = probe_row.row(align=True)
+            sub.enabled = serial_props.use_latency_probe
+            sub.prop(serial_props, "probe_rate", text="Hz")
+            profile_col.separator()
+            profile_col.prop(serial_props, "send_queue_size")
+            profile_col.prop(serial_props, "send_deadline")
+            profile_col.prop(serial_props, "use_flow_control")
+            if serial_props.use_flow_control:
+                profile_col.prop(serial_props, "initial_credits")
+
+        integrity_box = main_box.box()
+        integrity_box.label(text="Framing", icon='LINENUMBERS_ON')
+        codec_row = integrity_box.row(align=True)
+        codec_row.prop(serial_props, "frame_format", text="")
+        codec_row.operator("serial.benchmark_codecs", text="", icon='TIME')
+        codec = get_codec(serial_props.frame_format)
+        if codec.framing == 'STREAM':
+            integrity_box.label(text="No flow control or latency echoes", icon='INFO')
+        if serial_props.io_mode == 'PROCESS' and codec.name not in BUILTIN_CODECS:
+            integrity_box.label(text="Add-on codec: connects with Thread I/O", icon='INFO')
+        integrity_row = integrity_box.row(align=True)
+        integrity_row.prop(serial_props, "use_sequence", toggle=True)
+        integrity_row.prop(serial_props, "use_crc", toggle=True)
         
         settings_box.enabled = not serial_props.is_connected
         status_row = main_box.row(align=True)
         status_row.label(icon='INFO')
         status_row.label(text=f"{serial_props.connection_status}")
+        if serial_props.is_connected:
+            stats_row = main_box.row(align=True)
+            stats_row.label(text=serial_thread.link_stats.summary(), icon='GRAPH')
+            if serial_thread.outages:
+                outage_row = main_box.row(align=True)
+                outage_row.label(text=serial_thread.reconnect_summary(), icon='FILE_REFRESH')
+            if serial_thread.mode in ['send', 'both']:
+                queue_row = main_box.row(align=True)
+                queue_row.label(text=serial_thread.send_queue.summary(), icon='EXPORT')
+        if serial_props.use_latency_probe or serial_thread.probe.samples:
+            probe_box = main_box.box()
+            probe_row = probe_box.row(align=True)
+            probe_row.label(text=serial_thread.probe.summary(), icon='TIME')
+            probe_row.operator("serial.export_latency", text="", icon='EXPORT')
+            offset = serial_thread.probe.offset_summary()
+            if offset:
+                probe_box.label(text=offset, icon='SORTTIME')
         layout = row.operator("wm.object_prop_window_debug", text="", icon="CONSOLE")
         layout = row.operator("wm.object_prop_window_info", text="", icon="QUESTION")
 
@@ -50,6 +209,7 @@ class UserInterfacePanel(Panel):
     bl_parent_id = "SCENE_PT_serial_connection"  
 
     def draw(self, context):
+        started = time.perf_counter()
         layout = self.layout
         scene = context.scene
         serial_mode = scene.serial_thread_modes  
@@ -81,8 +241,16 @@ class UserInterfacePanel(Panel):
             elif scene.my_ui_tabs.tabs == 'TAB2':
                 self.draw_send_tab(layout, scene)
 
+        panel_draw_timer.record(time.perf_counter() - started)
+        if scene.panel_timing_debug_mode:
+            layout.label(text=panel_draw_timer.summary(), icon='TIME')
+
 
     def draw_receive_tab(self, layout, scene):
+        display_row = layout.row(align=True)
+        display_row.prop(scene, "display_rate")
+        layout.label(text=display_throttle.summary(), icon='RESTRICT_VIEW_OFF')
+
         layout.label(text="Receive Text Data in 3D View", icon='FILE_FONT')
         font_box = layout.box()
         row = font_box.row()
@@ -92,38 +260,128 @@ class UserInterfacePanel(Panel):
 
         layout.separator()
 
-        layout.label(text="Animate Object", icon='ANIM')
-        animate_box = layout.box()
-        animate_box.operator("object.add_object", text="Add New Custom Object")
-
-        layout.separator()
+        driver_box = layout.box()
+        driver_row = driver_box.row(align=True)
+        driver_row.prop(scene, "use_driver_channels", icon='DRIVER')
+        driver_row.operator("object.add_channel_driver", text="", icon='ADD')
+        if scene.use_driver_channels:
+            driver_box.label(text="Drivers: bx(channel), bx_text()", icon='INFO')
 
-        for i, item in enumerate(scene.custom_object_collection):
-            item_box = animate_box.box()
-            row = item_box.row()
-            row.prop(item, "sel_object", text="Object {}".format(i + 1))
+        scope_box = layout.box()
+        scope_box.prop(scene, "show_channel_scope", icon='GRAPH')
+        if scene.show_channel_scope:
+            scope_box.prop(scene, "scope_channels")
+            row = scope_box.row(align=True)
+            row.prop(scene, "scope_samples")
+            row.prop(scene, "scope_height")
+            row = scope_box.row(align=True)
+            row.prop(scene, "scope_auto_range", toggle=True)
+            sub = row.row(align=True)
+            sub.enabled = not scene.scope_auto_range
+            sub.prop(scene, "scope_min")
+            sub.prop(scene, "scope_max")
 
-            settings_button = row.operator("wm.object_prop_window", text="", icon="PRESET")
-            settings_button.index = i
+        layout.separator()
 
-            remove_button = row.operator("object.remove_custom_object", text="", icon='X')
-            remove_button.index = i
+        layout.label(text="Animate Object", icon='ANIM')
+        animate_box = layout.box()
+        row = animate_box.row()
+        row.template_list("BLENDIX_UL_receive_bindings", "", scene, "custom_object_collection",
+                          scene, "custom_object_index", rows=6)
+        col = row.column(align=True)
+        col.operator("object.add_object", text="", icon='ADD')
+        col.operator("object.remove_custom_object", text="", icon='REMOVE').index = scene.custom_object_index
+        col.separator()
+        col.operator("object.bulk_add_bindings", text="", icon='COLLECTION_NEW').direction = 'RECEIVE'
 
     def draw_send_tab(self, layout, scene):
         mainbox = layout.box()  
         mainbox.prop(scene, "send_data_method")
         if scene.send_data_method == 'KEYFRAME':
             mainbox.prop(scene, "frame_skip_interval")
-        mainbox.operator("object.add_send_object", text="Add New Object to Send")
-        mainbox.separator()
+        elif scene.send_data_method == 'DEPSGRAPH':
+            mainbox.prop(scene, "send_change_rate")
+        elif scene.send_data_method == 'STREAM':
+            mainbox.prop(scene, "stream_rate")
+            mainbox.label(text=stream_pacer.summary(), icon='TIME')
+        elif scene.send_data_method == 'SCHEDULED':
+            mainbox.prop(scene, "schedule_rate")
+        row = mainbox.row()
+        row.template_list("BLENDIX_UL_send_bindings", "", scene, "send_object_collection",
+                          scene, "send_object_index", rows=6)
+        col = row.column(align=True)
+        col.operator("object.add_send_object", text="", icon='ADD')
+        col.operator("object.remove_send_object", text="", icon='REMOVE').index = scene.send_object_index
+        col.separator()
+        col.operator("object.bulk_add_bindings", text="", icon='COLLECTION_NEW').direction = 'SEND'
 
-        for i, item in enumerate(scene.send_object_collection):
-            item_box = mainbox.box()
-            row = item_box.row()
-            row.prop(item, "sel_object", text="Object {}".format(i + 1))
+        index = scene.send_object_index
+        if scene.send_data_method == 'SCHEDULED' and 0 <= index < len(scene.send_object_collection):
+            item = scene.send_object_collection[index]
+            row = mainbox.row(align=True)
+            row.prop(item, "send_rate")
+            row.prop(item, "send_priority")
+            summary = send_scheduler.binding_summary(index)
+            if summary:
+                mainbox.label(text=summary, icon='TIME')
 
-            settings_button = row.operator("wm.object_prop_window_send", text="", icon="PRESET")
-            settings_button.index = i
 
-            remove_button = row.operator("object.remove_send_object", text="", icon='X')
-            remove_button.index = i
+class CalibrationPanel(Panel):
+    bl_label = "Calibration"
+    bl_idname = "OBJECT_PT_blendix_calibration"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "Blendix Serial"
+    bl_parent_id = "SCENE_PT_serial_connection"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.serial_thread_modes in {'receive', 'both'}
+
+    def draw_header(self, context):
+        self.layout.prop(context.scene, "use_calibration", text="")
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        row = layout.row(align=True)
+        if serial_thread.calibrator.capturing:
+            _, _, frame_count = serial_thread.calibration_capture()
+            row.operator("object.finish_calibration_capture", text=f"Finish Capture ({frame_count} frames)", icon='REC')
+        else:
+            row.operator("object.start_calibration_capture", text="Capture Range", icon='REC')
+        row.operator("object.clear_calibration", text="", icon='TRASH')
+
+        layout.template_list("BLENDIX_UL_calibration_channels", "", scene, "calibration_channels",
+                             scene, "calibration_channel_index", rows=4)
+        i = scene.calibration_channel_index
+        if not 0 <= i < len(scene.calibration_channels):
+            return
+        channel = scene.calibration_channels[i]
+        box = layout.box()
+        row = box.row(align=True)
+        row.label(text=f"Channel {i}")
+        row.prop(channel, "invert", text="", icon='ARROW_LEFTRIGHT')
+        row = box.row(align=True)
+        row.prop(channel, "gain")
+        row.prop(channel, "offset")
+        row = box.row(align=True)
+        row.prop(channel, "target_min")
+        row.prop(channel, "target_max")
+        box.prop(channel, "dead_zone")
+        row = box.row(align=True)
+        row.prop(channel, "use_clamp")
+        sub = row.row(align=True)
+        sub.enabled = channel.use_clamp
+        sub.prop(channel, "clamp_min")
+        sub.prop(channel, "clamp_max")
+        row = box.row(align=True)
+        row.prop(channel, "use_curve")
+        sub = row.row(align=True)
+        sub.enabled = channel.use_curve
+        sub.prop(channel, "curve", text="")
+        error = serial_thread.calibration_error(i)
+        if error:
+            box.label(text=f"Curve error: {error}", icon='ERROR')
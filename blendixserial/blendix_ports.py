@@ -0,0 +1,34 @@
+import serial.tools.list_ports
+
+# Serial port lookup, shared by the in-process connection and the worker process.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# A USB device can come back under another path after it was unplugged or the
+# OS re-enumerated it (/dev/ttyACM0 -> /dev/ttyACM1, COM3 -> COM5). Reconnecting
+# follows it by its USB serial number when it has one.
+
+
+def list_ports():
+    return [port.device for port in serial.tools.list_ports.comports()]
+
+
+def port_serial_number(device):
+    for port in serial.tools.list_ports.comports():
+        if port.device == device:
+            return port.serial_number
+    return None
+
+
+def find_port_by_serial_number(serial_number):
+    for port in serial.tools.list_ports.comports():
+        if port.serial_number == serial_number:
+            return port.device
+    return None
+
+
+def resolve_port(device, serial_number):
+    # The path to reopen: where the device with this serial number is now, or the
+    # same path for devices without one. None while the device is gone.
+    if not serial_number:
+        return device
+    return find_port_by_serial_number(serial_number)
@@ -1,7 +1,74 @@
 import bpy
+from contextlib import contextmanager
 from bpy.types import PropertyGroup
-from bpy.props import EnumProperty, BoolProperty, StringProperty, PointerProperty, CollectionProperty, FloatProperty
+from bpy.props import EnumProperty, BoolProperty, StringProperty, PointerProperty, CollectionProperty, FloatProperty, IntProperty
 from .blendix_connection import SerialConnection, serial_thread
+from .blendix_bindings import invalidate_bindings, receive_filter_spec
+from .blendix_calibration import calibration_spec
+from .blendix_codecs import codecs
+
+
+def update_integrity(self, context):
+    serial_thread.set_integrity(self.frame_format, self.use_sequence, self.use_crc)
+
+
+# Blender needs the strings of dynamic enum items kept alive on the Python side.
+_codec_items = []
+
+
+def codec_items(self, context):
+    _codec_items[:] = [(codec.name, codec.label, codec.description, codec.number) for codec in codecs()]
+    return _codec_items
+
+
+_binding_updates_deferred = False
+
+
+def update_receive_binding(self, context):
+    # The channel layout may have changed, the reader's filters follow it.
+    if _binding_updates_deferred:
+        return
+    invalidate_bindings()
+    sync_receive_filters(context.scene)
+
+
+@contextmanager
+def deferred_binding_updates(scene):
+    # Bulk edits write many binding properties: rebuild and sync once at the end
+    # instead of once per write.
+    global _binding_updates_deferred
+    _binding_updates_deferred = True
+    try:
+        yield
+    finally:
+        _binding_updates_deferred = False
+        invalidate_bindings()
+        sync_receive_filters(scene)
+
+
+def sync_receive_filters(scene):
+    serial_thread.set_filters(receive_filter_spec(scene))
+
+
+def update_calibration(self, context):
+    sync_calibration(context.scene)
+
+
+def sync_calibration(scene):
+    spec = calibration_spec(scene.calibration_channels) if scene.use_calibration else None
+    serial_thread.set_calibration(spec)
+
+
+def update_auto_reconnect(self, context):
+    serial_thread.auto_reconnect = self.auto_reconnect
+    serial_thread.sync_worker()
+
+
+def update_send_queue(self, context):
+    serial_thread.send_queue.configure(
+        self.send_queue_size, self.send_deadline / 1000.0, self.use_flow_control, self.initial_credits
+    )
+    serial_thread.sync_worker()
 
 
 class SerialConnectionProperties(PropertyGroup):
@@ -20,10 +87,173 @@ class SerialConnectionProperties(PropertyGroup):
             ("19200", "19200 bps", ""),
             ("38400", "38400 bps", ""),
             ("57600", "57600 bps", ""),
-            ("115200", "115200 bps", "")
+            ("115200", "115200 bps", ""),
+            ("230400", "230400 bps", ""),
+            ("460800", "460800 bps", ""),
+            ("921600", "921600 bps", ""),
+            ("1000000", "1 Mbps", ""),
+            ("2000000", "2 Mbps", ""),
+            ("3000000", "3 Mbps", ""),
+            ("4000000", "4 Mbps", ""),
+            ("CUSTOM", "Custom", "Enter an arbitrary baud rate")
         ]
     ) # type: ignore
 
+    custom_baud_rate: IntProperty(
+        name="Custom Baud Rate",
+        description="Baud rate used when Baud Rate is set to Custom",
+        default=250000,
+        min=50
+    ) # type: ignore
+
+    show_link_profile: BoolProperty(
+        name="Link Profile",
+        description="Show low-level port tuning options",
+        default=False
+    ) # type: ignore
+
+    read_timeout: FloatProperty(
+        name="Read Timeout",
+        description="Maximum time (s) a read waits for the first byte before the thread services sending",
+        default=0.01,
+        min=0.001,
+        max=1.0,
+        precision=3,
+        step=0.1
+    ) # type: ignore
+
+    inter_byte_timeout: FloatProperty(
+        name="Inter-Byte Timeout",
+        description="Maximum gap (s) between bytes of one read (0 = disabled)",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        precision=3,
+        step=0.1
+    ) # type: ignore
+
+    write_timeout: FloatProperty(
+        name="Write Timeout",
+        description="Maximum time (s) a write may block before it is abandoned (0 = block until written)",
+        default=0.1,
+        min=0.0,
+        max=5.0,
+        precision=3,
+        step=0.1
+    ) # type: ignore
+
+    rx_buffer_size: IntProperty(
+        name="RX Buffer",
+        description="OS receive buffer size in bytes (0 = driver default, applied where the platform supports it)",
+        default=0,
+        min=0
+    ) # type: ignore
+
+    tx_buffer_size: IntProperty(
+        name="TX Buffer",
+        description="OS transmit buffer size in bytes (0 = driver default, applied where the platform supports it)",
+        default=0,
+        min=0
+    ) # type: ignore
+
+    low_latency: BoolProperty(
+        name="Low Latency",
+        description="Request low-latency mode on the tty (Linux only, e.g. FTDI/CP210x latency timer)",
+        default=False
+    ) # type: ignore
+
+    io_mode: EnumProperty(
+        name="I/O",
+        description="Where serial reading, framing and decoding run",
+        items=[
+            ('THREAD', "In Blender", "Background thread inside Blender's Python process"),
+            ('PROCESS', "Separate Process", "Worker process publishing samples through shared memory, keeps parsing off Blender's GIL")
+        ],
+        default='THREAD'
+    ) # type: ignore
+
+    auto_reconnect: BoolProperty(
+        name="Auto Reconnect",
+        description="Reopen the port automatically when the device drops out (follows it by USB serial number)",
+        default=True,
+        update=update_auto_reconnect
+    ) # type: ignore
+
+    frame_format: EnumProperty(
+        name="Codec",
+        description="Wire format used in both directions; other add-ons can register more codecs",
+        items=codec_items,
+        update=update_integrity
+    ) # type: ignore
+
+    use_sequence: BoolProperty(
+        name="Sequence Numbers",
+        description="Frames carry a sequence number; gaps are counted as lost frames",
+        default=False,
+        update=update_integrity
+    ) # type: ignore
+
+    use_crc: BoolProperty(
+        name="CRC Check",
+        description="Frames carry a CRC-16/CCITT checksum; corrupted frames are dropped",
+        default=False,
+        update=update_integrity
+    ) # type: ignore
+
+    send_queue_size: IntProperty(
+        name="Send Queue Size",
+        description="Maximum number of outgoing messages waiting to be written; the oldest is dropped when full",
+        default=8,
+        min=1,
+        max=1024,
+        update=update_send_queue
+    ) # type: ignore
+
+    send_deadline: FloatProperty(
+        name="Send Deadline (ms)",
+        description="Outgoing messages not written within this time are dropped as stale (0 = never)",
+        default=100.0,
+        min=0.0,
+        max=10000.0,
+        update=update_send_queue
+    ) # type: ignore
+
+    use_flow_control: BoolProperty(
+        name="Credit Flow Control",
+        description="Only write when the device has granted credits with '!A<credits>' acknowledgements",
+        default=False,
+        update=update_send_queue
+    ) # type: ignore
+
+    initial_credits: IntProperty(
+        name="Initial Credits",
+        description="Credits available after connecting, before the first acknowledgement",
+        default=4,
+        min=0,
+        max=64,
+        update=update_send_queue
+    ) # type: ignore
+
+    use_latency_probe: BoolProperty(
+        name="Latency Probe",
+        description="Send timestamped pings ('!P' / binary ping frames) the firmware echoes back, "
+                    "and measure the round trip time and clock offset",
+        default=False
+    ) # type: ignore
+
+    probe_rate: FloatProperty(
+        name="Probe Rate (Hz)",
+        description="Pings per second while the latency probe is on",
+        default=2.0,
+        min=0.1,
+        max=50.0
+    ) # type: ignore
+
+    def get_baud_rate(self):
+        if self.baud_rate == "CUSTOM":
+            return self.custom_baud_rate
+        return int(self.baud_rate)
+
     is_connected: BoolProperty(
         name="Connected",
         default=False,
@@ -41,17 +271,114 @@ class SerialConnectionProperties(PropertyGroup):
 class DynamicObjectProperties(PropertyGroup):
     sel_object: PointerProperty(
         name="Object",
-        type=bpy.types.Object
+        type=bpy.types.Object,
+        update=update_receive_binding
+    ) # type: ignore
+
+    target_type: EnumProperty(
+        name="Target",
+        items=[
+            ("OBJECT", "Object", "Drive the object's own transform"),
+            ("BONE", "Pose Bone", "Drive a pose bone of the armature object"),
+            ("PATH", "Data Path", "Drive any property reachable from the object by data path"),
+            ("ATTRIBUTE", "Attribute Array", "Stream a block of channels into a mesh or point cloud attribute"),
+        ],
+        default="OBJECT",
+        update=update_receive_binding
+    ) # type: ignore
+
+    bone_name: StringProperty(
+        name="Bone",
+        description="Pose bone driven by this binding",
+        update=update_receive_binding
+    ) # type: ignore
+
+    data_path: StringProperty(
+        name="Data Path",
+        description="Path relative to the object, e.g. data.energy, data.lens, [\"my_prop\"], "
+                    "modifiers[\"Bend\"].angle or data.shape_keys.key_blocks[\"Key 1\"].value",
+        update=update_receive_binding
+    ) # type: ignore
+
+    path_channels: IntProperty(
+        name="Channels",
+        description="Number of channels consumed by this binding (more than 1 for array properties)",
+        default=1,
+        min=1,
+        max=64,
+        update=update_receive_binding
+    ) # type: ignore
+
+    array_index: IntProperty(
+        name="Array Index",
+        description="First element written when the data path points to an array property",
+        default=0,
+        min=0,
+        update=update_receive_binding
+    ) # type: ignore
+
+    gain: FloatProperty(
+        name="Gain",
+        description="Incoming values are multiplied by this factor",
+        default=1.0,
+        update=update_receive_binding
+    ) # type: ignore
+
+    offset: FloatProperty(
+        name="Offset",
+        description="Added to the incoming values after the gain",
+        default=0.0,
+        update=update_receive_binding
+    ) # type: ignore
+
+    use_clamp: BoolProperty(
+        name="Clamp",
+        description="Clamp converted values to a range",
+        default=False,
+        update=update_receive_binding
+    ) # type: ignore
+
+    clamp_min: FloatProperty(
+        name="Min",
+        default=0.0,
+        update=update_receive_binding
+    ) # type: ignore
+
+    clamp_max: FloatProperty(
+        name="Max",
+        default=1.0,
+        update=update_receive_binding
+    ) # type: ignore
+
+    attribute_name: StringProperty(
+        name="Attribute",
+        description="Point-domain attribute written by this binding (a float attribute is created if missing). "
+                    "Use 'position' to stream vertex positions",
+        default="blendix",
+        update=update_receive_binding
+    ) # type: ignore
+
+    array_length: IntProperty(
+        name="Channels",
+        description="Number of consecutive channels written into the attribute",
+        default=64,
+        min=1,
+        max=65536,
+        update=update_receive_binding
     ) # type: ignore
 
     property_name: EnumProperty(
     name="Property",
     items=[
-        ("location", "Location", ""),
-        ("rotation_euler", "Rotation", ""),
-        ("scale", "Scale", ""),
+        ("location", "Location", "3 channels: X, Y, Z"),
+        ("rotation_euler", "Rotation", "3 channels: X, Y, Z in degrees"),
+        ("scale", "Scale", "3 channels: X, Y, Z"),
+        ("rotation_quaternion", "Quaternion", "4 channels: W, X, Y, Z"),
+        ("rotation_axis_angle", "Axis Angle", "4 channels: angle in degrees, axis X, Y, Z"),
+        ("matrix_world", "Matrix 3x4", "12 channels: world matrix rows 1-3, row-major"),
     ],
-    default="location"
+    default="location",
+    update=update_receive_binding
     ) # type: ignore
 
     selected_axes: EnumProperty(
@@ -66,8 +393,66 @@ class DynamicObjectProperties(PropertyGroup):
                 ("XYZ", "XYZ", ""),
             ],
             default="XYZ",
+            update=update_receive_binding
     )  # type: ignore
 
+    filter_type: EnumProperty(
+        name="Filter",
+        description="Smoothing applied to this binding's channels by the reader, before they reach Blender",
+        items=[
+            ('NONE', "None", "Use the values as received"),
+            ('LOWPASS', "Low-Pass", "Exponential low-pass filter"),
+            ('ONE_EURO', "One Euro", "Low-pass that follows fast motion with less lag and smooths slow motion harder"),
+            ('MEDIAN', "Median", "Moving median, removes single-sample spikes"),
+            ('RATE_LIMIT', "Rate Limit", "Limit how fast the value may change"),
+        ],
+        default='NONE',
+        update=update_receive_binding
+    ) # type: ignore
+
+    filter_cutoff: FloatProperty(
+        name="Cutoff (Hz)",
+        description="Cutoff frequency of the low-pass, minimum cutoff of the one euro filter",
+        default=5.0,
+        min=0.01,
+        max=1000.0,
+        update=update_receive_binding
+    ) # type: ignore
+
+    filter_beta: FloatProperty(
+        name="Beta",
+        description="How much the one euro cutoff rises with speed",
+        default=0.01,
+        min=0.0,
+        update=update_receive_binding
+    ) # type: ignore
+
+    filter_derivative_cutoff: FloatProperty(
+        name="Speed Cutoff (Hz)",
+        description="Cutoff of the low-pass applied to the speed estimate of the one euro filter",
+        default=1.0,
+        min=0.01,
+        max=1000.0,
+        update=update_receive_binding
+    ) # type: ignore
+
+    filter_window: IntProperty(
+        name="Window",
+        description="Number of frames the median is taken over",
+        default=5,
+        min=2,
+        max=64,
+        update=update_receive_binding
+    ) # type: ignore
+
+    filter_rate: FloatProperty(
+        name="Max Rate",
+        description="Largest change per second, in channel units",
+        default=10.0,
+        min=0.0,
+        update=update_receive_binding
+    ) # type: ignore
+
 
     
     text_object_axis: PointerProperty(
@@ -82,6 +467,84 @@ class DynamicObjectProperties(PropertyGroup):
 
 
 
+class CalibrationChannelProperties(PropertyGroup):
+    gain: FloatProperty(
+        name="Gain",
+        description="Raw values are multiplied by this factor",
+        default=1.0,
+        precision=6,
+        update=update_calibration
+    ) # type: ignore
+
+    offset: FloatProperty(
+        name="Offset",
+        description="Added after the gain",
+        default=0.0,
+        precision=4,
+        update=update_calibration
+    ) # type: ignore
+
+    invert: BoolProperty(
+        name="Invert",
+        description="Flip the sign of the calibrated value",
+        default=False,
+        update=update_calibration
+    ) # type: ignore
+
+    dead_zone: FloatProperty(
+        name="Dead Zone",
+        description="Calibrated values closer to 0 than this become 0",
+        default=0.0,
+        min=0.0,
+        update=update_calibration
+    ) # type: ignore
+
+    use_curve: BoolProperty(
+        name="Curve",
+        description="Remap the calibrated value through a piecewise linear curve",
+        default=False,
+        update=update_calibration
+    ) # type: ignore
+
+    curve: StringProperty(
+        name="Points",
+        description="Curve points as in:out pairs, e.g. 0:0, 0.5:0.2, 1:1",
+        default="0:0, 1:1",
+        update=update_calibration
+    ) # type: ignore
+
+    use_clamp: BoolProperty(
+        name="Clamp",
+        default=False,
+        update=update_calibration
+    ) # type: ignore
+
+    clamp_min: FloatProperty(
+        name="Min",
+        default=0.0,
+        update=update_calibration
+    ) # type: ignore
+
+    clamp_max: FloatProperty(
+        name="Max",
+        default=1.0,
+        update=update_calibration
+    ) # type: ignore
+
+    target_min: FloatProperty(
+        name="Low",
+        description="Value the captured minimum is mapped to",
+        default=0.0
+    ) # type: ignore
+
+    target_max: FloatProperty(
+        name="High",
+        description="Value the captured maximum is mapped to",
+        default=1.0
+    ) # type: ignore
+
+
+
 class MyUIPanelTabs(bpy.types.PropertyGroup):
     tabs: bpy.props.EnumProperty(
         name="Tabs",
@@ -97,17 +560,63 @@ class MyUIPanelTabs(bpy.types.PropertyGroup):
 class DynamicSendObjectProperties(PropertyGroup):
     sel_object: PointerProperty(
         name="Object",
-        type=bpy.types.Object
+        type=bpy.types.Object,
+        update=invalidate_bindings
+    ) # type: ignore
+
+    source_type: EnumProperty(
+        name="Source",
+        items=[
+            ("LOCAL", "Local", "The object's own transform channels"),
+            ("WORLD", "World", "Evaluated world-space transform, including parenting, constraints and drivers"),
+            ("BONE", "Pose Bone", "Evaluated armature-space transform of a pose bone, including constraints"),
+            ("PATH", "Data Path", "Any property reachable from the object by data path"),
+        ],
+        default="LOCAL",
+        update=invalidate_bindings
+    ) # type: ignore
+
+    bone_name: StringProperty(
+        name="Bone",
+        description="Pose bone read by this binding",
+        update=invalidate_bindings
+    ) # type: ignore
+
+    data_path: StringProperty(
+        name="Data Path",
+        description="Path relative to the object, e.g. data.energy, data.lens or [\"my_prop\"]",
+        update=invalidate_bindings
+    ) # type: ignore
+
+    path_channels: IntProperty(
+        name="Channels",
+        description="Number of channels sent by this binding (more than 1 for array properties)",
+        default=1,
+        min=1,
+        max=64,
+        update=invalidate_bindings
+    ) # type: ignore
+
+    array_index: IntProperty(
+        name="Array Index",
+        description="First element read when the data path points to an array property",
+        default=0,
+        min=0,
+        update=invalidate_bindings
     ) # type: ignore
 
     property_name: EnumProperty(
         name="Property",
         items=[
-            ("location", "Location", ""),
-            ("rotation_euler", "Rotation", ""),
-            ("scale", "Scale", ""),
+            ("location", "Location", "3 channels: X, Y, Z"),
+            ("rotation_euler", "Rotation", "3 channels: X, Y, Z in degrees"),
+            ("scale", "Scale", "3 channels: X, Y, Z"),
+            ("rotation_quaternion", "Quaternion", "4 channels: W, X, Y, Z"),
+            ("rotation_axis_angle", "Axis Angle", "4 channels: angle in degrees, axis X, Y, Z"),
+            ("matrix_world", "Matrix 3x4", "12 channels: world matrix rows 1-3, row-major"),
         ],
-        default="location"
+        default="location",
+        update=invalidate_bindings
     ) # type: ignore
 
     selected_axes: EnumProperty(
@@ -122,6 +631,64 @@ class DynamicSendObjectProperties(PropertyGroup):
             ("XYZ", "XYZ", ""),
         ],
         default="XYZ",
+        update=invalidate_bindings
+    ) # type: ignore
+
+    value_format: EnumProperty(
+        name="Encoding",
+        items=[
+            ("FLOAT", "Float", "Decimal text in CSV, float32 in binary frames"),
+            ("FIXED", "Fixed Point", "Scaled integer, e.g. centi-degrees with a scale of 100"),
+        ],
+        default="FLOAT",
+        update=invalidate_bindings
+    ) # type: ignore
+
+    precision: IntProperty(
+        name="Decimals",
+        description="Number of decimals written for float channels in CSV frames",
+        default=2,
+        min=0,
+        max=9,
+        update=invalidate_bindings
+    ) # type: ignore
+
+    fixed_scale: FloatProperty(
+        name="Scale",
+        description="Fixed-point channels are sent as round(value * scale)",
+        default=100.0,
+        min=1e-6,
+        update=invalidate_bindings
+    ) # type: ignore
+
+    fixed_type: EnumProperty(
+        name="Integer Type",
+        description="Saturation range of fixed-point channels and their size in binary frames",
+        items=[
+            ("INT16", "int16", ""),
+            ("INT32", "int32", ""),
+        ],
+        default="INT16",
+        update=invalidate_bindings
+    ) # type: ignore
+
+    send_rate: FloatProperty(
+        name="Rate (Hz)",
+        description="Target send rate of this binding in Multi-Rate mode (0 = every scheduler tick)",
+        default=0.0,
+        min=0.0,
+        max=2000.0,
+        update=invalidate_bindings
+    ) # type: ignore
+
+    send_priority: IntProperty(
+        name="Priority",
+        description="In Multi-Rate mode due bindings with a higher priority are sent first "
+                    "when the link cannot carry all of them",
+        default=0,
+        min=0,
+        max=100,
+        update=invalidate_bindings
     ) # type: ignore
 
 
@@ -196,6 +763,13 @@ bpy.types.Scene.data_processing_send_debug_mode = bpy.props.BoolProperty(
 )
 
 
+bpy.types.Scene.panel_timing_debug_mode = bpy.props.BoolProperty(
+    name="Panel Draw Time",
+    description="Show how long the 3D Object Control panel takes to build, to check large rigs",
+    default=False
+)
+
+
 bpy.types.Scene.updateSceneDelay = FloatProperty(
         name="Update Scene",
         default=1,
@@ -224,13 +798,131 @@ bpy.types.Scene.send_data_method = bpy.props.EnumProperty(
         description="Choose how to send data: on frame change or using timer",
         items=[
             ('KEYFRAME', "Keyframe Based", "Send data using frame change events"),
-            ('TIMER', "Timer Based", "Send data using a timer function")
+            ('TIMER', "Timer Based", "Send data using a timer function"),
+            ('DEPSGRAPH', "Change Based", "Send data as soon as a sent object changes (e.g. while dragging it)"),
+            ('STREAM', "Stream", "During playback send F-curve setpoints interpolated between frames at a fixed rate"),
+            ('SCHEDULED', "Multi-Rate", "Send every object at its own rate and priority, in partial frames tagged with channel indices")
         ],
         default='KEYFRAME'
     )
 
+bpy.types.Scene.stream_rate = bpy.props.FloatProperty(
+        name="Stream Rate (Hz)",
+        description="Setpoints per second emitted during playback in Stream mode",
+        default=200.0,
+        min=1.0,
+        max=2000.0
+    )
+
+bpy.types.Scene.schedule_rate = bpy.props.FloatProperty(
+        name="Tick Rate (Hz)",
+        description="Most scheduler ticks per second in Multi-Rate mode; objects without a rate are sent on every tick",
+        default=200.0,
+        min=1.0,
+        max=1000.0
+    )
+
+bpy.types.Scene.send_change_rate = bpy.props.FloatProperty(
+        name="Max Rate (Hz)",
+        description="Upper limit for change-based sends; the last change is always sent",
+        default=60.0,
+        min=1.0,
+        max=1000.0
+    )
+
+bpy.types.Scene.display_rate = bpy.props.FloatProperty(
+        name="Display Rate (Hz)",
+        description="Most times per second received data is presented in the viewport. "
+                    "Frames arriving faster are still ingested, only the latest one is drawn",
+        default=60.0,
+        min=1.0,
+        max=240.0
+    )
+
+bpy.types.Scene.use_driver_channels = bpy.props.BoolProperty(
+        name="Driver Channels",
+        description="Publish every presented frame to drivers as bx(channel) and bump driver_tick once, "
+                    "so channel drivers update in a single depsgraph pass",
+        default=False
+    )
+
+bpy.types.Scene.driver_tick = bpy.props.IntProperty(
+        name="Driver Tick",
+        description="Incremented once per presented frame; channel drivers depend on it",
+        default=0
+    )
+
+bpy.types.Scene.show_channel_scope = bpy.props.BoolProperty(
+        name="Channel Scope",
+        description="Plot the history of selected received channels over the 3D View",
+        default=False
+    )
+
+bpy.types.Scene.scope_channels = bpy.props.StringProperty(
+        name="Channels",
+        description="Channels to plot (0-based), e.g. 0-3, 8, 12",
+        default="0-3"
+    )
+
+bpy.types.Scene.scope_samples = bpy.props.IntProperty(
+        name="History",
+        description="Samples kept and plotted per channel",
+        default=1000,
+        min=10,
+        max=100000
+    )
+
+bpy.types.Scene.scope_auto_range = bpy.props.BoolProperty(
+        name="Auto Range",
+        description="Fit the vertical range to the plotted history",
+        default=True
+    )
+
+bpy.types.Scene.scope_min = bpy.props.FloatProperty(
+        name="Min",
+        description="Value at the bottom edge of the scope",
+        default=-1.0
+    )
+
+bpy.types.Scene.scope_max = bpy.props.FloatProperty(
+        name="Max",
+        description="Value at the top edge of the scope",
+        default=1.0
+    )
+
+bpy.types.Scene.scope_height = bpy.props.IntProperty(
+        name="Height",
+        description="Height of the scope in pixels",
+        default=150,
+        min=50,
+        max=1000
+    )
+
+bpy.types.Scene.custom_object_index = bpy.props.IntProperty(
+        name="Active Receive Binding",
+        default=0
+    )
+
+bpy.types.Scene.send_object_index = bpy.props.IntProperty(
+        name="Active Send Binding",
+        default=0
+    )
+
+bpy.types.Scene.calibration_channel_index = bpy.props.IntProperty(
+        name="Active Calibration Channel",
+        default=0
+    )
+
+bpy.types.Scene.use_calibration = bpy.props.BoolProperty(
+        name="Calibrate",
+        description="Apply the per-channel calibration table to every received frame",
+        default=False,
+        update=update_calibration
+    )
+
 def register():
     bpy.types.Scene.serial_connection_properties = bpy.props.PointerProperty(type=SerialConnectionProperties)
+    bpy.types.Scene.calibration_channels = CollectionProperty(type=CalibrationChannelProperties)
     bpy.types.Scene.custom_object_collection = CollectionProperty(type=DynamicObjectProperties)
     bpy.types.Scene.received_text
     bpy.types.Scene.my_ui_tabs = bpy.props.PointerProperty(type=MyUIPanelTabs)
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+
+# Fan-out of decoded samples to any number of consumers.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# The reader publishes every conditioned frame once. The hub only keeps the
+# newest sample; consumers never take items away from each other:
+#
+#     subscription = serial_thread.hub.subscribe(rate=30.0)
+#     sample = subscription.latest()          # pull: None when nothing new (or too soon)
+#
+#     serial_thread.hub.subscribe(callback=on_sample, rate=100.0)   # push
+#
+# sample.values is a read-only NumPy view shared by all subscribers, no copy is
+# made per subscriber. Callbacks run on the publishing thread (the serial
+# thread in-process), so they must be quick and must not touch bpy data. In
+# process mode the values are copies taken from the shared sample ring
+# (SampleRing.latest() and unread()), so they can be kept like in-process ones.
+
+Sample = namedtuple("Sample", "sequence timestamp values text")
+
+
+def read_only(values):
+    values = np.asarray(values, dtype=np.float64) if isinstance(values, list) else values
+    if values.flags.writeable:
+        # A view, so the producer's array itself is not affected.
+        values = values.view()
+        values.flags.writeable = False
+    return values
+
+
+class Subscription:
+
+    def __init__(self, hub, callback, rate, name):
+        self.hub = hub
+        self.callback = callback
+        self.name = name
+        self.min_interval = 1.0 / rate if rate > 0 else 0.0
+        self.last_sequence = 0
+        self.last_delivery = float("-inf")
+        self.delivered = 0
+        self.error = None
+
+    def due(self, now):
+        return now - self.last_delivery >= self.min_interval
+
+    def deliver(self, sample, now):
+        self.last_sequence = sample.sequence
+        self.last_delivery = now
+        self.delivered += 1
+
+    def latest(self):
+        # Pull mode: the newest sample not seen yet, or None.
+        sample = self.hub.latest_sample
+        if sample is None or sample.sequence == self.last_sequence:
+            return None
+        now = time.perf_counter()
+        if not self.due(now):
+            return None
+        self.deliver(sample, now)
+        return sample
+
+    def cancel(self):
+        self.hub.unsubscribe(self)
+
+
+class SampleHub:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks = ()
+        self.subscriptions = ()
+        self.latest_sample = None
+        self.sequence = 0
+
+    def subscribe(self, callback=None, rate=0.0, name=""):
+        """Register a consumer. With a callback samples are pushed to it, at most rate times per second (0 = every sample)."""
+        subscription = Subscription(self, callback, rate, name)
+        with self._lock:
+            # Copy-on-write tuples: publish() iterates without taking the lock.
+            self.subscriptions += (subscription,)
+            if callback is not None:
+                self._callbacks += (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self.subscriptions = tuple(s for s in self.subscriptions if s is not subscription)
+            self._callbacks = tuple(s for s in self._callbacks if s is not subscription)
+
+    def publish(self, values, text=""):
+        now = time.perf_counter()
+        self.sequence += 1
+        sample = Sample(self.sequence, now, read_only(values), text)
+        self.latest_sample = sample
+
+        for subscription in self._callbacks:
+            if not subscription.due(now):
+                continue
+            subscription.deliver(sample, now)
+            try:
+                subscription.callback(sample)
+            except Exception as error:
+                # A failing consumer must not stop the reader.
+                subscription.error = error
+
+    def clear(self):
+        self.latest_sample = None
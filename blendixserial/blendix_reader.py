@@ -0,0 +1,180 @@
+from .blendix_codecs import get_codec
+from .blendix_framing import (
+    FrameError,
+    BinaryFrameSplitter,
+    FRAME_DATA,
+    FRAME_ACK,
+    FRAME_ECHO,
+    CONTROL_PREFIX,
+    parse_ack_line,
+    parse_echo_line,
+    decode_echo_payload,
+    unwrap_csv_frame,
+    decode_binary_values,
+)
+
+# Receive side of the link: splits the bytes read from the port into frames,
+# handles the control messages and decodes the data frames with the codec.
+# This module must not import bpy: the serial thread and the worker process
+# (blendix_worker) share it.
+#
+# The owner passes three callbacks:
+#     publish(values, text)                  a decoded data frame
+#     handle_ack(credits, lost)              a flow control ack, lost may be None
+#     handle_echo(probe_id, host_us, device_us)
+#                                            a latency probe echo, device_us may be None
+# and optionally debug(kind, message) with kind 'raw', 'frame', 'invalid' or
+# 'thread'; the serial thread prints these depending on the scene's debug flags.
+
+
+class FrameReader:
+
+    def __init__(self, stats, publish, handle_ack, handle_echo, debug=None):
+        self.stats = stats
+        self.publish = publish
+        self.handle_ack = handle_ack
+        self.handle_echo = handle_echo
+        self.debug = debug
+        self.max_line_length = 65536
+        self.buffer = bytearray()
+        self.binary_splitter = BinaryFrameSplitter(stats)
+        self.codec = get_codec('CSV')
+        self.stream_splitter = None
+        self.use_sequence = False
+        self.use_crc = False
+
+    def configure(self, frame_format, use_sequence, use_crc):
+        # frame_format names the codec (see blendix_codecs).
+        codec = get_codec(frame_format)
+        if codec is not self.codec:
+            self.stream_splitter = codec.splitter(self.stats) if codec.framing == 'STREAM' else None
+            self.codec = codec
+        self.use_sequence = use_sequence
+        self.use_crc = use_crc
+        self.binary_splitter.check_crc = use_crc
+
+    def reset(self):
+        # Drop partial frames, after (re)connecting.
+        self.buffer.clear()
+        self.binary_splitter.reset()
+        if self.stream_splitter is not None:
+            self.stream_splitter.reset()
+
+    def read(self, connection, data_frames=True, block=True):
+        # Reads everything the driver has buffered in one call, waiting at most
+        # the read timeout for the first byte (without block, not at all).
+        # Without data_frames ('send' mode) only the control messages are handled.
+        waiting = connection.in_waiting
+        if not (waiting or block):
+            return
+        chunk = connection.read(waiting or 1)
+        if chunk:
+            self.feed(chunk, data_frames)
+
+    def feed(self, chunk, data_frames=True):
+        # The codec is read once per chunk, a switch applies from the next one.
+        codec = self.codec
+        if codec.framing == 'BINARY':
+            self.feed_binary(chunk, codec.decode, data_frames)
+        elif codec.framing == 'STREAM':
+            self.feed_stream(chunk, codec.decode, data_frames)
+        else:
+            self.feed_lines(chunk, codec.decode, data_frames)
+
+    def feed_binary(self, chunk, decode, data_frames):
+        stats = self.stats
+        for frame_type, sequence, payload in self.binary_splitter.feed(chunk):
+            if frame_type == FRAME_ACK:
+                values = decode_binary_values(payload)
+                self.handle_ack(sequence, int(values[0]) if len(values) else None)
+                continue
+            if frame_type == FRAME_ECHO:
+                try:
+                    self.handle_echo(*decode_echo_payload(payload))
+                except FrameError:
+                    stats.frames_corrupt += 1
+                continue
+            if frame_type != FRAME_DATA or not data_frames:
+                continue
+            try:
+                values, text = decode(payload)
+            except ValueError:
+                stats.frames_corrupt += 1
+                continue
+            if self.use_sequence:
+                stats.check_sequence(sequence)
+            stats.frames_ok += 1
+            self.publish(values, text)
+
+    def feed_stream(self, chunk, decode, data_frames):
+        splitter = self.stream_splitter
+        if splitter is None:
+            return
+        stats = self.stats
+        for frame in splitter.feed(chunk):
+            if not data_frames:
+                continue
+            try:
+                values, text = decode(frame)
+            except ValueError as error:
+                stats.frames_corrupt += 1
+                if self.debug is not None:
+                    self.debug('invalid', f"Frame dropped ({error}): {frame}")
+                continue
+            stats.frames_ok += 1
+            self.publish(values, text)
+
+    def feed_lines(self, chunk, decode, data_frames):
+        self.buffer += chunk
+        if b'\n' not in chunk:
+            if len(self.buffer) > self.max_line_length:
+                if self.debug is not None:
+                    self.debug('thread', "Line too long, receive buffer discarded")
+                self.buffer.clear()
+            return
+
+        *lines, rest = self.buffer.split(b'\n')
+        self.buffer = bytearray(rest)
+        stats = self.stats
+        debug = self.debug
+        unwrap = self.use_sequence or self.use_crc
+        for line in lines:
+            line = line.decode(errors='replace').rstrip()
+            if debug is not None:
+                debug('raw', f"Initial data received: {line}")
+            if not line:
+                continue
+            if line.startswith(CONTROL_PREFIX):
+                self.handle_control_line(line)
+                continue
+            if not data_frames:
+                continue
+
+            try:
+                if unwrap:
+                    sequence, line = unwrap_csv_frame(line, self.use_sequence, self.use_crc)
+                    if sequence is not None:
+                        stats.check_sequence(sequence)
+                values, text = decode(line)
+            except (FrameError, ValueError) as error:
+                stats.frames_corrupt += 1
+                if debug is not None:
+                    debug('invalid', f"Frame dropped ({error}): {line}")
+                continue
+            if debug is not None:
+                debug('frame', f"Valid data {line}")
+            stats.frames_ok += 1
+            self.publish(values, text)
+
+    def handle_control_line(self, line):
+        kind = line[1:2]
+        try:
+            if kind == 'A':
+                self.handle_ack(*parse_ack_line(line))
+            elif kind == 'E':
+                self.handle_echo(*parse_echo_line(line))
+            elif self.debug is not None:
+                self.debug('thread', f"Unknown control line: {line}")
+        except FrameError as error:
+            if self.debug is not None:
+                self.debug('invalid', f"Control line dropped ({error})")
@@ -0,0 +1,124 @@
+from .blendix_stream import RateMeter
+
+# Multi-rate scheduling of send bindings.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# Every send binding has a target rate (0 = every tick) and a priority. On each
+# tick the scheduler takes the bindings that are due, highest priority first and
+# the most overdue first within a priority, and puts as many of them into one
+# partial frame (see blendix_framing) as the link can carry at its baud rate.
+# Bindings that do not fit stay due and go out on a following tick.
+
+# Share of the nominal link bandwidth the scheduler plans with, so the queue
+# drains between ticks despite framing overhead and timing jitter.
+LINK_UTILISATION = 0.9
+# Bytes charged per partial frame for the header, separators, sequence number and CRC.
+FRAME_OVERHEAD = 12
+
+
+class ScheduledBinding:
+
+    def __init__(self, start, width, rate, priority):
+        self.start = start
+        self.width = width
+        self.rate = rate
+        self.priority = priority
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_due = 0.0
+        self.sent = 0
+        self.deferred = 0
+        self.rate_meter = RateMeter()
+
+    def mark_sent(self, now):
+        self.sent += 1
+        self.rate_meter.tick(now)
+        self.next_due += self.interval
+        if self.next_due <= now:
+            # Late by more than one interval: restart the phase instead of bursting to catch up.
+            self.next_due = now + self.interval
+
+
+class SendScheduler:
+
+    def __init__(self):
+        self.layout = None
+        self.bindings = []
+        self.last_tick = None
+        self.available = 0.0
+
+    def configure(self, layout):
+        # layout: one (first channel, width, rate, priority) per binding, width 0 = not sent.
+        # Statistics are kept for bindings that are still at the same position.
+        if layout == self.layout:
+            return
+        previous = self.bindings
+        self.layout = layout
+        self.bindings = []
+        for index, (start, width, rate, priority) in enumerate(layout):
+            binding = ScheduledBinding(start, width, rate, priority)
+            if index < len(previous):
+                old = previous[index]
+                binding.sent, binding.deferred, binding.rate_meter = old.sent, old.deferred, old.rate_meter
+            self.bindings.append(binding)
+
+    def reset(self):
+        self.last_tick = None
+        self.available = 0.0
+        for binding in self.bindings:
+            binding.next_due = 0.0
+            binding.sent = 0
+            binding.deferred = 0
+            binding.rate_meter.reset()
+
+    def due(self, now):
+        due = [binding for binding in self.bindings if binding.width and binding.next_due <= now]
+        due.sort(key=lambda binding: (-binding.priority, binding.next_due))
+        return due
+
+    def refill(self, now, bytes_per_second, tick_interval):
+        # Token bucket of link bytes, holding at most a few ticks' worth. Going
+        # negative (an oversized first piece) delays the following ticks.
+        elapsed = tick_interval if self.last_tick is None else now - self.last_tick
+        self.last_tick = now
+        capacity = bytes_per_second * LINK_UTILISATION * 4 * tick_interval
+        self.available = min(self.available + bytes_per_second * LINK_UTILISATION * elapsed, capacity)
+
+    def select(self, now, encode):
+        # encode(binding) -> the binding's piece of the partial frame. The first
+        # due binding goes out whenever bytes are available, even if it is larger;
+        # smaller lower-priority pieces may fill what is left.
+        pieces = []
+        used = 0
+        budget = self.available
+        for binding in self.due(now):
+            if budget <= 0:
+                binding.deferred += 1
+                continue
+            piece = encode(binding)
+            if pieces and used + len(piece) > budget:
+                binding.deferred += 1
+                continue
+            pieces.append(piece)
+            used += len(piece)
+            binding.mark_sent(now)
+        if pieces:
+            self.available -= used + FRAME_OVERHEAD
+        return pieces
+
+    def next_interval(self, now, tick_interval):
+        # Sleep until the next binding is due, but never longer than 0.1 s so
+        # configuration changes are picked up.
+        pending = [binding.next_due for binding in self.bindings if binding.width]
+        if not pending:
+            return 0.1
+        return min(max(min(pending) - now, tick_interval), 0.1)
+
+    def binding_summary(self, index):
+        if index >= len(self.bindings) or not self.bindings[index].width:
+            return None
+        binding = self.bindings[index]
+        target = f"{binding.rate:g} Hz" if binding.rate > 0 else "every tick"
+        text = f"{binding.rate_meter.rate()} Hz of {target}"
+        if binding.deferred:
+            text += f" | Deferred {binding.deferred}"
+        return text
@@ -0,0 +1,235 @@
+import bpy
+import blf
+import gpu
+import numpy as np
+from gpu_extras.batch import batch_for_shader
+from .blendix_connection import serial_thread
+from .blendix_bindings import tag_view3d_redraw
+from .blendix_history import ChannelHistory, decimate_trace, parse_channel_list
+
+# Live channel scope drawn over the 3D View.
+#
+# A hub subscriber appends every received frame to a ChannelHistory (fixed
+# memory, see blendix_history). The overlay draws one LINE_STRIP batch per
+# channel with the gpu module. The trace (the history scaled to the value
+# range) is computed once per history change and shared by all 3D views; each
+# view keeps its own batches, sized to its region, and reuses them until new
+# samples arrived or the region changed. A GPU batch cannot be extended, so new
+# samples mean every channel's strip is uploaded again. That is what a scrolling
+# trace needs anyway: every x moves with each sample, and with Auto Range every y
+# too. A strip has at most two points per pixel column of the scope (see
+# decimate_trace), so an upload is bounded by the region width, not the history
+# length. Redraws are requested at most at the scene's display rate.
+
+SCOPE_COLORS = (
+    (0.95, 0.35, 0.35, 1.0),
+    (0.40, 0.85, 0.40, 1.0),
+    (0.40, 0.60, 1.00, 1.0),
+    (0.95, 0.85, 0.30, 1.0),
+    (0.85, 0.45, 0.95, 1.0),
+    (0.35, 0.90, 0.90, 1.0),
+    (1.00, 0.60, 0.25, 1.0),
+    (0.80, 0.80, 0.80, 1.0),
+)
+SCOPE_BACKGROUND = (0.0, 0.0, 0.0, 0.45)
+
+
+class ScopeView:
+    # Batches and layout of the scope in one 3D view region.
+
+    def __init__(self):
+        self.key = None
+        self.frame = (0, 0, 0, 0)
+        self.background = None
+        self.batches = []
+
+
+class ChannelScope:
+
+    def __init__(self):
+        self.history = ChannelHistory()
+        self.subscription = None
+        self.spec = None
+        self.error = None
+        self.trace_key = None
+        self.trace_x = None
+        self.trace_y = None
+        self.labels = []
+        self.range = (0.0, 1.0)
+        # ScopeView per region, by region.as_pointer().
+        self.views = {}
+        self.tagged_version = 0
+
+    def configure(self, scene):
+        spec = (scene.scope_channels, scene.scope_samples)
+        if spec == self.spec:
+            return
+        self.spec = spec
+        try:
+            channels = parse_channel_list(scene.scope_channels)
+            self.error = None if channels else "No channels"
+        except ValueError as error:
+            channels = []
+            self.error = f"Invalid channels: {error}"
+        self.history.configure(channels, scene.scope_samples)
+        self.trace_key = None
+
+    def enable(self, scene):
+        self.configure(scene)
+        if self.subscription is None:
+            self.subscription = serial_thread.hub.subscribe(callback=self.history.append_sample, name="scope")
+
+    def disable(self):
+        if self.subscription is not None:
+            self.subscription.cancel()
+            self.subscription = None
+        self.views.clear()
+        self.trace_key = None
+        self.trace_x = self.trace_y = None
+
+    def prune_views(self, regions):
+        # Forget the batches of closed views.
+        for pointer in [pointer for pointer in self.views if pointer not in regions]:
+            del self.views[pointer]
+
+    def value_range(self, scene, values):
+        low, high = scene.scope_min, scene.scope_max
+        if scene.scope_auto_range and len(values) and not np.isnan(values).all():
+            low, high = float(np.nanmin(values)), float(np.nanmax(values))
+        if high - low < 1e-9:
+            low, high = low - 0.5, high + 0.5
+        return low, high
+
+    def update_trace(self, scene):
+        # History -> x and y in 0..1 of the scope frame, once per change for all views.
+        key = (self.history.version, scene.scope_auto_range, scene.scope_min, scene.scope_max)
+        if key == self.trace_key:
+            return
+        self.trace_key = key
+        values, count = self.history.snapshot()
+        low, high = self.value_range(scene, values)
+        self.range = (low, high)
+        self.labels = []
+        if count < 2:
+            self.trace_x = self.trace_y = None
+            return
+        # The newest sample is on the right edge, the history fills in from there.
+        length = self.history.length
+        self.trace_x = np.arange(length - count, length, dtype=np.float32) / (length - 1)
+        # fmax/fmin clip to 0..1 and put missing (NaN) samples on the bottom edge.
+        self.trace_y = np.fmin(np.fmax((values - low) / (high - low), 0.0), 1.0)
+        self.labels = [f"{channel}: {values[-1, column]:.4g}" for column, channel in enumerate(self.history.channels.tolist())]
+
+    def rebuild(self, view, scene, region, shader, scale):
+        x0 = 60.0 * scale
+        y0 = 20.0 * scale
+        width = max(region.width * 0.4, 100.0 * scale)
+        height = scene.scope_height * scale
+        view.frame = (x0, y0, width, height)
+        view.background = batch_for_shader(shader, 'TRIS', {
+            "pos": ((x0, y0), (x0 + width, y0), (x0 + width, y0 + height), (x0, y0 + height)),
+        }, indices=((0, 1, 2), (2, 3, 0)))
+
+        view.batches = []
+        if self.trace_y is None:
+            return
+        trace_x, trace_y = decimate_trace(self.trace_x, self.trace_y, max(2, int(width)))
+        coords = np.empty((len(trace_x), 2), dtype=np.float32)
+        coords[:, 0] = x0 + width * trace_x
+        for column in range(trace_y.shape[1]):
+            coords[:, 1] = y0 + height * trace_y[:, column]
+            view.batches.append(batch_for_shader(shader, 'LINE_STRIP', {"pos": coords}))
+
+    def draw(self):
+        context = bpy.context
+        scene = context.scene
+        region = context.region
+        if scene is None or region is None or not scene.show_channel_scope or self.subscription is None:
+            return
+
+        shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+        scale = context.preferences.system.ui_scale
+        self.update_trace(scene)
+        view = self.views.get(region.as_pointer())
+        if view is None:
+            view = self.views[region.as_pointer()] = ScopeView()
+        key = (self.trace_key, region.width, region.height, scene.scope_height, scale)
+        if key != view.key:
+            self.rebuild(view, scene, region, shader, scale)
+            view.key = key
+
+        gpu.state.blend_set('ALPHA')
+        shader.uniform_float("color", SCOPE_BACKGROUND)
+        view.background.draw(shader)
+        for index, batch in enumerate(view.batches):
+            shader.uniform_float("color", SCOPE_COLORS[index % len(SCOPE_COLORS)])
+            batch.draw(shader)
+        gpu.state.blend_set('NONE')
+
+        x0, y0, width, height = view.frame
+        font_id = 0
+        blf.size(font_id, 11 * scale)
+        line = 14 * scale
+        low, high = self.range
+        blf.color(font_id, 0.8, 0.8, 0.8, 1.0)
+        blf.position(font_id, x0 + 4 * scale, y0 + height - line, 0)
+        blf.draw(font_id, self.error or f"{high:.4g}")
+        blf.position(font_id, x0 + 4 * scale, y0 + 4 * scale, 0)
+        blf.draw(font_id, f"{low:.4g}")
+        for index, label in enumerate(self.labels):
+            blf.color(font_id, *SCOPE_COLORS[index % len(SCOPE_COLORS)])
+            blf.position(font_id, x0 + width + 6 * scale, y0 + height - line * (index + 1), 0)
+            blf.draw(font_id, label)
+
+
+def view3d_regions():
+    # Pointers of the window regions of every open 3D View.
+    return {
+        region.as_pointer()
+        for window in bpy.context.window_manager.windows
+        for area in window.screen.areas if area.type == 'VIEW_3D'
+        for region in area.regions if region.type == 'WINDOW'
+    }
+
+
+channel_scope = ChannelScope()
+
+
+def scope_timer():
+    # Follows show_channel_scope (also after loading a file) and asks the 3D views
+    # to redraw when new samples arrived.
+    scene = bpy.context.scene
+    if scene is None:
+        return 0.25
+    if not scene.show_channel_scope:
+        if channel_scope.subscription is not None:
+            channel_scope.disable()
+            tag_view3d_redraw()
+        return 0.25
+    channel_scope.enable(scene)
+    if channel_scope.views:
+        channel_scope.prune_views(view3d_regions())
+    version = channel_scope.history.version
+    if version != channel_scope.tagged_version:
+        channel_scope.tagged_version = version
+        tag_view3d_redraw()
+    return 1.0 / scene.display_rate
+
+
+scope_draw_handler = None
+
+
+def register():
+    global scope_draw_handler
+    scope_draw_handler = bpy.types.SpaceView3D.draw_handler_add(channel_scope.draw, (), 'WINDOW', 'POST_PIXEL')
+    bpy.app.timers.register(scope_timer, persistent=True)
+
+
+def unregister():
+    global scope_draw_handler
+    if bpy.app.timers.is_registered(scope_timer):
+        bpy.app.timers.unregister(scope_timer)
+    if scope_draw_handler is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(scope_draw_handler, 'WINDOW')
+        scope_draw_handler = None
+    channel_scope.disable()
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Outgoing message queue for the serial thread.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# - Bounded: when full, the oldest pending message is dropped.
+# - Latest-wins: a new message on a stream replaces the one still waiting.
+# - Deadlines: messages not written before their deadline are dropped as stale.
+# - Credits (optional): each write consumes one credit, acknowledgements from
+#   the device grant new ones. When out of credits the queue stalls instead of
+#   flooding a device that cannot keep up.
+
+# How long a serial loop that also reads waits for a message. The wait ends as
+# soon as a message is queued, received bytes wait at most this long.
+READ_POLL = 0.001
+
+
+class SendQueue:
+
+    def __init__(self, maxsize=8, deadline=0.1):
+        self._condition = threading.Condition()
+        self._items = OrderedDict()
+        self.maxsize = maxsize
+        self.deadline = deadline
+        self.use_credits = False
+        self.initial_credits = 4
+        self.max_credits = 64
+        self.credits = 0
+        self._stalled = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.dropped_stale = 0
+        self.dropped_overflow = 0
+        self.replaced = 0
+        self.stalls = 0
+
+    def configure(self, maxsize, deadline, use_credits, initial_credits):
+        with self._condition:
+            self.maxsize = max(1, maxsize)
+            self.deadline = deadline
+            self.use_credits = use_credits
+            self.initial_credits = initial_credits
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.dropped_overflow += 1
+
+    def clear(self):
+        with self._condition:
+            self._items.clear()
+            self.credits = self.initial_credits
+            self._stalled = False
+
+    def put(self, data, stream="frame", deadline=None):
+        if deadline is None:
+            deadline = self.deadline
+        expires = time.monotonic() + deadline if deadline > 0 else None
+
+        with self._condition:
+            if stream in self._items:
+                del self._items[stream]
+                self.replaced += 1
+            elif len(self._items) >= self.maxsize:
+                self._items.popitem(last=False)
+                self.dropped_overflow += 1
+            self._items[stream] = (expires, data)
+            self._condition.notify()
+
+    def get(self, timeout=0.0):
+        # Returns the next message that is still within its deadline, or None.
+        # Waits up to timeout for a message to arrive, or while out of credits for
+        # an acknowledgement, but not past the deadline of the waiting message.
+        end = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._drop_stale(now)
+                if self._items:
+                    if not (self.use_credits and self.credits <= 0):
+                        _, (_, data) = self._items.popitem(last=False)
+                        if self.use_credits:
+                            self.credits -= 1
+                        return data
+                    if not self._stalled:
+                        self._stalled = True
+                        self.stalls += 1
+
+                remaining = end - now
+                if remaining <= 0:
+                    return None
+                expiries = [expires for expires, _ in self._items.values() if expires is not None]
+                if expiries:
+                    remaining = min(remaining, min(expiries) - now)
+                self._condition.wait(max(remaining, 0.0))
+
+    def _drop_stale(self, now):
+        for stream in [stream for stream, (expires, _) in self._items.items() if expires is not None and expires <= now]:
+            del self._items[stream]
+            self.dropped_stale += 1
+
+    def grant(self, credits):
+        with self._condition:
+            self.credits = min(self.credits + credits, self.max_credits)
+            self._stalled = False
+            self._condition.notify()
+
+    def empty(self):
+        return not self._items
+
+    def qsize(self):
+        return len(self._items)
+
+    def summary(self):
+        text = f"Dropped {self.dropped_stale + self.dropped_overflow} | Replaced {self.replaced}"
+        if self.use_credits:
+            text += f" | Credits {self.credits} | Stalls {self.stalls}"
+        return text
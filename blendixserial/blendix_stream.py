@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import deque
+
+# Pacing thread for oversampled streaming.
+# This module must not import bpy so it can also be used outside Blender.
+#
+# The main thread hands over one block of pre-encoded setpoints per timeline
+# frame together with the wall-clock time of its first sample. The pacer emits
+# them at their scheduled times. A new block replaces whatever is left of the
+# previous one, which keeps the output in lockstep with the timeline clock even
+# when playback drops or repeats frames.
+
+
+class RateMeter:
+    """Events per second over a sliding one-second window."""
+
+    def __init__(self):
+        self._events = deque()
+
+    def tick(self, now=None):
+        if now is None:
+            now = time.perf_counter()
+        self._events.append(now)
+        self.prune(now)
+
+    def prune(self, now):
+        events = self._events
+        while events and events[0] < now - 1.0:
+            events.popleft()
+
+    def rate(self):
+        self.prune(time.perf_counter())
+        return len(self._events)
+
+    def reset(self):
+        self._events.clear()
+
+
+class StreamPacer:
+
+    def __init__(self, sink):
+        self.sink = sink
+        self._condition = threading.Condition()
+        self._schedule = deque()
+        self._thread = None
+        self.running = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.samples_sent = 0
+        self.jitter_sum = 0.0
+        self.jitter_max = 0.0
+        self.rate_meter = RateMeter()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        with self._condition:
+            self._schedule.clear()
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def schedule_block(self, start_time, interval, payloads):
+        with self._condition:
+            self._schedule.clear()
+            for k, payload in enumerate(payloads):
+                self._schedule.append((start_time + k * interval, payload))
+            self._condition.notify()
+
+    def run(self):
+        while self.running:
+            with self._condition:
+                if not self._schedule:
+                    self._condition.wait(0.1)
+                    continue
+                due, payload = self._schedule[0]
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    # Woken early by a new block: re-read the schedule.
+                    self._condition.wait(delay)
+                    continue
+                self._schedule.popleft()
+
+            now = time.perf_counter()
+            self.sink(payload)
+            self.record(now, now - due)
+
+    def record(self, now, jitter):
+        self.samples_sent += 1
+        self.jitter_sum += jitter
+        self.jitter_max = max(self.jitter_max, jitter)
+        self.rate_meter.tick(now)
+
+    def summary(self):
+        if not self.samples_sent:
+            return "Stream idle"
+        mean_ms = self.jitter_sum / self.samples_sent * 1000.0
+        return f"{self.rate_meter.rate()} Hz | Jitter avg {mean_ms:.2f} ms, max {self.jitter_max * 1000.0:.2f} ms"
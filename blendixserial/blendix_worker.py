@@ -0,0 +1,345 @@
+import json
+import os
+import struct
+import subprocess
+import sys
+import time
+import serial
+from .blendix_ipc import (
+    SampleRing,
+    CommandRing,
+    LINK_CONNECTED,
+    LINK_RECONNECTING,
+    LINK_LOST,
+)
+from .blendix_send_queue import SendQueue, READ_POLL
+from .blendix_filters import build_filter_bank
+from .blendix_calibration import Calibrator
+from .blendix_latency import LatencyProbe
+from .blendix_reader import FrameReader
+from .blendix_ports import port_serial_number, resolve_port
+from .blendix_framing import (
+    LinkStats,
+    SEQUENCE_MODULO,
+    encode_ping,
+    wrap_csv_frame,
+    wrap_binary_frame,
+)
+
+# Out-of-process serial I/O.
+# This module must not import bpy: it is imported by the add-on to launch the
+# worker (WorkerProcess) and, in the worker process, runs the I/O loop (IOWorker).
+#
+# The worker owns the port, does all reading, framing, decoding and writing,
+# and publishes decoded samples to a SampleRing. Blender only reads the latest
+# sample per tick and sends commands through a CommandRing:
+#     b'C' + JSON                                   settings
+#     b'S' + u8 len + stream + CSV payload          text frame to send
+#     b'B' + u8 len + stream + type u8 + count u16 + payload
+#                                                   binary frame to send
+#     b'R' + u8 len + stream + bytes                stream codec frame, written as is
+#     b'P'                                          write a latency probe ping
+#     b'Q'                                          quit
+
+BINARY_COMMAND = struct.Struct('<BH')
+
+# The worker is started with the add-on folder as a namespace package so the
+# bpy-free modules import without running the add-on's __init__.
+BOOTSTRAP = (
+    "import sys, types, importlib\n"
+    "package = types.ModuleType('blendix_io')\n"
+    "package.__path__ = [sys.argv[1]]\n"
+    "sys.modules['blendix_io'] = package\n"
+    "importlib.import_module('blendix_io.blendix_worker').main(sys.argv[2:])\n"
+)
+
+
+def encode_send_command(data, stream):
+    stream = stream.encode()
+    if isinstance(data, tuple):
+        frame_type, count, payload = data
+        return b'B' + bytes((len(stream),)) + stream + BINARY_COMMAND.pack(frame_type, count) + payload
+    if isinstance(data, bytes):
+        return b'R' + bytes((len(stream),)) + stream + data
+    return b'S' + bytes((len(stream),)) + stream + data.encode()
+
+
+def decode_send_command(record):
+    length = record[1]
+    stream = record[2:2 + length].decode()
+    body = record[2 + length:]
+    if record[:1] == b'B':
+        frame_type, count = BINARY_COMMAND.unpack_from(body)
+        return (frame_type, count, bytes(body[BINARY_COMMAND.size:])), stream
+    if record[:1] == b'R':
+        return bytes(body), stream
+    return body.decode(), stream
+
+
+class IOWorker:
+    """The serial loop that runs in the worker process."""
+
+    def __init__(self, settings, samples, commands):
+        self.samples = samples
+        self.commands = commands
+        self.connection = None
+        # Followed by its serial number on reconnects, like SerialConnection.reconnect().
+        self.port = settings["port"]
+        self.serial_number = None
+        self.link_stats = LinkStats()
+        self.send_queue = SendQueue()
+        self.reader = FrameReader(self.link_stats, self.publish, self.handle_ack, self.handle_echo)
+        self.tx_sequence = 0
+        self.outages = 0
+        self.running = True
+        self.parent = os.getppid()
+        self.filter_spec = None
+        self.filter_bank = None
+        self.calibrator = Calibrator()
+        self.probe = LatencyProbe()
+        self.ping_requested = False
+        self.configure(settings)
+        self.send_queue.clear()
+
+    def configure(self, settings):
+        self.settings = settings
+        self.mode = settings["mode"]
+        self.frame_format = settings["frame_format"]
+        self.use_sequence = settings["use_sequence"]
+        self.use_crc = settings["use_crc"]
+        self.reader.configure(self.frame_format, self.use_sequence, self.use_crc)
+        self.calibrator.configure(settings["calibration"])
+        if settings["capture"] and not self.calibrator.capturing:
+            self.calibrator.start_capture()
+            self.samples.clear_capture()
+        elif self.calibrator.capturing and not settings["capture"]:
+            self.calibrator.stop_capture()
+        if settings["filters"] != self.filter_spec:
+            self.filter_spec = settings["filters"]
+            self.filter_bank = build_filter_bank(self.filter_spec)
+        self.send_queue.configure(
+            settings["send_queue_size"], settings["send_deadline"], settings["use_flow_control"], settings["initial_credits"]
+        )
+
+    def open(self):
+        settings = self.settings
+        try:
+            self.connection = serial.Serial(
+                self.port,
+                settings["baud_rate"],
+                timeout=settings["read_timeout"],
+                write_timeout=settings["write_timeout"] or None,
+                inter_byte_timeout=settings["inter_byte_timeout"] or None,
+            )
+        except (serial.SerialException, OSError):
+            self.connection = None
+            return False
+        if settings["low_latency"] and hasattr(self.connection, "set_low_latency_mode"):
+            try:
+                self.connection.set_low_latency_mode(True)
+            except (ValueError, OSError):
+                pass
+        return True
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except (serial.SerialException, OSError):
+                pass
+            self.connection = None
+
+    def handle_commands(self):
+        while True:
+            record = self.commands.get()
+            if record is None:
+                return
+            kind = record[:1]
+            if kind == b'Q':
+                self.running = False
+                return
+            if kind == b'C':
+                self.configure(json.loads(record[1:]))
+            elif kind == b'P':
+                self.ping_requested = True
+            else:
+                data, stream = decode_send_command(record)
+                self.send_queue.put(data, stream)
+
+    def publish_counters(self):
+        stats, queue = self.link_stats, self.send_queue
+        self.samples.publish_counters((
+            stats.frames_ok, stats.frames_corrupt, stats.frames_lost, stats.frames_sent, stats.remote_lost or 0,
+            queue.dropped_stale, queue.dropped_overflow, queue.replaced, queue.stalls, self.outages,
+            max(queue.credits, 0), self.probe.sent, self.probe.lost,
+        ))
+        # The worker reads and publishes on the same thread, the capture can be used as is.
+        capture = self.calibrator.capture
+        if self.calibrator.capturing and capture.minimum is not None:
+            self.samples.publish_capture(capture.minimum, capture.maximum, capture.count)
+
+    def publish(self, values, text=""):
+        values = self.calibrator.apply(values)
+        if self.filter_bank is not None:
+            values = self.filter_bank.apply(values, time.perf_counter())
+        self.samples.write(values, text.encode())
+
+    def handle_ack(self, credits, lost):
+        self.send_queue.grant(credits)
+        if lost is not None:
+            self.link_stats.remote_lost = lost
+
+    def handle_echo(self, probe_id, host_us, device_us):
+        sample = self.probe.echo(probe_id, host_us, device_us)
+        if sample is not None:
+            self.samples.publish_probe(sample)
+
+    def write_ping(self):
+        # Timestamped right before the write so queueing in Blender is not measured.
+        self.ping_requested = False
+        self.connection.write(encode_ping(*self.probe.ping(), self.reader.codec.framing))
+
+    def write(self, data):
+        if isinstance(data, tuple):
+            frame_type, count, payload = data
+            frame = wrap_binary_frame(frame_type, count, payload, self.tx_sequence)
+        elif isinstance(data, bytes):
+            frame = data
+        else:
+            frame = f"{wrap_csv_frame(data, self.tx_sequence, self.use_sequence, self.use_crc)}\n".encode()
+        self.connection.write(frame)
+        self.tx_sequence = (self.tx_sequence + 1) % SEQUENCE_MODULO
+        self.link_stats.frames_sent += 1
+
+    def reconnect(self):
+        # Same backoff as the in-process supervisor, while still answering commands.
+        self.outages += 1
+        self.samples.set_link_state(LINK_RECONNECTING)
+        delay = 0.02
+        while self.running and os.getppid() == self.parent:
+            self.close()
+            port = resolve_port(self.port, self.serial_number)
+            if port is not None:
+                self.port = port
+            if port is not None and self.open():
+                self.reader.reset()
+                self.samples.set_link_state(LINK_CONNECTED)
+                return True
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+            self.handle_commands()
+        return False
+
+    def run(self):
+        if not self.open():
+            self.samples.set_link_state(LINK_LOST)
+            return
+        self.serial_number = port_serial_number(self.port)
+        self.samples.set_link_state(LINK_CONNECTED)
+
+        # Exit with Blender even if it never got to send the quit command.
+        while self.running and os.getppid() == self.parent:
+            self.handle_commands()
+            try:
+                if self.ping_requested:
+                    self.write_ping()
+                # Credit acks are read in every mode while flow control is on, echoes
+                # while a probe is outstanding.
+                reading = self.mode in ['receive', 'both'] or self.send_queue.use_credits or self.probe.waiting()
+                sending = self.mode in ['send', 'both']
+                if reading:
+                    # While sending, only what is already buffered, as in the serial thread.
+                    self.reader.read(self.connection, self.mode != 'send', block=not sending)
+                if sending:
+                    data = self.send_queue.get(timeout=READ_POLL if reading else 0.01)
+                    while data is not None:
+                        self.write(data)
+                        data = self.send_queue.get()
+                elif not reading:
+                    time.sleep(0.01)
+            except (serial.SerialException, OSError):
+                if not (self.settings["auto_reconnect"] and self.reconnect()):
+                    self.samples.set_link_state(LINK_LOST)
+                    break
+            self.publish_counters()
+
+        self.publish_counters()
+        self.close()
+
+
+def main(argv):
+    samples_name, commands_name, settings = argv
+    samples = SampleRing(samples_name)
+    commands = CommandRing(commands_name)
+    try:
+        IOWorker(json.loads(settings), samples, commands).run()
+    finally:
+        samples.close()
+        commands.close()
+
+
+class WorkerProcess:
+    """Launches and talks to the worker process from the add-on side."""
+
+    def __init__(self):
+        self.process = None
+        self.samples = None
+        self.commands = None
+
+    def start(self, settings):
+        if self.is_running():
+            return False
+        self.close_rings()
+        self.samples = SampleRing()
+        self.commands = CommandRing()
+
+        # Pass on the add-on's module search path so pyserial and NumPy resolve
+        # the same way as inside Blender.
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(path for path in sys.path if path)
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-c", BOOTSTRAP, os.path.dirname(os.path.abspath(__file__)),
+                self.samples.name, self.commands.name, json.dumps(settings),
+            ],
+            env=environment,
+        )
+        return True
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def configure(self, settings):
+        if self.is_running():
+            self.commands.put(b'C' + json.dumps(settings).encode())
+
+    def send(self, data, stream="frame"):
+        # Returns False when the command ring is full; the worker's queue already
+        # keeps only the latest message per stream, so the caller just moves on.
+        if not self.is_running():
+            return False
+        return self.commands.put(encode_send_command(data, stream))
+
+    def ping(self):
+        if self.is_running():
+            self.commands.put(b'P')
+
+    def stop(self, timeout=1.0):
+        if self.process is not None:
+            if self.is_running():
+                self.commands.put(b'Q')
+                try:
+                    self.process.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+                    self.process.wait()
+            self.process = None
+        self.close_rings()
+
+    def close_rings(self):
+        if self.samples is not None:
+            self.samples.close()
+            self.samples = None
+        if self.commands is not None:
+            self.commands.close()
+            self.commands = None
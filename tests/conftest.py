@@ -0,0 +1,53 @@
+import importlib.util
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+# The add-on folder is imported as a plain package, so its __init__ (which needs
+# Blender) does not run; bpy-free modules import as they do in the worker process.
+# Outside Blender, modules that only read debug flags from bpy.context.scene get a
+# stand-in whose flags are all off. Anything else that needs Blender is not tested here.
+
+ADDON = Path(__file__).resolve().parent.parent / "blendixserial"
+
+if "blendixserial" not in sys.modules:
+    package = types.ModuleType("blendixserial")
+    package.__path__ = [str(ADDON)]
+    sys.modules["blendixserial"] = package
+
+if importlib.util.find_spec("bpy") is None:
+    class _DebugFlags:
+        def __getattr__(self, name):
+            return False
+
+    bpy = types.ModuleType("bpy")
+    bpy.context = types.SimpleNamespace(scene=_DebugFlags())
+    sys.modules["bpy"] = bpy
+
+
+@pytest.fixture
+def pty_port():
+    """A pseudo terminal: (device end file descriptor, port path for pyserial)."""
+    pty = pytest.importorskip("pty")
+    tty = pytest.importorskip("tty")
+    device, port = pty.openpty()
+    tty.setraw(device)
+    tty.setraw(port)
+    yield device, os.ttyname(port)
+    os.close(device)
+    os.close(port)
+
+
+def read_available(fd, timeout=0.2):
+    """Everything the add-on wrote to the device end within timeout."""
+    import select
+    data = b""
+    while select.select([fd], [], [], timeout)[0]:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        data += chunk
+    return data
@@ -0,0 +1,37 @@
+import sys
+import threading
+
+import numpy as np
+
+from blendixserial.blendix_calibration import Calibrator
+
+
+def test_capture_restart_while_reading():
+    # start_capture() runs on the UI thread while the reader tracks frames.
+    calibrator = Calibrator()
+    calibrator.start_capture()
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        values = np.arange(8, dtype=np.float64)
+        try:
+            while not stop.is_set():
+                calibrator.apply(values)
+        except Exception as error:
+            errors.append(error)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for _ in range(300000):
+            calibrator.start_capture()
+            if errors:
+                break
+    finally:
+        stop.set()
+        thread.join()
+        sys.setswitchinterval(interval)
+    assert not errors
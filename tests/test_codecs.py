@@ -0,0 +1,109 @@
+import zlib
+
+import numpy as np
+import pytest
+
+from blendixserial.blendix_codecs import Codec, StreamCodec, register_codec, unregister_codec, get_codec, codecs
+
+
+class TabCodec(Codec):
+    name = "TEST_TSV"
+    label = "Tab Separated"
+
+    def decode(self, line):
+        return np.array(line.split('\t'), dtype=np.float64), ""
+
+    def encode(self, encoder, values):
+        return "\t".join(f"{value:.2f}" for value in values)
+
+
+def test_complete_codec_registers():
+    register_codec(TabCodec)
+    try:
+        codec = get_codec("TEST_TSV")
+        assert isinstance(codec, TabCodec)
+        assert codec.number is not None
+        assert codec.decode("1\t2.5")[0].tolist() == [1.0, 2.5]
+    finally:
+        unregister_codec("TEST_TSV")
+    assert get_codec("TEST_TSV").name == "CSV"
+
+
+def test_incomplete_codec_fails_at_registration():
+    class NoEncode(Codec):
+        name = "TEST_NO_ENCODE"
+
+        def decode(self, line):
+            return np.zeros(0), ""
+
+    with pytest.raises(TypeError):
+        register_codec(NoEncode)
+    assert "TEST_NO_ENCODE" not in [codec.name for codec in codecs()]
+
+
+def test_stream_codec_needs_a_splitter():
+    class NoSplitter(StreamCodec):
+        name = "TEST_NO_SPLITTER"
+
+        def decode(self, frame):
+            return np.zeros(0), ""
+
+        def encode(self, encoder, values):
+            return b""
+
+    with pytest.raises(TypeError):
+        register_codec(NoSplitter)
+
+
+def test_stream_framing_needs_stream_codec():
+    class LinesAsStream(TabCodec):
+        name = "TEST_LINES_AS_STREAM"
+        framing = 'STREAM'
+
+    with pytest.raises(TypeError):
+        register_codec(LinesAsStream)
+
+
+def test_unknown_framing_is_rejected():
+    class Datagrams(TabCodec):
+        name = "TEST_DATAGRAMS"
+        framing = 'PACKETS'
+
+    with pytest.raises(ValueError):
+        register_codec(Datagrams)
+
+
+def test_builtin_codecs_cannot_be_unregistered():
+    with pytest.raises(ValueError):
+        unregister_codec("CSV")
+
+
+
+def test_rejected_codec_keeps_its_number_unset():
+    class Taken(TabCodec):
+        name = "TEST_TAKEN"
+        # The number TEST_DERIVED derives from its name.
+        number = zlib.crc32(b"TEST_DERIVED") & 0x7FFFFFFF
+
+    class Derived(TabCodec):
+        name = "TEST_DERIVED"
+        number = None
+
+    register_codec(Taken)
+    try:
+        with pytest.raises(ValueError):
+            register_codec(Derived)
+        assert Derived.number is None
+    finally:
+        unregister_codec("TEST_TAKEN")
+    register_codec(Derived)
+    try:
+        assert Derived.number == Taken.number
+    finally:
+        unregister_codec("TEST_DERIVED")
+
+
+def test_fixed_csv_partial_frames_have_no_text_suffix():
+    pieces = ["0=1.00,2.00", "12=0.50"]
+    assert get_codec("CSV").encode_partial(None, pieces) == "@0=1.00,2.00|12=0.50;"
+    assert get_codec("CSV_FIXED").encode_partial(None, pieces) == "@0=1.00,2.00|12=0.50"
@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+
+import pytest
+
+from blendixserial.blendix_send_queue import SendQueue
+from blendixserial.blendix_connection import SerialConnection, SerialThread
+from conftest import read_available
+
+
+def stalled_queue(deadline=1.0):
+    queue = SendQueue(maxsize=8, deadline=deadline)
+    queue.configure(8, deadline, True, 0)
+    queue.clear()
+    queue.put("1;", "frame")
+    return queue
+
+
+def test_stalled_get_waits_for_a_grant():
+    queue = stalled_queue()
+    threading.Timer(0.05, queue.grant, (1,)).start()
+    start = time.monotonic()
+    assert queue.get(timeout=1.0) == "1;"
+    assert 0.03 < time.monotonic() - start < 0.5
+    assert queue.stalls == 1
+
+
+def test_stalled_get_blocks_until_timeout():
+    queue = stalled_queue()
+    start = time.monotonic()
+    assert queue.get(timeout=0.1) is None
+    assert time.monotonic() - start >= 0.09
+    assert queue.qsize() == 1
+
+
+def test_stalled_message_expires_at_its_deadline():
+    queue = stalled_queue(deadline=0.05)
+    assert queue.get(timeout=0.5) is None
+    assert queue.dropped_stale == 1
+
+
+@pytest.mark.parametrize("io_mode", ['THREAD', 'PROCESS'])
+def test_send_mode_reads_acks(pty_port, io_mode):
+    device, port = pty_port
+    connection = SerialConnection(port, 115200)
+    thread = SerialThread(connection)
+    thread.set_mode('send')
+    thread.send_queue.configure(8, 5.0, True, 2)
+    thread.io_mode = io_mode
+    if io_mode == 'PROCESS':
+        assert thread.start_worker_process()
+    else:
+        connection.connect_serial()
+        thread.start_serial_thread()
+    try:
+        for index in range(3):
+            thread.queue_send_data(f"{index};", stream=f"s{index}")
+        assert read_available(device).count(b"\n") == 2
+
+        if io_mode == 'THREAD':
+            # Out of credits: the thread waits in the blocking read instead of spinning.
+            cpu = time.process_time()
+            time.sleep(0.5)
+            assert time.process_time() - cpu < 0.25
+
+        os.write(device, b"!A4\n")
+        assert read_available(device) == b"2;\n"
+        thread.refresh_worker_state()
+        assert thread.send_queue.stalls == 1
+        assert thread.send_queue.credits == 3
+    finally:
+        connection.disconnect(thread)
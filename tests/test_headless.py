@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from blendixserial.blendix_connection import SerialConnection, SerialThread
+
+# The headless bridge against the echo stub, the firmware stand-in. The thread
+# side runs everywhere; the bridge itself needs a Blender binary on the PATH.
+
+ADDON_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "blendixserial")
+ECHO_STUB = os.path.join(ADDON_DIR, "blendix_echo_stub.py")
+
+BRIDGE_SCRIPT = """
+import sys, bpy
+sys.path.insert(0, sys.argv[-2])
+import blendixserial
+blendixserial.register()
+succeeded = bpy.ops.wm.blendix_headless(config=sys.argv[-1])
+from blendixserial.blendix_connection import serial_thread
+print("BRIDGE", succeeded.pop(), serial_thread.link_stats.frames_ok)
+"""
+
+
+@pytest.fixture
+def echo_stub():
+    # Streams 3 channels at 200 Hz and answers pings; yields the device path.
+    stub = subprocess.Popen(
+        [sys.executable, ECHO_STUB, "--format", "csv", "--rate", "200", "--channels", "3"],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        line = stub.stdout.readline()
+        assert line.startswith("Echo stub on ")
+        yield line.split()[3]
+    finally:
+        stub.terminate()
+        stub.wait(5)
+
+
+def test_reader_against_echo_stub(echo_stub):
+    connection = SerialConnection(echo_stub, 115200)
+    thread = SerialThread(connection)
+    thread.set_mode('receive')
+    connection.connect_serial()
+    thread.start_serial_thread()
+    try:
+        deadline = time.monotonic() + 5.0
+        while thread.link_stats.frames_ok < 20 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sample = thread.get_latest_data()
+        assert thread.link_stats.frames_ok >= 20
+        assert thread.link_stats.frames_corrupt == 0
+        values, text = sample
+        assert len(values) == 3 and text == "stub"
+
+        thread.request_ping()
+        while not thread.probe.samples and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(thread.probe.samples) == 1
+    finally:
+        connection.disconnect(thread)
+
+
+@pytest.mark.skipif(shutil.which("blender") is None, reason="needs a Blender binary")
+def test_headless_bridge_against_echo_stub(echo_stub, tmp_path):
+    config = tmp_path / "bridge.json"
+    config.write_text(json.dumps({"port": echo_stub, "mode": "receive", "io_mode": "THREAD", "duration": 2}))
+    result = subprocess.run(
+        ["blender", "-b", "--factory-startup", "--python-expr", BRIDGE_SCRIPT, "--",
+         os.path.abspath(os.path.join(ADDON_DIR, os.pardir)), str(config)],
+        capture_output=True, text=True, timeout=120,
+    )
+    bridge = [line for line in result.stdout.splitlines() if line.startswith("BRIDGE")]
+    assert bridge, result.stdout + result.stderr
+    _, status, frames = bridge[-1].split()
+    assert status == "FINISHED"
+    assert int(frames) > 100
@@ -0,0 +1,27 @@
+import numpy as np
+
+from blendixserial.blendix_history import ChannelHistory, decimate_trace
+
+
+def test_short_trace_is_not_decimated():
+    x = np.linspace(0.0, 1.0, 100, dtype=np.float32)
+    y = np.random.default_rng(0).random((100, 3), dtype=np.float32)
+    decimated_x, decimated_y = decimate_trace(x, y, 50)
+    assert decimated_x is x and decimated_y is y
+
+
+def test_decimated_trace_keeps_every_peak():
+    history = ChannelHistory(range(2), 100000)
+    rng = np.random.default_rng(0)
+    for row in rng.random((100000, 2)):
+        history.append(row)
+    y, count = history.snapshot()
+    y[12345, 0] = 5.0
+    y[99999, 1] = -5.0
+    x = np.arange(count, dtype=np.float32) / (count - 1)
+
+    dx, dy = decimate_trace(x, y, 800)
+    assert len(dx) == len(dy) <= 1600 and dy.shape[1] == 2
+    assert dy[:, 0].max() == 5.0 and dy[:, 1].min() == -5.0
+    assert dy.min(axis=0).tolist() == y.min(axis=0).tolist()
+    assert np.all(np.diff(dx) >= 0)
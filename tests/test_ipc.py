@@ -0,0 +1,44 @@
+import numpy as np
+
+from blendixserial.blendix_ipc import SampleRing
+
+
+def test_latest_returns_a_copy():
+    ring = SampleRing(slots=4, channels=8)
+    try:
+        ring.write(np.array([1.0, 2.0]), b"hi")
+        values, text = ring.latest()
+        ring.write(np.array([3.0, 4.0]), b"")
+        ring.write(np.array([5.0, 6.0]), b"")
+        ring.write(np.array([7.0, 8.0]), b"")
+        ring.write(np.array([9.0, 10.0]), b"")
+        assert values.tolist() == [1.0, 2.0]
+        assert text == "hi"
+    finally:
+        ring.close()
+
+
+def test_slot_in_writing_is_discarded():
+    ring = SampleRing(slots=4, channels=8)
+    try:
+        ring.write(np.array([1.0]), b"")
+        ring.write(np.array([2.0]), b"")
+        # The writer zeroes a slot's sequence before it touches the values.
+        ring.slot_sequence[2] = 0
+        assert ring.latest() is None
+        ring.slot_sequence[2] = 2
+        assert ring.latest()[0].tolist() == [2.0]
+    finally:
+        ring.close()
+
+
+def test_unread_skips_torn_slots():
+    ring = SampleRing(slots=8, channels=8)
+    try:
+        for value in range(1, 5):
+            ring.write(np.array([float(value)]), b"")
+        ring.slot_sequence[3] = 0
+        assert [values.tolist() for values, _ in ring.unread()] == [[1.0], [2.0], [4.0]]
+        assert ring.unread() == []
+    finally:
+        ring.close()
@@ -0,0 +1,24 @@
+import threading
+
+from blendixserial.blendix_connection import SerialConnection, SerialThread
+
+
+def test_connect_disconnect_stress(pty_port):
+    # Rapid connect/disconnect cycles, with a second start each time, must never
+    # leave more than one serial worker running.
+    _, port = pty_port
+    connection = SerialConnection(port, 115200)
+    thread = SerialThread(connection)
+    thread.set_mode('both')
+    baseline = threading.active_count()
+
+    for _ in range(2000):
+        thread.stop_serial_thread()
+        connection.connect_serial()
+        assert thread.start_serial_thread()
+        assert not thread.start_serial_thread()
+        assert threading.active_count() <= baseline + 1
+        connection.disconnect(thread)
+        assert not thread.is_alive()
+
+    assert threading.active_count() == baseline
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from blendixserial.blendix_connection import SerialConnection, SerialThread
+from blendixserial.blendix_framing import encode_binary_frame
+from blendixserial.blendix_history import ChannelHistory
+
+# Time the main thread spends per UI timer tick with a 1 kHz, 16 channel stream:
+# refresh_worker_state() as the connection status timer calls it, get_latest_data()
+# and the apply step as timer_func does. Process I/O moves the hub callbacks (the
+# channel scope here) onto the main thread, in the pump of get_latest_data().
+# The apply step needs Blender; its stand-in writes 3-channel groups into plain
+# objects and costs the same in both modes. Run with -s to see the figures.
+
+RATE = 1000
+CHANNELS = 16
+DURATION = 2.0
+TICK = 0.01
+
+
+def send_frames(device, stop):
+    start = time.perf_counter()
+    index = 0
+    while not stop.is_set():
+        due = int((time.perf_counter() - start) * RATE)
+        frames = [encode_binary_frame([index + k + 0.25 * c for c in range(CHANNELS)], index + k)
+                  for k in range(due - index)]
+        if frames:
+            os.write(device, b"".join(frames))
+            index = due
+        time.sleep(0.001)
+
+
+class Target:
+    location = (0.0, 0.0, 0.0)
+
+
+def apply_stand_in(targets, values, last):
+    if last is not None and np.array_equal(values, last):
+        return
+    for index, target in enumerate(targets):
+        target.location = values[3 * index:3 * index + 3].tolist()
+
+
+@pytest.mark.parametrize("io_mode", ['THREAD', 'PROCESS'])
+def test_main_thread_tick(pty_port, io_mode):
+    device, port = pty_port
+    connection = SerialConnection(port, 4000000)
+    connection.set_link_profile(low_latency=True)
+    thread = SerialThread(connection)
+    thread.set_mode('receive')
+    thread.set_integrity('BINARY', False, False)
+    thread.io_mode = io_mode
+    if io_mode == 'PROCESS':
+        assert thread.start_worker_process()
+    else:
+        connection.connect_serial()
+        thread.start_serial_thread()
+    history = ChannelHistory(range(4), 1000)
+    thread.hub.subscribe(callback=history.append_sample, name="scope")
+    targets = [Target() for _ in range(CHANNELS // 3)]
+
+    stop = threading.Event()
+    writer = threading.Thread(target=send_frames, args=(device, stop))
+    writer.start()
+    ticks = []
+    last = None
+    try:
+        end = time.perf_counter() + DURATION
+        while time.perf_counter() < end:
+            time.sleep(TICK)
+            start = time.perf_counter()
+            thread.refresh_worker_state()
+            latest = thread.get_latest_data()
+            if latest is not None:
+                apply_stand_in(targets, latest[0], last)
+                last = latest[0]
+            ticks.append(time.perf_counter() - start)
+    finally:
+        stop.set()
+        writer.join()
+        connection.disconnect(thread)
+
+    ticks = np.array(ticks[len(ticks) // 10:]) * 1e6
+    print(f"\n{io_mode} I/O: {len(ticks)} ticks, main thread per tick "
+          f"mean {ticks.mean():.0f} us, p99 {np.percentile(ticks, 99):.0f} us, max {ticks.max():.0f} us, "
+          f"{thread.link_stats.frames_ok} frames, {history.count} scope samples")
+    assert thread.link_stats.frames_ok > 0.5 * RATE * DURATION
+    assert history.count > 0.5 * RATE * DURATION
+    assert ticks.mean() < 5000
@@ -0,0 +1,56 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+# Redraw cost of the binding lists with a few thousand bindings, in Blender
+# (blender -b): the per-redraw work is filter_items over every binding, the
+# rows themselves are only drawn for the visible part of the list. Run with -s
+# to see the figures.
+
+ADDON_PARENT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+BINDINGS = 3000
+
+MEASURE_SCRIPT = """
+import sys, time, types, bpy
+sys.path.insert(0, sys.argv[-2])
+import blendixserial
+blendixserial.register()
+from blendixserial.blendix_panels import BLENDIX_UL_receive_bindings, BLENDIX_UL_send_bindings
+
+scene = bpy.context.scene
+obj = bpy.data.objects.new("Probe", None)
+scene.collection.objects.link(obj)
+for index in range(int(sys.argv[-1])):
+    item = scene.custom_object_collection.add()
+    item.sel_object = obj
+    item.property_name = "location"
+    item = scene.send_object_collection.add()
+    item.sel_object = obj
+
+for ui_list, propname in ((BLENDIX_UL_receive_bindings, "custom_object_collection"),
+                          (BLENDIX_UL_send_bindings, "send_object_collection")):
+    for filter_name in ("", "probe*"):
+        stand_in = types.SimpleNamespace(filter_name=filter_name, bitflag_filter_item=1 << 30)
+        best = float("inf")
+        for _ in range(5):
+            started = time.perf_counter()
+            ui_list.filter_items(stand_in, bpy.context, scene, propname)
+            best = min(best, time.perf_counter() - started)
+        print("DRAW", propname, filter_name or "-", f"{best * 1000.0:.3f}")
+"""
+
+
+@pytest.mark.skipif(shutil.which("blender") is None, reason="needs a Blender binary")
+def test_binding_list_redraw_cost():
+    result = subprocess.run(
+        ["blender", "-b", "--factory-startup", "--python-expr", MEASURE_SCRIPT, "--", ADDON_PARENT, str(BINDINGS)],
+        capture_output=True, text=True, timeout=300,
+    )
+    figures = [line.split() for line in result.stdout.splitlines() if line.startswith("DRAW")]
+    assert len(figures) == 4, result.stdout + result.stderr
+    for _, propname, filter_name, milliseconds in figures:
+        print(f"\n{BINDINGS} bindings, {propname}, filter {filter_name}: {float(milliseconds):.2f} ms per redraw")
+        # Well inside one 60 Hz frame.
+        assert float(milliseconds) < 16.0
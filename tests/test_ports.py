@@ -0,0 +1,70 @@
+import os
+import pty
+import tty
+import types
+
+import pytest
+import serial.tools.list_ports
+
+from blendixserial.blendix_connection import SerialConnection, SerialThread
+from blendixserial.blendix_ipc import SampleRing, CommandRing
+from blendixserial.blendix_worker import IOWorker
+from conftest import read_available
+
+# A USB device re-enumerated under another path: both I/O modes follow it by
+# its serial number. The OS port list is replaced to move the device.
+
+
+@pytest.fixture
+def moved_port():
+    device, port = pty.openpty()
+    tty.setraw(device)
+    tty.setraw(port)
+    yield device, os.ttyname(port)
+    os.close(device)
+    os.close(port)
+
+
+def plug(monkeypatch, path):
+    ports = [types.SimpleNamespace(device=path, serial_number="BX1")]
+    monkeypatch.setattr(serial.tools.list_ports, "comports", lambda: ports)
+
+
+def test_thread_reconnect_follows_serial_number(pty_port, moved_port, monkeypatch):
+    _, first = pty_port
+    device, second = moved_port
+    plug(monkeypatch, first)
+    connection = SerialConnection(first, 115200)
+    connection.connect_serial()
+    try:
+        plug(monkeypatch, second)
+        assert connection.reconnect()
+        assert connection._port_name == second
+        connection._serial_connection.write(b"1;\n")
+        assert read_available(device) == b"1;\n"
+    finally:
+        connection.disconnect(None)
+
+
+def test_worker_reconnect_follows_serial_number(pty_port, moved_port, monkeypatch):
+    _, first = pty_port
+    device, second = moved_port
+    plug(monkeypatch, first)
+    settings = SerialThread(SerialConnection(first, 115200)).worker_settings()
+    settings["mode"] = 'send'
+    samples, commands = SampleRing(), CommandRing()
+    worker = IOWorker(settings, samples, commands)
+    try:
+        assert worker.open()
+        # As run() does after the first open.
+        worker.serial_number = serial.tools.list_ports.comports()[0].serial_number
+
+        plug(monkeypatch, second)
+        assert worker.reconnect()
+        assert worker.port == second
+        worker.write("1;")
+        assert read_available(device) == b"1;\n"
+    finally:
+        worker.close()
+        samples.close()
+        commands.close()
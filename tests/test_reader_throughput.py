@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+
+import pytest
+import serial
+
+from blendixserial.blendix_connection import SerialConnection, SerialThread
+from blendixserial.blendix_framing import encode_binary_frame
+
+# Receive throughput over a pty: frames written as fast as the pty accepts them,
+# timed until the reader has decoded all of them. Run with -s to see the rates.
+
+FRAMES = 20000
+
+
+def csv_lines():
+    return [f"{index},{index * 0.5},3.0;hi\n".encode() for index in range(FRAMES)]
+
+
+def binary_frames():
+    return [encode_binary_frame([index, index * 0.5, 3.0], index) for index in range(FRAMES)]
+
+
+def stream(device, frames):
+    data = b"".join(frames)
+    writer = threading.Thread(target=lambda: [os.write(device, data[i:i + 4096]) for i in range(0, len(data), 4096)])
+    writer.start()
+    return writer
+
+
+def reader_rate(device, port, frame_format, frames, io_mode='THREAD'):
+    connection = SerialConnection(port, 4000000)
+    connection.set_link_profile(low_latency=True)
+    thread = SerialThread(connection)
+    thread.set_mode('receive')
+    thread.set_integrity(frame_format, False, False)
+    thread.io_mode = io_mode
+    if io_mode == 'PROCESS':
+        assert thread.start_worker_process()
+    else:
+        connection.connect_serial()
+        thread.start_serial_thread()
+    try:
+        start = time.perf_counter()
+        writer = stream(device, frames)
+        while thread.link_stats.frames_ok < FRAMES and time.perf_counter() - start < 30:
+            time.sleep(0.001)
+            # Process I/O: the worker's counters, as the UI timer mirrors them.
+            thread.refresh_worker_state()
+        elapsed = time.perf_counter() - start
+        writer.join()
+        assert thread.link_stats.frames_ok == FRAMES
+        assert thread.link_stats.frames_corrupt == 0
+        return FRAMES / elapsed
+    finally:
+        connection.disconnect(thread)
+
+
+def readline_rate(device, port, frames):
+    # The reader before the link profile: one readline() per frame.
+    connection = serial.Serial(port, 4000000, timeout=0.01)
+    try:
+        start = time.perf_counter()
+        writer = stream(device, frames)
+        count = 0
+        while count < FRAMES and time.perf_counter() - start < 30:
+            if connection.readline():
+                count += 1
+        elapsed = time.perf_counter() - start
+        writer.join()
+        return count / elapsed
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("io_mode", ['THREAD', 'PROCESS'])
+@pytest.mark.parametrize("frame_format, frames", [('CSV', csv_lines), ('BINARY', binary_frames)])
+def test_reader_throughput(pty_port, frame_format, frames, io_mode):
+    device, port = pty_port
+    rate = reader_rate(device, port, frame_format, frames(), io_mode)
+    print(f"\n{frame_format} reader, {io_mode} I/O: {rate:,.0f} frames/s")
+    assert rate > 5000
+
+
+def test_chunked_reader_beats_readline(pty_port):
+    device, port = pty_port
+    lines = csv_lines()
+    baseline = readline_rate(device, port, lines)
+    rate = reader_rate(device, port, 'CSV', lines)
+    print(f"\nreadline(): {baseline:,.0f} lines/s, chunked reader: {rate:,.0f} lines/s")
+    assert rate > baseline
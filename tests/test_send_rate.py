@@ -0,0 +1,58 @@
+import os
+import select
+import threading
+import time
+
+import pytest
+
+from blendixserial.blendix_connection import SerialConnection, SerialThread
+
+# A setpoint stream at 500 Hz in 'both' mode, with the device sending nothing
+# back: the reads must not hold back the sends.
+
+RATE = 500
+DURATION = 1.0
+
+
+def count_lines(device, stop, counted):
+    while not stop.is_set():
+        readable, _, _ = select.select([device], [], [], 0.05)
+        if readable:
+            counted[0] += os.read(device, 65536).count(b"\n")
+
+
+@pytest.mark.parametrize("io_mode", ['THREAD', 'PROCESS'])
+def test_both_mode_send_rate(pty_port, io_mode):
+    device, port = pty_port
+    connection = SerialConnection(port, 115200)
+    thread = SerialThread(connection)
+    thread.set_mode('both')
+    thread.io_mode = io_mode
+    if io_mode == 'PROCESS':
+        assert thread.start_worker_process()
+    else:
+        connection.connect_serial()
+        thread.start_serial_thread()
+
+    stop = threading.Event()
+    counted = [0]
+    counter = threading.Thread(target=count_lines, args=(device, stop, counted))
+    counter.start()
+    try:
+        start = time.perf_counter()
+        for index in range(int(RATE * DURATION)):
+            # One stream, latest-wins: only what the loop misses is replaced.
+            thread.queue_send_data(f"{index};", stream="setpoint")
+            delay = start + (index + 1) / RATE - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        time.sleep(0.1)
+    finally:
+        stop.set()
+        counter.join()
+        connection.disconnect(thread)
+
+    print(f"\n{io_mode}: {counted[0] / DURATION:.0f} of {RATE} messages/s sent")
+    # A blocking read per pass capped this near 100/s. Some loss is expected: a late
+    # wake-up of this producer queues two messages at once and the newer one wins.
+    assert counted[0] >= 0.7 * RATE * DURATION